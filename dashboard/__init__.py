@@ -0,0 +1,31 @@
+"""
+Oda sıcaklığı dashboard'unun Streamlit'ten bağımsız veri ve analiz katmanı
+"""
+from dashboard.aggregates import DayAggregates, MinuteAggregates
+from dashboard.store import (
+    BINARY_SENSORS,
+    DAYS,
+    MINUTES_PER_DAY,
+    MINUTES_PER_WEEK,
+    SENSOR_COLUMNS,
+    SENSORS,
+    TABLE_COLUMNS,
+    TIMES,
+    SensorStore,
+    StoreView,
+)
+
+__all__ = [
+    "BINARY_SENSORS",
+    "DAYS",
+    "DayAggregates",
+    "MINUTES_PER_DAY",
+    "MINUTES_PER_WEEK",
+    "MinuteAggregates",
+    "SENSOR_COLUMNS",
+    "SENSORS",
+    "TABLE_COLUMNS",
+    "TIMES",
+    "SensorStore",
+    "StoreView",
+]
@@ -0,0 +1,149 @@
+"""
+Gün × dakika bazında birleştirilebilir kısmi toplamlar
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard.store import DAYS, MINUTES_PER_DAY, MINUTES_PER_WEEK, SENSORS, TIMES
+
+
+def _empty(shape):
+    return {
+        "count": np.zeros(shape, dtype=np.int64),
+        "total": np.zeros(shape, dtype=np.float64),
+        "sq_total": np.zeros(shape, dtype=np.float64),
+        "low": np.full(shape, np.inf, dtype=np.float64),
+        "high": np.full(shape, -np.inf, dtype=np.float64),
+    }
+
+
+class DayAggregates:
+    """
+    Her sensör için (gün, dakika) hücresi başına adet, toplam, kareler toplamı,
+    minimum ve maksimum. Herhangi bir gün seçimi en fazla 7 küçük dizinin
+    toplanmasıyla cevaplanır; ham satırlar yeniden taranmaz.
+    """
+
+    def __init__(self, parts, version=0, source=None):
+        # parts: {sensör: {istatistik: (7, 1440) dizi}}
+        self.parts = parts
+        self.version = version
+        self.source = source
+
+    @classmethod
+    def empty(cls, version=0, source=None):
+        return cls({name: _empty((len(DAYS), MINUTES_PER_DAY)) for name in SENSORS}, version, source)
+
+    @property
+    def fingerprint(self):
+        return f"{self.source}@{self.version}"
+
+    @classmethod
+    def from_store(cls, store):
+        """
+        Depodaki tüm satırları tek geçişte (gün, dakika) hücrelerine toplar
+        """
+        aggregates = cls.empty(store.version, store.source)
+        aggregates.add(store.minute, store.readings)
+        return aggregates
+
+    def add(self, minute, readings):
+        """
+        Yeni okumaları mevcut kısmi toplamlara ekler (artımlı güncelleme)
+        """
+        minute = np.asarray(minute, dtype=np.int64)
+        for name in SENSORS:
+            values = np.asarray(readings[name], dtype=np.float64)
+            valid = np.isfinite(values)
+            key, values = minute[valid], values[valid]
+            part = {stat: array.reshape(-1) for stat, array in self.parts[name].items()}
+            part["count"] += np.bincount(key, minlength=MINUTES_PER_WEEK)
+            part["total"] += np.bincount(key, weights=values, minlength=MINUTES_PER_WEEK)
+            part["sq_total"] += np.bincount(key, weights=values * values, minlength=MINUTES_PER_WEEK)
+            np.minimum.at(part["low"], key, values)
+            np.maximum.at(part["high"], key, values)
+        return self
+
+    def merge(self, other):
+        """
+        İki kısmi toplamı birleştirir (ör. farklı dosyalardan gelen veriler)
+        """
+        parts = {}
+        for name in SENSORS:
+            mine, theirs = self.parts[name], other.parts[name]
+            parts[name] = {
+                "count": mine["count"] + theirs["count"],
+                "total": mine["total"] + theirs["total"],
+                "sq_total": mine["sq_total"] + theirs["sq_total"],
+                "low": np.minimum(mine["low"], theirs["low"]),
+                "high": np.maximum(mine["high"], theirs["high"]),
+            }
+        return DayAggregates(parts, max(self.version, other.version), self.source)
+
+    def select(self, selected_days):
+        """
+        Seçilen günlerin dakika bazlı toplamlarını birleştirir
+        """
+        codes = [DAYS.index(day) for day in selected_days]
+        parts = {}
+        for name in SENSORS:
+            part = self.parts[name]
+            parts[name] = {
+                "count": part["count"][codes].sum(axis=0),
+                "total": part["total"][codes].sum(axis=0),
+                "sq_total": part["sq_total"][codes].sum(axis=0),
+                "low": part["low"][codes].min(axis=0, initial=np.inf),
+                "high": part["high"][codes].max(axis=0, initial=-np.inf),
+            }
+        return MinuteAggregates(parts, (self.fingerprint, tuple(selected_days)))
+
+
+class MinuteAggregates:
+    """
+    Bir gün seçimi için dakika (Saat) başına toplamlar
+    """
+
+    def __init__(self, parts, fingerprint=None):
+        self.parts = parts
+        self.fingerprint = fingerprint
+
+    def count(self, name):
+        return self.parts[name]["count"]
+
+    def mean(self, name):
+        part = self.parts[name]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return part["total"] / part["count"]
+
+    def std(self, name):
+        """
+        Örneklem standart sapması (pandas ile aynı, ddof=1)
+        """
+        part = self.parts[name]
+        count = part["count"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            var = (part["sq_total"] - part["total"] ** 2 / count) / (count - 1)
+        return np.sqrt(np.clip(var, 0, None))
+
+    def min(self, name):
+        low = self.parts[name]["low"]
+        return np.where(np.isfinite(low), low, np.nan)
+
+    def max(self, name):
+        high = self.parts[name]["high"]
+        return np.where(np.isfinite(high), high, np.nan)
+
+    def present(self, name=SENSORS[0]):
+        """
+        Veride bulunan dakikaların indeksleri
+        """
+        return np.flatnonzero(self.count(name))
+
+    def series(self, name, stat="mean"):
+        """
+        groupby("Saat")[name].<stat>() karşılığı; yalnızca dolu dakikaları döndürür
+        """
+        present = self.present(name)
+        values = getattr(self, stat)(name)[present]
+        index = pd.Index(np.asarray(TIMES)[present], name="Saat")
+        return pd.Series(values, index=index, name=name)
@@ -0,0 +1,407 @@
+"""
+Bildirimsel eşik ve alarm kuralları; sütunlu parçalar üzerinde vektörel değerlendirme
+
+Kurallar JSON'a yazılabilen sözlüklerdir: koşulların hepsi (VE) sağlandığında,
+isteğe bağlı olarak belirli bir süre (`for`, dakika) veya ardışık okuma sayısı
+(`count`) boyunca kesintisiz sürerse alarm bir kez tetiklenir:
+
+    {"name": "Yüksek CO2", "severity": "kritik", "for": 10,
+     "when": [{"sensor": "CO2 Sensörü", "op": ">", "value": 800},
+              {"sensor": "Hareket Sensörü", "op": "==", "value": 1, "hold": 5}]}
+
+Koşul türleri: karşılaştırma (>, >=, <, <=, ==, !=), aralık (`between`,
+`outside`, değer [alt, üst]) ve analyze_trends ile aynı tanımlı trend
+(`"trend": "Yükseliş"`, `"window": 5`). `hold` bir koşulu son doğru okumadan
+sonra o kadar dakika daha doğru sayar (ör. aralıklı hareket sensörü ile doluluk).
+
+Değerlendirme oda başına, gelen her parça için tek seferde yapılır: tüm kuralların
+maskeleri (kural × okuma) bir matriste hesaplanır, kesintisiz koşu başlangıçları
+ve süreleri kümülatif işlemlerle bulunur; satır başına Python döngüsü yoktur.
+Parça sonunda açık kalan koşular oda durumunda taşınır, böylece parçalara bölünmüş
+veri ile tek seferde verilen veri aynı alarmları üretir.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from dashboard.fleet import DEFAULT_ROOM
+from dashboard.profiling import rotating_logger
+from dashboard.store import DAYS, MINUTES_PER_DAY, SENSOR_COLUMNS, SENSORS, WEEK_ORIGIN
+from dashboard.trend import TREND_LABELS, RollingTrendEngine
+
+OPERATORS = {
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+RANGE_OPERATORS = ("between", "outside")
+SEVERITIES = ("bilgi", "uyarı", "kritik")
+# Koşu içinde ardışık iki okuma arasında izin verilen en uzun boşluk (dakika); daha uzun boşluk koşuyu keser
+DEFAULT_GAP = 5
+
+DEFAULT_RULES = [
+    {
+        "name": "Yüksek CO2 (dolu oda)",
+        "severity": "kritik",
+        "for": 10,
+        "when": [
+            {"sensor": "CO2 Sensörü", "op": ">", "value": 800},
+            {"sensor": "Hareket Sensörü", "op": "==", "value": 1, "hold": 5},
+        ],
+    },
+    {
+        "name": "Nem aralık dışı",
+        "severity": "uyarı",
+        "for": 30,
+        "when": [{"sensor": "Nem Sensörü", "op": "outside", "value": [40, 60]}],
+    },
+    {
+        "name": "Sıcaklık yükselişi",
+        "severity": "bilgi",
+        "for": 15,
+        "when": [{"sensor": "Sicaklik", "trend": "Yükseliş", "window": 5}],
+    },
+]
+
+# Koşusu verinin sonunda hâlâ açık olan alarmların bitişi (NaT)
+NO_END = np.iinfo(np.int64).min
+
+
+def _sensor(name):
+    sensor = SENSOR_COLUMNS.get(name, name)
+    if sensor not in SENSORS:
+        raise ValueError(f"Bilinmeyen sensör: {name}")
+    return sensor
+
+
+class Condition:
+    """
+    Tek bir sensör koşulu; okumalar üzerinde bir boolean maske üretir
+    """
+
+    def __init__(self, spec):
+        self.sensor = _sensor(spec["sensor"])
+        self.hold = int(spec.get("hold", 0))
+        self.trend = spec.get("trend")
+        if self.trend is not None:
+            if self.trend not in TREND_LABELS:
+                raise ValueError(f"Bilinmeyen trend: {self.trend}")
+            self.window = int(spec.get("window", 5))
+            self.code = int(np.flatnonzero(TREND_LABELS == self.trend)[0])
+            return
+        self.op = spec["op"]
+        if self.op in RANGE_OPERATORS:
+            self.low, self.high = (float(value) for value in spec["value"])
+        elif self.op in OPERATORS:
+            self.value = float(spec["value"])
+        else:
+            raise ValueError(f"Bilinmeyen karşılaştırma: {self.op}")
+
+    def mask(self, readings, trends):
+        if self.trend is not None:
+            return trends[(self.sensor, self.window)] == self.code
+        values = readings[self.sensor]
+        # NaN okumalar hiçbir koşulu sağlamaz ve koşuyu keser
+        with np.errstate(invalid="ignore"):
+            if self.op == "between":
+                return (values >= self.low) & (values <= self.high)
+            if self.op == "outside":
+                return (values < self.low) | (values > self.high)
+            return OPERATORS[self.op](values, self.value)
+
+    def describe(self):
+        if self.trend is not None:
+            text = f"{self.sensor} {self.trend} (pencere {self.window})"
+        elif self.op == "between":
+            text = f"{self.sensor} {self.low:g}-{self.high:g} arasında"
+        elif self.op == "outside":
+            text = f"{self.sensor} {self.low:g}-{self.high:g} dışında"
+        else:
+            text = f"{self.sensor} {self.op} {self.value:g}"
+        return text + (f" (son {self.hold} dk içinde)" if self.hold else "")
+
+
+class AlertRule:
+    """
+    Koşulların VE'si; `duration` dakika ve/veya `count` ardışık okuma boyunca sürerse tetiklenir
+    """
+
+    def __init__(self, name, when, duration=0, count=1, severity="uyarı", gap=DEFAULT_GAP):
+        if severity not in SEVERITIES:
+            raise ValueError(f"Bilinmeyen önem: {severity}")
+        self.name = name
+        self.conditions = [condition if isinstance(condition, Condition) else Condition(condition)
+                           for condition in when]
+        if not self.conditions:
+            raise ValueError(f"Kuralın koşulu yok: {name}")
+        self.duration = int(duration)
+        self.count = max(int(count), 1)
+        self.severity = severity
+        self.gap = int(gap)
+
+    @classmethod
+    def from_dict(cls, spec):
+        return cls(spec["name"], spec["when"], spec.get("for", 0), spec.get("count", 1),
+                   spec.get("severity", "uyarı"), spec.get("gap", DEFAULT_GAP))
+
+    def describe(self):
+        text = " ve ".join(condition.describe() for condition in self.conditions)
+        if self.duration:
+            text += f", {self.duration} dk boyunca"
+        if self.count > 1:
+            text += f", {self.count} ardışık okuma"
+        return text
+
+
+def load_rules(path=None):
+    """
+    JSON dosyasındaki kural listesi; yol verilmezse varsayılan kurallar
+    """
+    specs = DEFAULT_RULES
+    if path:
+        with open(path, encoding="utf-8") as handle:
+            specs = json.load(handle)
+    return [AlertRule.from_dict(spec) for spec in specs]
+
+
+def _isoformat(minute):
+    return str(np.datetime64(minute, "m"))
+
+
+def _shift(matrix, first):
+    # Bir okuma sağa kaydırılmış matris; ilk kolon önceki parçadan taşınan değer
+    shifted = np.empty_like(matrix)
+    shifted[:, 0] = first
+    shifted[:, 1:] = matrix[:, :-1]
+    return shifted
+
+
+class AlertEngine:
+    """
+    Kuralları oda başına gelen parçalar üzerinde değerlendirir ve tetiklenen alarmları toplar.
+
+    Oda durumu her kural için açık koşunun başlangıcı, uzunluğu, son okuma zamanı
+    ve tetiklenip tetiklenmediğinden ibarettir; trend koşulları için halka tamponlu
+    bir RollingTrendEngine geçmiş saklamadan kullanılır. `log_path` verilirse her
+    alarm dönen bir JSON-lines günlüğüne yazılır.
+    """
+
+    def __init__(self, rules=None, log_path=None, max_bytes=10 * 1024 * 1024, backups=5):
+        self.rules = load_rules() if rules is None else list(rules)
+        self.fired = 0
+        self.rows = 0
+        self._state = {}
+        self._rooms = {}
+        self._batches = []
+        # Parça sonunda koşusu açık kalan alarmların sonradan öğrenilen bitişleri: (alarm sırası, bitiş)
+        self._closed = []
+        self._table = None
+        self.logger = rotating_logger(__name__, log_path, max_bytes, backups) if log_path else None
+
+        self._conditions = [condition for rule in self.rules for condition in rule.conditions]
+        self._holds = [index for index, condition in enumerate(self._conditions) if condition.hold]
+        trend_keys = sorted({(condition.sensor, condition.window)
+                             for condition in self._conditions if condition.trend is not None})
+        self._trend_keys = trend_keys
+        self.trends = None
+        if trend_keys:
+            self.trends = RollingTrendEngine(
+                sensors=[sensor for sensor in SENSORS if sensor in {key[0] for key in trend_keys}],
+                windows=sorted({key[1] for key in trend_keys}),
+                keep_history=False,
+            )
+        self._durations = np.array([rule.duration for rule in self.rules], dtype=np.int64)[:, None]
+        self._counts = np.array([rule.count for rule in self.rules], dtype=np.int64)[:, None]
+        self._gaps = np.array([rule.gap for rule in self.rules], dtype=np.int64)[:, None]
+
+    def _room_state(self, room):
+        if room not in self._state:
+            rules = len(self.rules)
+            self._state[room] = {
+                "open": np.zeros(rules, dtype=bool),
+                "start": np.zeros(rules, dtype=np.int64),
+                "length": np.zeros(rules, dtype=np.int64),
+                "fired": np.zeros(rules, dtype=bool),
+                # Koşusu hâlâ açık olan tetiklenmiş alarmın sırası (-1: yok)
+                "alert": np.full(rules, -1, dtype=np.int64),
+                "last": None,
+                # `hold` koşullarının en son doğru olduğu zaman
+                "seen": np.full(len(self._holds), np.iinfo(np.int64).min // 2, dtype=np.int64),
+            }
+        return self._state[room]
+
+    def _masks(self, timestamp, readings, room, state):
+        trends = {}
+        if self.trends is not None:
+            codes = self.trends.update(readings, room)
+            for sensor, window in self._trend_keys:
+                trends[(sensor, window)] = codes[window][:, self.trends.sensors.index(sensor)]
+
+        masks = [condition.mask(readings, trends) for condition in self._conditions]
+        for slot, index in enumerate(self._holds):
+            # Son doğru okumanın zamanı ileri taşınır; `hold` dakika içindeyse koşul sağlanmış sayılır
+            seen = np.maximum.accumulate(np.where(masks[index], timestamp, state["seen"][slot]))
+            masks[index] = timestamp - seen < self._conditions[index].hold
+            state["seen"][slot] = seen[-1]
+
+        matrix = np.empty((len(self.rules), len(timestamp)), dtype=bool)
+        offset = 0
+        for row, rule in enumerate(self.rules):
+            conditions = masks[offset:offset + len(rule.conditions)]
+            matrix[row] = np.logical_and.reduce(conditions) if len(conditions) > 1 else conditions[0]
+            offset += len(rule.conditions)
+        return matrix
+
+    def update(self, timestamp, readings, room=None):
+        """
+        Bir odanın yeni okumalarını (epoch dakikası zaman damgalarıyla) işler; bu parçada tetiklenen alarm sayısı
+        """
+        room = DEFAULT_ROOM if room is None else room
+        timestamp = np.asarray(timestamp, dtype=np.int64)
+        n = len(timestamp)
+        if n == 0 or not self.rules:
+            return 0
+        readings = {name: np.asarray(readings[name]) for name in SENSORS if name in readings}
+        if np.any(timestamp[1:] < timestamp[:-1]):
+            order = np.argsort(timestamp, kind="stable")
+            timestamp = timestamp[order]
+            readings = {name: values[order] for name, values in readings.items()}
+
+        state = self._room_state(room)
+        mask = self._masks(timestamp, readings, room, state)
+        index = np.arange(n)
+
+        # Koşu devamı: önceki okuma da koşulu sağlıyor ve aradaki boşluk kuralın sınırı içinde
+        gaps = np.empty((1, n), dtype=np.int64)
+        gaps[0, 0] = timestamp[0] - state["last"] if state["last"] is not None else np.iinfo(np.int64).max
+        gaps[0, 1:] = np.diff(timestamp)
+        close = gaps <= self._gaps
+        continues = _shift(mask, state["open"]) & close
+        starts = mask & ~continues
+
+        # Her okumanın ait olduğu koşunun bu parçadaki ilk okuması (-1: önceki parçadan taşınan koşu)
+        first = np.maximum.accumulate(np.where(starts, index, -1), axis=1)
+        carried = first < 0
+        run_start = np.where(carried, state["start"][:, None], timestamp[np.maximum(first, 0)])
+        run_length = np.where(carried, state["length"][:, None] + index + 1, index - first + 1)
+        reached = mask & (timestamp - run_start + 1 >= self._durations) & (run_length >= self._counts)
+        # Koşu başına yalnızca eşiğe ulaşılan ilk okuma tetikler
+        fire = reached & (starts | ~_shift(reached, state["fired"]))
+
+        # Koşunun bu parçadaki son okuması; parçanın sonunda açık kalan koşuların bitişi sonraki parçada yazılır
+        ends = np.zeros_like(mask)
+        ends[:, :-1] = mask[:, :-1] & ~(mask[:, 1:] & continues[:, 1:])
+        end = np.minimum.accumulate(np.where(ends, index, n)[:, ::-1], axis=1)[:, ::-1]
+
+        # Önceki parçada tetiklenip açık kalan koşular: bitiş artık biliniyorsa alarma yazılır
+        pending = state["alert"] >= 0
+        if pending.any():
+            continued = mask[:, 0] & continues[:, 0]
+            closed = pending & (~continued | (end[:, 0] < n))
+            if closed.any():
+                self._closed.append((state["alert"][closed], np.where(
+                    continued[closed], timestamp[np.minimum(end[closed, 0], n - 1)], state["last"])))
+                state["alert"][closed] = -1
+                self._table = None
+
+        state["open"] = mask[:, -1].copy()
+        state["start"] = run_start[:, -1].copy()
+        state["length"] = np.where(mask[:, -1], run_length[:, -1], 0)
+        state["fired"] = reached[:, -1].copy()
+        state["last"] = int(timestamp[-1])
+        self.rows += n
+
+        rule_index, position = np.nonzero(fire)
+        if len(rule_index):
+            end_position = end[rule_index, position]
+            still_open = end_position == n
+            state["alert"][rule_index[still_open]] = self.fired + np.flatnonzero(still_open)
+            self._record(room, rule_index, run_start[rule_index, position], timestamp[position],
+                         np.where(end_position < n, timestamp[np.minimum(end_position, n - 1)], NO_END),
+                         self._values(readings, rule_index, position))
+        return len(rule_index)
+
+    def _values(self, readings, rule_index, position):
+        # Alarm anında kuralın ilk koşulundaki sensörün okuması; sensör başına tek dizinleme
+        values = np.empty(len(rule_index), dtype=np.float64)
+        sensors = np.array([SENSORS.index(rule.conditions[0].sensor) for rule in self.rules])[rule_index]
+        for code in np.unique(sensors):
+            selected = sensors == code
+            values[selected] = readings[SENSORS[code]][position[selected]]
+        return values
+
+    def _record(self, room, rule_index, start, fired_at, end, values):
+        # Alarmlar ham diziler olarak biriktirilir; tablo yalnızca istendiğinde bir kez kurulur
+        if room not in self._rooms:
+            self._rooms[room] = len(self._rooms)
+        self._batches.append((np.full(len(rule_index), self._rooms[room], dtype=np.int32), rule_index.astype(np.int16),
+                              start, fired_at, end, values))
+        self.fired += len(rule_index)
+        self._table = None
+        if self.logger:
+            names = [rule.name for rule in self.rules]
+            for rule, first, fired, last, value in zip(rule_index.tolist(), start.tolist(), fired_at.tolist(),
+                                                        end.tolist(), values.tolist()):
+                self.logger.info(json.dumps({
+                    "room": str(room),
+                    "rule": names[rule],
+                    "severity": self.rules[rule].severity,
+                    "start": _isoformat(first),
+                    "fired": _isoformat(fired),
+                    "end": None if last == NO_END else _isoformat(last),
+                    "value": round(value, 3),
+                }, ensure_ascii=False))
+
+    def table(self, rooms=None, days=None):
+        """
+        Tetiklenen alarmlar (en yeni önce); istenirse oda ve gün adlarıyla süzülür
+        """
+        if self._table is None:
+            if len(self._batches) > 1:
+                self._batches = [tuple(np.concatenate(parts) for parts in zip(*self._batches))]
+            for alert, last in self._closed:
+                self._batches[0][4][alert] = last
+            self._closed = []
+            room, rule, start, fired_at, end, values = self._batches[0] if self._batches else (
+                np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int16), *[np.empty(0, dtype=np.int64)] * 3,
+                np.empty(0))
+            self._table = pd.DataFrame({
+                "Oda": pd.Categorical.from_codes(room, list(self._rooms)),
+                "Kural": pd.Categorical.from_codes(rule, [rule.name for rule in self.rules]),
+                "Önem": pd.Categorical.from_codes(
+                    np.array([SEVERITIES.index(rule.severity) for rule in self.rules], dtype=np.int8)[rule],
+                    SEVERITIES, ordered=True),
+                "Gün": pd.Categorical.from_codes(((fired_at - WEEK_ORIGIN) // MINUTES_PER_DAY) % len(DAYS), DAYS),
+                "Başlangıç": start.astype("datetime64[m]"),
+                "Tetiklenme": fired_at.astype("datetime64[m]"),
+                "Bitiş": end.astype("datetime64[m]"),
+                "Değer": values,
+            }).sort_values("Tetiklenme", ascending=False, kind="stable", ignore_index=True)
+        table = self._table
+        if rooms is not None:
+            table = table[table["Oda"].isin(list(rooms))]
+        if days is not None:
+            table = table[table["Gün"].isin(list(days))]
+        return table
+
+    def rule_table(self):
+        return pd.DataFrame({
+            "Kural": [rule.name for rule in self.rules],
+            "Koşul": [rule.describe() for rule in self.rules],
+            "Önem": [rule.severity for rule in self.rules],
+        })
+
+
+def evaluate_fleet(fleet, engine=None):
+    """
+    Filodaki her odanın deposunu kurallar üzerinden geçirir; alarmları toplamış motor döner
+    """
+    engine = AlertEngine() if engine is None else engine
+    for room in fleet.rooms:
+        store = fleet[room]
+        engine.update(store.timestamp, store.readings, room)
+    return engine
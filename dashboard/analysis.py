@@ -0,0 +1,107 @@
+"""
+Streamlit'ten bağımsız veri ve analiz adımları
+
+Dashboard bu fonksiyonları önbellek katmanlarıyla sarar; kıyaslama takımı
+aynı fonksiyonları doğrudan çağırır.
+"""
+import numpy as np
+import pandas as pd
+
+from dashboard import synthetic
+from dashboard.anomaly import OnlineAnomalyDetector
+from dashboard.seasonal import SeasonalAnomalyDetector
+from dashboard.store import SENSOR_COLUMNS, SENSORS, StoreView
+from dashboard.trend import TREND_LABELS, TREND_WINDOWS, RollingTrendEngine
+
+# "seasonal": günün dakikası bazında medyan/MAD, "zscore": oda geneli ortalama/std
+ANOMALY_METHODS = ("seasonal", "zscore")
+# Dashboard'da trendi incelenen sensörler; motor bunlar için tüm pencereleri bir kez hesaplar
+TREND_SENSORS = ("Sicaklik",)
+
+
+def create_initial_data(days=7, seed=None, room=None, index=0, interval=1,
+                        anomaly_rate=synthetic.DEFAULT_ANOMALY_RATE):
+    """
+    Sentetik veri seti (doluluğa bağlı günlük döngüler, seyrek sıçramalar); `seed` verilirse
+    her çağrıda aynı veri üretilir. `index` filodaki oda sırasıdır, aynı tohumla farklı odalar üretir.
+    """
+    return synthetic.create_store(days, seed, index, interval, anomaly_rate, room)
+
+
+def filter_data(store, selected_days):
+    """
+    Satırları kopyalamadan paylaşılan depo üzerinde gün seçimi görünümü
+    """
+    return StoreView(store, selected_days)
+
+
+def build_anomaly_detector(store, method="seasonal", sensors=SENSORS):
+    """
+    Anomali dedektörü; tüm sensörler için puanlar bir kez hesaplanır
+    """
+    if method == "seasonal":
+        return SeasonalAnomalyDetector(sensors).fit(store.timestamp, store.readings)
+    if method == "zscore":
+        detector = OnlineAnomalyDetector(sensors)
+        detector.update(store.minute, store.readings)
+        return detector
+    raise ValueError(f"Bilinmeyen anomali yöntemi: {method}")
+
+
+def detect_anomalies(view, column='Sicaklik', threshold=2.5, detector=None):
+    """
+    Anomali tespiti; varsayılan dedektör günün dilimi bazında medyan/MAD taban çizgisinden
+    sağlam Z-score üretir (method="seasonal"), method="zscore" ile çevrimiçi Z-score kullanılır
+    """
+    detector = detector or build_anomaly_detector(view.store)
+
+    # Türetilen kolonlar ayrı dizilerde; depo ve görünüm değiştirilmez
+    z_score = view.column(detector.zscores(column))
+    anomaly = np.abs(z_score) > threshold
+    lower, upper = detector.bounds(threshold, column)
+    return pd.DataFrame({
+        'Z-score': z_score,
+        'Anomali': anomaly,
+        'Anomali_Degeri': np.where(anomaly, view.sensor(column), np.nan),
+        # Grafikteki eşik çizgileri için
+        'Alt_Esik': view.column(lower),
+        'Ust_Esik': view.column(upper),
+    })
+
+
+def anomaly_summary(view, threshold=2.5, detector=None):
+    """
+    Tüm sensörler için anomali sayısı ve oranı; puan matrisi üzerinde tek geçiş
+    """
+    detector = detector or build_anomaly_detector(view.store)
+    counts = (np.abs(view.column(detector.zscores())) > threshold).sum(axis=0)
+    names = {column: sensor for sensor, column in SENSOR_COLUMNS.items()}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rate = counts / len(view) * 100
+    return pd.DataFrame({
+        'Sensör': [names[name] for name in detector.sensors],
+        'Anomali': counts,
+        'Oran (%)': rate,
+    })
+
+
+def build_trend_engine(store, sensors=TREND_SENSORS, windows=TREND_WINDOWS):
+    """
+    Trend motoru; verilen sensörlerin tüm pencereleri tek geçişte hesaplanır,
+    pencere seçimi sonradan yalnızca bir okumadır
+    """
+    engine = RollingTrendEngine(sensors=sensors, windows=windows)
+    engine.update(store.readings)
+    return engine
+
+
+def analyze_trends(view, column='Sicaklik', window=5, engine=None):
+    """
+    Hareketli ortalama tabanlı trend analizi; sonuçlar motordan okunur
+    """
+    engine = engine or build_trend_engine(view.store, [column])
+
+    return pd.DataFrame({
+        'Hareketli_Ortalama': view.column(engine.moving_average(window, column)),
+        'Trend': pd.Categorical.from_codes(view.column(engine.trend_codes(window, column)), categories=TREND_LABELS),
+    })
@@ -0,0 +1,136 @@
+"""
+Artımlı (akış) anomali tespiti
+"""
+import numpy as np
+
+from dashboard.store import MINUTES_PER_DAY, SENSORS
+
+
+class RunningStats:
+    """
+    Grup × sensör bazında Welford/Chan tarzı birleştirilebilir ortalama ve varyans.
+
+    Bir grup; oda veya (oda, günün dakikası) ikilisidir. Yeni okumalar toplu
+    halde eklenir, her okuma yalnızca bir kez işlenir.
+    """
+
+    def __init__(self, sensors=SENSORS, groups=0):
+        self.sensors = list(sensors)
+        shape = (groups, len(self.sensors))
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.mean = np.zeros(shape, dtype=np.float64)
+        self.m2 = np.zeros(shape, dtype=np.float64)
+
+    def grow(self, groups):
+        """
+        Yeni grup (ör. yeni oda) için yer açar
+        """
+        extra = groups - len(self.count)
+        if extra > 0:
+            pad = ((0, extra), (0, 0))
+            self.count = np.pad(self.count, pad)
+            self.mean = np.pad(self.mean, pad)
+            self.m2 = np.pad(self.m2, pad)
+
+    def update(self, groups, values):
+        """
+        values: (n, sensör) dizisi; NaN okumalar istatistiklere katılmaz
+        """
+        self.grow(int(groups.max()) + 1 if len(groups) else 0)
+        touched, inverse = np.unique(groups, return_inverse=True)
+        for j in range(len(self.sensors)):
+            column = values[:, j]
+            valid = np.isfinite(column)
+            index, column = inverse[valid], column[valid]
+            n_b = np.bincount(index, minlength=len(touched))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                mean_b = np.bincount(index, weights=column, minlength=len(touched)) / n_b
+            m2_b = np.bincount(index, weights=(column - mean_b[index]) ** 2, minlength=len(touched))
+
+            # Chan'ın paralel birleştirme formülü
+            n_a = self.count[touched, j]
+            n = n_a + n_b
+            has = n_b > 0
+            delta = np.where(has, mean_b - self.mean[touched, j], 0.0)
+            safe_n = np.maximum(n, 1)
+            self.mean[touched, j] += delta * n_b / safe_n
+            self.m2[touched, j] += np.where(has, m2_b, 0.0) + delta ** 2 * n_a * n_b / safe_n
+            self.count[touched, j] = n
+
+    def std(self, groups=None):
+        """
+        Örneklem standart sapması (ddof=1); grup verilirse yalnızca o satırlar
+        """
+        m2, count = (self.m2, self.count) if groups is None else (self.m2[groups], self.count[groups])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.sqrt(m2 / (count - 1))
+
+
+class OnlineAnomalyDetector:
+    """
+    Beş sensörün hepsi için oda (ve istenirse günün dakikası) bazında Z-score.
+
+    Yeni okumalar `update` ile eklenir ve yalnızca onlar puanlanır; Z-score'lar
+    saklandığı için eşik değişikliği yeniden hesaplama gerektirmez.
+    """
+
+    def __init__(self, sensors=SENSORS, by_minute=False):
+        self.sensors = list(sensors)
+        self.by_minute = by_minute
+        self.stats = RunningStats(self.sensors)
+        self.rooms = {}
+        self._groups = []
+        self._scores = []
+        self._cache = None
+
+    def _group(self, minute, room):
+        room_index = self.rooms.setdefault(room, len(self.rooms))
+        if not self.by_minute:
+            return np.full(len(minute), room_index, dtype=np.int64)
+        return room_index * MINUTES_PER_DAY + np.asarray(minute, dtype=np.int64) % MINUTES_PER_DAY
+
+    def update(self, minute, readings, room=0):
+        """
+        Yeni okumaları istatistiklere ekler ve Z-score'larını (n, sensör) döndürür
+        """
+        groups = self._group(minute, room)
+        values = np.column_stack([np.asarray(readings[name], dtype=np.float64) for name in self.sensors])
+        self.stats.update(groups, values)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = ((values - self.stats.mean[groups]) / self.stats.std(groups)).astype(np.float32)
+        self._groups.append(groups)
+        self._scores.append(scores)
+        self._cache = None
+        return scores
+
+    def _stored(self):
+        if self._cache is None:
+            if self._scores:
+                self._cache = (np.concatenate(self._groups), np.concatenate(self._scores))
+            else:
+                self._cache = (np.empty(0, dtype=np.int64), np.empty((0, len(self.sensors)), dtype=np.float32))
+        return self._cache
+
+    def zscores(self, sensor=None):
+        """
+        Saklanan Z-score'lar; sensör verilirse yalnızca o kolon
+        """
+        scores = self._stored()[1]
+        return scores if sensor is None else scores[:, self.sensors.index(sensor)]
+
+    def anomalies(self, threshold, sensor=None):
+        """
+        Saklanan Z-score'lar üzerinden eşik değerlendirmesi
+        """
+        return np.abs(self.zscores(sensor)) > threshold
+
+    def bounds(self, threshold, sensor):
+        """
+        Her okuma için alt ve üst eşik değerleri (güncel istatistiklerle)
+        """
+        groups = self._stored()[0]
+        j = self.sensors.index(sensor)
+        mean = self.stats.mean[groups, j]
+        std = self.stats.std(groups)[:, j]
+        return mean - threshold * std, mean + threshold * std
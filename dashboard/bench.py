@@ -0,0 +1,236 @@
+"""
+Veri, analiz ve çizim adımları için kıyaslama (benchmark) takımı
+
+Her adım deterministik sentetik veri üzerinde, parametreli boyutlarda
+(1 gün - 1 yıl, 1 - 1000 oda) ölçülür. Süre ve en yüksek bellek JSON olarak
+yazılır; kayıtlı bir temel (baseline) ile karşılaştırılıp gerilemeler raporlanır.
+
+    python -m dashboard.bench --days 1 7 365 --rooms 1 10 --output sonuc.json
+    python -m dashboard.bench --baseline temel.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from dashboard import analysis, charts, synthetic, vega
+from dashboard.aggregates import DayAggregates
+from dashboard.alerts import AlertEngine
+from dashboard.correlation import CorrelationEngine
+from dashboard.fleet import Fleet, analyze_fleet, process_pool
+from dashboard.histogram import ValueHistograms
+from dashboard.pyramid import RollupPyramid
+from dashboard.render import rasterize
+from dashboard.store import SENSOR_COLUMNS, SENSORS
+from dashboard.table import query_rows, table_page
+
+DEFAULT_DAYS = (1, 7)
+DEFAULT_ROOMS = (1,)
+
+
+def _rooms(days, rooms, seed):
+    return [analysis.create_initial_data(days, seed, room={"Oda": f"Oda {room + 1}"}, index=room)
+            for room in range(rooms)]
+
+
+def _alerts(stores):
+    engine = AlertEngine()
+    for room, room_store in enumerate(stores):
+        engine.update(room_store.timestamp, room_store.readings, room)
+    return engine.table()
+
+
+def stages(days=7, rooms=1, seed=0, workers=1):
+    """
+    (adım adı, çağrılabilir) çiftleri; girdiler ölçümden önce hazırlanır
+    """
+    stores = _rooms(days, rooms, seed)
+    store = stores[0]
+    selected = store.days()
+    view = analysis.filter_data(store, selected)
+    stats = DayAggregates.from_store(store).select(selected)
+    anomalies = analysis.detect_anomalies(view)
+    trends = analysis.analyze_trends(view)
+    pyramid = RollupPyramid.from_store(store)
+    start, end = pyramid.span()
+    correlation = CorrelationEngine.from_store(store)
+    histograms = ValueHistograms.from_store(store)
+    values = histograms.select(selected)
+
+    def chart(build, *args):
+        return lambda: rasterize(build(*args))
+
+    def spec(build, *args):
+        return lambda: build(*args).to_dict()
+
+    steps = [
+        ("create_initial_data", lambda: _rooms(days, rooms, seed)),
+        ("synthetic_chunks", lambda: sum(len(chunk) for chunk in synthetic.generate(rooms, days, seed=seed))),
+        ("filter_data", lambda: analysis.filter_data(store, selected).sensor("Sicaklik")),
+        ("minute_aggregates", lambda: [
+            DayAggregates.from_store(store).select(selected).series(name) for name in SENSORS
+        ]),
+        ("detect_anomalies", lambda: analysis.detect_anomalies(view)),
+        ("analyze_trends", lambda: analysis.analyze_trends(view)),
+        ("rollup_pyramid", lambda: RollupPyramid.from_store(store)),
+        ("correlation_engine", lambda: CorrelationEngine.from_store(store)),
+        ("correlation_window", lambda: correlation.lag_profile("Hareket Sensörü", "CO2 Sensörü", tuple(selected), 7)),
+        ("value_histograms", lambda: ValueHistograms.from_store(store)),
+        ("alert_rules", lambda: _alerts(stores)),
+        ("value_percentiles", lambda: [
+            histograms.select(selected).percentiles(name) for name in SENSORS
+        ]),
+        ("table_page", lambda: table_page(store, query_rows(view, "Sicaklik", True), 0, 100)),
+        ("create_pie_chart", chart(charts.create_pie_chart, values)),
+        ("create_line_chart", chart(charts.create_line_chart, stats)),
+        ("create_column_chart", chart(charts.create_column_chart, stats)),
+        ("create_multi_sensor_chart", chart(charts.create_multi_sensor_chart, stats, ("Sicaklik", "CO2 Sensörü"))),
+        ("create_sensor_column_chart", chart(charts.create_sensor_column_chart, view, stats, "Sıcaklık")),
+        ("create_sensor_line_chart", chart(charts.create_sensor_line_chart, view, stats, "Sıcaklık")),
+        ("create_sensor_pie_chart", chart(charts.create_sensor_pie_chart, values, "Sıcaklık")),
+        ("create_anomaly_chart", chart(charts.create_anomaly_chart, view, anomalies)),
+        ("create_trend_chart", chart(charts.create_trend_chart, view, trends)),
+        ("create_rollup_chart", chart(charts.create_rollup_chart, pyramid, "Sıcaklık", start, end)),
+        ("create_correlation_heatmap", chart(charts.create_correlation_heatmap, correlation, tuple(SENSOR_COLUMNS))),
+        ("create_lag_chart", chart(charts.create_lag_chart, correlation, "Hareket Sensörü", "CO2 Sensörü")),
+        ("vega_sensor_column_chart", spec(vega.sensor_column_chart, stats, "Sıcaklık")),
+        ("vega_sensor_line_chart", spec(vega.sensor_line_chart, stats, "Sıcaklık")),
+        ("vega_sensor_pie_chart", spec(vega.sensor_pie_chart, values, "Sıcaklık")),
+        ("vega_multi_sensor_chart", spec(vega.multi_sensor_chart, stats, ("Sicaklik", "CO2 Sensörü"))),
+        ("vega_anomaly_chart", spec(vega.anomaly_chart, view, anomalies)),
+        ("vega_trend_chart", spec(vega.trend_chart, view, trends)),
+    ]
+    if rooms > 1:
+        fleet = Fleet({f"Oda {room + 1}": room_store for room, room_store in enumerate(stores)})
+
+        def fleet_step():
+            if workers <= 1:
+                return analyze_fleet(fleet, selected)
+            with process_pool(workers) as executor:
+                return analyze_fleet(fleet, selected, executor=executor, workers=workers)
+
+        steps.append(("analyze_fleet", fleet_step))
+    return steps, sum(len(room_store) for room_store in stores)
+
+
+def measure(func, repeat=3, memory=True):
+    """
+    En iyi/ortalama süre (sn) ve ayrı bir çalıştırmada en yüksek bellek (MB)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    peak = None
+    if memory:
+        # tracemalloc çalışmayı yavaşlatır; bellek süreden ayrı ölçülür
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return min(times), sum(times) / len(times), peak
+
+
+def run(days=DEFAULT_DAYS, rooms=DEFAULT_ROOMS, repeat=3, seed=0, memory=True, only=None, workers=1):
+    results = []
+    for day_count in days:
+        for room_count in rooms:
+            steps, rows = stages(day_count, room_count, seed, workers)
+            for name, func in steps:
+                if only and name not in only:
+                    continue
+                best, mean, peak = measure(func, repeat, memory)
+                results.append({
+                    "stage": name,
+                    "days": day_count,
+                    "rooms": room_count,
+                    "rows": rows,
+                    "seconds": round(best, 6),
+                    "mean_seconds": round(mean, 6),
+                    "peak_mb": None if peak is None else round(peak, 3),
+                })
+                print(f"{name:<30} {day_count:>4} gün {room_count:>5} oda  {best * 1000:10.1f} ms"
+                      + ("" if peak is None else f"  {peak:9.1f} MB"), file=sys.stderr)
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance=0.25, min_seconds=0.005):
+    """
+    Temel ile karşılaştırma; aynı (adım, gün, oda) için süre oranı ve gerileme bayrağı.
+
+    `min_seconds` altındaki farklar ölçüm gürültüsü kabul edilir.
+    """
+    reference = {(row["stage"], row["days"], row["rooms"]): row for row in baseline["results"]}
+    rows = []
+    for row in report["results"]:
+        base = reference.get((row["stage"], row["days"], row["rooms"]))
+        if base is None:
+            continue
+        ratio = row["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        slower = row["seconds"] - base["seconds"]
+        rows.append({
+            "stage": row["stage"],
+            "days": row["days"],
+            "rooms": row["rooms"],
+            "baseline": base["seconds"],
+            "seconds": row["seconds"],
+            "ratio": round(ratio, 3),
+            "regression": ratio > 1 + tolerance and slower > min_seconds,
+        })
+    return pd.DataFrame(rows, columns=["stage", "days", "rooms", "baseline", "seconds", "ratio", "regression"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard adımlarını ölçekli veri boyutlarında ölçer")
+    parser.add_argument("--days", type=int, nargs="+", default=list(DEFAULT_DAYS), help="Gün sayıları (ör. 1 7 30 365)")
+    parser.add_argument("--rooms", type=int, nargs="+", default=list(DEFAULT_ROOMS), help="Oda sayıları (ör. 1 10 1000)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="analyze_fleet için süreç sayısı")
+    parser.add_argument("--stage", action="append", help="Yalnızca bu adım(lar)ı ölç")
+    parser.add_argument("--no-memory", action="store_true", help="En yüksek bellek ölçümünü atla")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak temel JSON dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="İzin verilen yavaşlama oranı")
+    args = parser.parse_args(argv)
+
+    report = run(args.days, args.rooms, args.repeat, args.seed, not args.no_memory, args.stage, args.workers)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, ensure_ascii=False, indent=2)
+
+    if not args.baseline:
+        print(pd.DataFrame(report["results"]).to_string(index=False))
+        return 0
+    with open(args.baseline, encoding="utf-8") as handle:
+        comparison = compare(report, json.load(handle), args.tolerance)
+    print(comparison.to_string(index=False))
+    regressions = comparison[comparison["regression"]]
+    if len(regressions):
+        print(f"{len(regressions)} adımda gerileme", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Parmak izi (fingerprint) anahtarlı, bayt bütçeli LRU önbellek
+
+Veri setleri ve görünümler içeriklerini değil, değişmez bir parmak izini
+(kaynak + sürüm + gün seçimi) anahtar olarak verir; önbellek araması veri
+boyutundan bağımsız olarak O(1)'dir.
+"""
+import functools
+import sys
+import threading
+from collections import OrderedDict
+
+from dashboard.profiling import stage
+
+
+def fingerprint(value):
+    """
+    Önbellek anahtarı için değerin parmak izi.
+
+    `fingerprint` niteliği olan nesneler (depo, görünüm, toplamlar) onu kullanır;
+    basit tipler olduğu gibi alınır. Diğer tipler sessizce içerik hash'ine
+    düşmek yerine hata verir.
+    """
+    if hasattr(value, "fingerprint"):
+        return value.fingerprint
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        return value
+    if isinstance(value, (tuple, list, frozenset, set)):
+        items = sorted(value, key=repr) if isinstance(value, (set, frozenset)) else value
+        return (type(value).__name__, tuple(fingerprint(item) for item in items))
+    if isinstance(value, dict):
+        return ("dict", tuple(sorted((key, fingerprint(item)) for key, item in value.items())))
+    raise TypeError(f"{type(value).__name__} için parmak izi tanımlı değil")
+
+
+def estimate_size(value):
+    """
+    Değerin bellekteki yaklaşık boyutu (bayt)
+    """
+    if hasattr(value, "memory_usage"):
+        usage = value.memory_usage(index=True, deep=False)
+        return int(getattr(usage, "sum", lambda: usage)())
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if hasattr(value, "parts"):
+        return estimate_size(value.parts)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(estimate_size(item) for item in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(item) for item in value) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Toplam boyutu `max_bytes` ile sınırlı, iş parçacığı güvenli LRU önbellek.
+
+    Dönen nesneler oturumlar arasında paylaşılır; çağıran taraf bunları
+    değiştirmemelidir.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value, size=None):
+        size = estimate_size(value) if size is None else size
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            # Bütçeden büyük tek bir değer önbelleğe alınmaz
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+def memoize(cache):
+    """
+    Fonksiyon sonucunu argümanların parmak iziyle `cache` içinde saklar;
+    her çağrı açık profile önbellek isabetiyle birlikte bir adım olarak yazılır
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, fingerprint(args), fingerprint(kwargs))
+            with stage(func.__name__) as record:
+                record["cached"] = key in cache
+                return cache.get_or_compute(key, lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,292 @@
+"""
+Dashboard grafikleri
+
+Her fonksiyon yeni bir matplotlib Figure döndürür ve Streamlit'e bağımlı
+değildir; dashboard bunları render önbelleğiyle sarar, kıyaslama takımı ve
+toplu rapor doğrudan çağırır.
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+from dashboard.decimate import decimate
+from dashboard.pyramid import ROLLUP_LABELS
+from dashboard.render import chart_width, draw_minute_bars, draw_minute_line, draw_rollup, time_axis
+from dashboard.store import SENSOR_COLUMNS
+from dashboard.style import (
+    ANOMALY_COLOR,
+    COLUMN_COLOR,
+    LINE_COLOR,
+    MOVING_AVERAGE_COLOR,
+    SENSOR_COLORS,
+    SERIES_COLOR,
+    TREND_COLORS,
+    pie_colors,
+    pie_slices,
+)
+
+
+def create_pie_chart(values):
+    """
+    Sıcaklık aralıklarının payı; `values` gün seçiminin değer dağılımıdır (ValueDistribution)
+    """
+    fig, ax = plt.subplots(figsize=(6, 4))
+    pie_slices(values, "Sicaklik").plot(kind='pie', autopct='%1.1f%%',
+                                        colors=['#FFC300', '#FF5733', '#C70039', '#900C3F', '#581845'], ax=ax)
+    ax.set_ylabel("")
+    return fig
+
+
+def create_line_chart(stats, band=None):
+    fig, ax = plt.subplots(figsize=(6, 4))
+    draw_minute_line(ax, stats, 'Sicaklik', '#3498DB', band=band, marker='o')
+    ax.set_ylabel("Sicaklik (°C)")
+    ax.set_title("Saatlik Ortalama Sicaklik", fontsize=14)
+    return fig
+
+
+def create_column_chart(stats, band=None):
+    fig, ax = plt.subplots(figsize=(6, 4))
+    draw_minute_bars(ax, stats, 'Sicaklik', '#8E44AD', band=band)
+    ax.set_ylabel("Sicaklik (°C)")
+    return fig
+
+
+def create_multi_sensor_chart(stats, sensors):
+    """
+    Seçilen sensörlerin normalize edilmiş dakika ortalamaları
+    """
+    # Her sensör için değerleri normalize et
+    normalized_data = {}
+    for sensor in sensors:
+        values = stats.series(sensor).values
+        min_val = values.min()
+        max_val = values.max()
+        if max_val != min_val:
+            normalized_data[sensor] = (values - min_val) / (max_val - min_val) * 100
+        else:
+            normalized_data[sensor] = values
+
+    # Grafik oluştur
+    fig, ax = plt.subplots(figsize=(15, 8))
+
+    # Arka plan rengini ayarla
+    ax.set_facecolor('#F0F8FF')
+    fig.patch.set_facecolor('#F0F8FF')
+
+    # Grid çizgilerini ayarla
+    ax.grid(True, linestyle='--', alpha=0.3, color='#808080')
+
+    # Saatleri indeks olarak kullan
+    hours = stats.series(sensors[0]).index
+    x = np.arange(len(hours))
+    width = 0.8 / len(sensors)  # Her sensör için genişlik
+
+    # Seçilen sensörleri çiz
+    for i, sensor in enumerate(sensors):
+        sensor_color = SENSOR_COLORS[sensor]
+        ax.bar(x + i*width, normalized_data[sensor], width,
+               label=sensor,
+               color=sensor_color,
+               edgecolor=sensor_color,  # Sensörün kendi rengi ile kenar
+               linewidth=1.5,      # Kenar kalınlığı
+               alpha=0.9,          # Hafif şeffaflık
+               zorder=3)           # Sütunları grid çizgilerinin üzerine çiz
+
+    # Eksen etiketlerini ve başlığı ayarla
+    ax.set_ylabel("Normalize Edilmiş Değer (%)", fontsize=12, color='#333333', fontweight='bold')
+    ax.set_title("Çoklu Sensör Grafiği (Normalize Edilmiş)", fontsize=16, color='#333333', fontweight='bold', pad=20)
+
+    # X ekseni etiketlerini ayarla
+    ax.set_xticks(x + width*(len(sensors)-1)/2)
+    ax.set_xticklabels(hours, rotation=90, fontsize=10, color='#333333')
+
+    # Y ekseni etiketlerini ayarla
+    ax.tick_params(axis='y', colors='#333333', labelsize=10)
+
+    # Açıklama kutusunu ayarla
+    ax.legend(fontsize=10,
+              loc='upper right',
+              framealpha=0.95,
+              facecolor='white',
+              edgecolor='#CCCCCC')
+
+    # Kenar çizgilerini ayarla
+    for spine in ax.spines.values():
+        spine.set_color('#666666')
+        spine.set_linewidth(1.5)
+
+    plt.tight_layout()
+    return fig
+
+
+def create_sensor_column_chart(view, stats, sensor, fast_render=True, band=None):
+    # Sensör adını veri setindeki karşılığına çevir
+    sensor_data = SENSOR_COLUMNS[sensor]
+    # Sütun grafiği için
+    fig, ax = plt.subplots(figsize=(15, 8))
+    if fast_render:
+        draw_minute_bars(ax, stats, sensor_data, COLUMN_COLOR, band=band)
+    else:
+        sns.barplot(data=view.to_frame(["Saat", sensor_data]), x="Saat", y=sensor_data, ax=ax,
+                    color=COLUMN_COLOR, errorbar=("ci", 95) if band else None)
+        plt.xticks(rotation=90)
+    ax.set_title(f"{sensor} - Sütun Grafiği", fontsize=14)
+    ax.set_xlabel("Saat", fontsize=12)
+    ax.set_ylabel("Değer", fontsize=12)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    return fig
+
+
+def create_sensor_line_chart(view, stats, sensor, fast_render=True, band=None):
+    sensor_data = SENSOR_COLUMNS[sensor]
+    # Çizgi grafiği için
+    fig, ax = plt.subplots(figsize=(15, 8))
+    if fast_render:
+        draw_minute_line(ax, stats, sensor_data, LINE_COLOR, band=band, marker='o')
+    else:
+        sns.lineplot(data=view.to_frame(["Saat", sensor_data]), x="Saat", y=sensor_data, ax=ax,
+                     color=LINE_COLOR, linewidth=2, marker='o', errorbar=("ci", 95) if band else None)
+        plt.xticks(rotation=90)
+    ax.set_title(f"{sensor} - Çizgi Grafiği", fontsize=14)
+    ax.set_xlabel("Saat", fontsize=12)
+    ax.set_ylabel("Değer", fontsize=12)
+    plt.grid(True, linestyle='--', alpha=0.7)
+    return fig
+
+
+def create_sensor_pie_chart(values, sensor, bins=5):
+    """
+    Değer aralıklarının payı; dilimler ham satırlar yerine değer histogramından sayılır
+    """
+    fig, ax = plt.subplots(figsize=(10, 10))
+    counts = pie_slices(values, SENSOR_COLUMNS[sensor], bins)
+    plt.pie(counts, labels=counts.index, autopct='%1.1f%%', colors=pie_colors(len(counts)))
+    plt.title(f"{sensor} - Değer Dağılımı", pad=20, fontsize=14)
+    return fig
+
+
+def _value_label(sensor):
+    return "Sıcaklık (°C)" if sensor == "Sıcaklık" else "Değer"
+
+
+def create_anomaly_chart(view, df, sensor="Sıcaklık"):
+    """
+    Anomali tespiti sonuçlarını (detect_anomalies çıktısı) görselleştiren grafik
+    """
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
+    # x ekseni gerçek zaman (epoch dakikası); birden fazla hafta üst üste binmez
+    x = view.timestamp
+    y = view.sensor(SENSOR_COLUMNS[sensor])
+    anomaly = df['Anomali'].to_numpy()
+    
+    # Normal veri noktaları (piksel genişliğine seyreltilmiş, anomaliler korunur)
+    idx = decimate(x, y, chart_width(fig, ax), keep=anomaly)
+    ax.plot(x[idx], y[idx], '-', color=SERIES_COLOR, label='Normal Değerler')
+    
+    # Anomali noktaları
+    ax.scatter(x[anomaly], y[anomaly], 
+              color=ANOMALY_COLOR, s=100, label='Anomaliler', zorder=5)
+    
+    # Z-score eşik çizgileri
+    ax.plot(x[idx], df['Ust_Esik'].to_numpy()[idx], color=ANOMALY_COLOR, linestyle='--', alpha=0.3, label='Üst Eşik')
+    ax.plot(x[idx], df['Alt_Esik'].to_numpy()[idx], color=ANOMALY_COLOR, linestyle='--', alpha=0.3, label='Alt Eşik')
+    
+    ax.set_title(f'{sensor} Anomalileri', fontsize=14)
+    ax.set_xlabel('Gün')
+    ax.set_ylabel(_value_label(sensor))
+    time_axis(ax, x)
+    ax.legend()
+    plt.tight_layout()
+    
+    return fig
+
+
+def create_trend_chart(view, df, sensor="Sıcaklık"):
+    """
+    Trend analizi sonuçlarını (analyze_trends çıktısı) görselleştiren grafik
+    """
+    fig, ax = plt.subplots(figsize=(12, 6))
+    
+    x = view.timestamp
+    y = view.sensor(SENSOR_COLUMNS[sensor])
+    moving_average = df['Hareketli_Ortalama'].to_numpy()
+    width = chart_width(fig, ax)
+    
+    # Orijinal veri
+    idx = decimate(x, y, width)
+    ax.plot(x[idx], y[idx], '-', color=SERIES_COLOR, label=sensor)
+    
+    # Hareketli ortalama
+    avg_idx = decimate(x, moving_average, width)
+    ax.plot(x[avg_idx], moving_average[avg_idx], '--', color=MOVING_AVERAGE_COLOR, label='Hareketli Ortalama')
+    
+    # Trend noktaları (seyreltilmiş noktalar üzerinde)
+    trend = df['Trend'].to_numpy()[idx]
+    for trend_name, color in TREND_COLORS.items():
+        mask = trend == trend_name
+        ax.scatter(x[idx][mask], y[idx][mask], 
+                  color=color, s=50, label=trend_name)
+    
+    ax.set_title(f'{sensor} Trend Analizi', fontsize=14)
+    ax.set_xlabel('Gün')
+    ax.set_ylabel(_value_label(sensor))
+    time_axis(ax, x)
+    ax.legend()
+    plt.tight_layout()
+    
+    return fig
+
+
+def create_rollup_chart(pyramid, sensor, start, end):
+    """
+    Uzun dönem görünümü; seviye grafiğin piksel genişliğini dolduran en kaba çözünürlükten seçilir
+    """
+    sensor_data = SENSOR_COLUMNS[sensor]
+    fig, ax = plt.subplots(figsize=(15, 5))
+    rollup = pyramid.query(start, end, width=chart_width(fig, ax))
+    draw_rollup(ax, rollup, sensor_data, COLUMN_COLOR)
+    ax.set_title(f"{sensor} - {ROLLUP_LABELS[rollup.step]} çözünürlük ({len(rollup):,} kova)", fontsize=14)
+    ax.set_xlabel("Zaman", fontsize=12)
+    ax.set_ylabel("Değer", fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    fig.autofmt_xdate()
+    return fig
+
+
+def create_correlation_heatmap(engine, sensors, days=None, last=None):
+    """
+    Seçilen sensörlerin korelasyon matrisi; motorun saklanan momentlerinden okunur
+    """
+    index = [engine.sensors.index(SENSOR_COLUMNS[sensor]) for sensor in sensors]
+    matrix = engine.correlation(0, days, last)[np.ix_(index, index)]
+    fig, ax = plt.subplots(figsize=(7, 6))
+    sns.heatmap(matrix, annot=True, fmt=".2f", cmap="coolwarm", vmin=-1, vmax=1, square=True,
+                xticklabels=sensors, yticklabels=sensors, ax=ax)
+    ax.set_title("Sensör Korelasyonları", fontsize=14)
+    plt.tight_layout()
+    return fig
+
+
+def create_lag_chart(engine, first, second, days=None, last=None):
+    """
+    İki sensör arasındaki korelasyonun gecikmeye göre değişimi
+    """
+    lags, values = engine.lag_profile(SENSOR_COLUMNS[first], SENSOR_COLUMNS[second], days, last)
+    fig, ax = plt.subplots(figsize=(7, 6))
+    ax.axhline(0, color="#666666", linewidth=1)
+    ax.plot(lags, values, color="#8E44AD", linewidth=2, marker="o")
+    if np.isfinite(values).any():
+        # En güçlü ilişkinin gecikmesi
+        best = int(np.nanargmax(np.abs(values)))
+        ax.scatter([lags[best]], [values[best]], color="#E74C3C", s=120, zorder=5,
+                   label=f"En güçlü: {lags[best]:+d} dk ({values[best]:.2f})")
+        ax.legend()
+    ax.set_title(f"{first} → {second} Gecikmeli Korelasyon", fontsize=14)
+    ax.set_xlabel(f"Gecikme (dk, pozitif: {first} önde)")
+    ax.set_ylabel("Korelasyon")
+    ax.set_ylim(-1.05, 1.05)
+    ax.grid(True, linestyle='--', alpha=0.7)
+    plt.tight_layout()
+    return fig
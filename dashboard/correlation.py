@@ -0,0 +1,217 @@
+"""
+Sensörler arası artımlı kovaryans / korelasyon motoru
+
+Her epoch günü için ve her gecikme (dakika) için sensör çiftlerinin
+merkezlenmiş ortak momentleri (co-moment) tutulur. Yeni okumalar yalnızca
+düştükleri günlerin momentlerini günceller; herhangi bir gün seçimi veya kayan
+pencere (son n gün) bu küçük matrislerin birleştirilmesiyle cevaplanır, ham
+satırlar yeniden taranmaz. Farklı odaların motorları da aynı şekilde birleşir.
+"""
+import numpy as np
+
+from dashboard.store import DAYS, MINUTES_PER_DAY, SENSORS, WEEK_ORIGIN
+
+CORRELATION_LAGS = (0, 1, 2, 5, 10, 15, 30, 45, 60, 90, 120)
+MOMENTS = ("count", "mean_a", "mean_b", "comoment", "m2_a", "m2_b")
+
+
+def _empty(lags, sensors):
+    return {
+        "count": np.zeros(lags, dtype=np.int64),
+        "mean_a": np.zeros((lags, sensors)),
+        "mean_b": np.zeros((lags, sensors)),
+        "comoment": np.zeros((lags, sensors, sensors)),
+        "m2_a": np.zeros((lags, sensors)),
+        "m2_b": np.zeros((lags, sensors)),
+    }
+
+
+def merge_moments(parts):
+    """
+    k parçanın momentlerini tek adımda birleştirir (Chan formülünün k'lı hali)
+    """
+    stacked = {name: np.stack([part[name] for part in parts]) for name in MOMENTS}
+    count = stacked["count"].sum(axis=0)
+    weight = stacked["count"].astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_a = np.einsum("kl,kls->ls", weight, stacked["mean_a"]) / count[:, None]
+        mean_b = np.einsum("kl,kls->ls", weight, stacked["mean_b"]) / count[:, None]
+    # Boş parçaların ağırlığı 0; boş toplamda ortalama 0 kabul edilir
+    mean_a, mean_b = np.nan_to_num(mean_a), np.nan_to_num(mean_b)
+    delta_a = stacked["mean_a"] - mean_a
+    delta_b = stacked["mean_b"] - mean_b
+    return {
+        "count": count,
+        "mean_a": mean_a,
+        "mean_b": mean_b,
+        "comoment": stacked["comoment"].sum(axis=0) + np.einsum("kl,kli,klj->lij", weight, delta_a, delta_b),
+        "m2_a": stacked["m2_a"].sum(axis=0) + np.einsum("kl,kls->ls", weight, delta_a ** 2),
+        "m2_b": stacked["m2_b"].sum(axis=0) + np.einsum("kl,kls->ls", weight, delta_b ** 2),
+    }
+
+
+class CorrelationEngine:
+    """
+    Gün ve gecikme bazında birleştirilebilir ortak momentler.
+
+    Gecikme l için çiftler (a, b) = (t - l dakikasındaki okuma, t dakikasındaki
+    okuma) olup t'nin gününe yazılır; eşleşme okuma sırasına değil zaman
+    damgasına göredir, eksik dakikalar çift üretmez. Yalnızca tüm sensörleri
+    dolu satırlar kullanılır. Son `max(lags)` dakikanın okumaları bir sonraki
+    parçadaki gecikmeli çiftler için tutulur.
+    """
+
+    def __init__(self, sensors=SENSORS, lags=CORRELATION_LAGS, version=0, source=None):
+        self.sensors = list(sensors)
+        self.lags = tuple(sorted(set(lags)))
+        self.depth = max(self.lags)
+        self.blocks = {}
+        self.version = version
+        self.source = source
+        self._history = (np.empty(0, dtype=np.int64), np.empty((0, len(self.sensors))))
+        self._cache = {}
+
+    @classmethod
+    def from_store(cls, store):
+        engine = cls(version=store.version, source=store.source)
+        return engine.update(store.timestamp, store.readings)
+
+    @property
+    def fingerprint(self):
+        return f"{self.source}@{self.version}"
+
+    def state(self):
+        """
+        Anlık görüntüye yazılacak (JSON meta verisi, dizi adı → dizi) ikilisi; gün momentleri tek dizide yığılır
+        """
+        days = sorted(self.blocks)
+        empty = _empty(len(self.lags), len(self.sensors))
+        meta = {"sensors": self.sensors, "lags": list(self.lags), "version": self.version, "source": self.source,
+                "days": days}
+        arrays = {
+            name: np.stack([self.blocks[day][name] for day in days]) if days else empty[name][None][:0]
+            for name in MOMENTS
+        }
+        arrays["history-time"], arrays["history-values"] = self._history
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        engine = cls(meta["sensors"], meta["lags"], meta["version"], meta["source"])
+        engine.blocks = {day: {name: arrays[name][index] for name in MOMENTS} for index, day in enumerate(meta["days"])}
+        engine._history = (arrays["history-time"], arrays["history-values"])
+        return engine
+
+    def update(self, timestamp, readings):
+        """
+        Yeni okumaları (epoch dakikası zaman damgalarıyla) düştükleri günlere ekler
+        """
+        timestamp = np.asarray(timestamp, dtype=np.int64)
+        values = np.column_stack([np.asarray(readings[name], dtype=np.float64) for name in self.sensors])
+        complete = np.isfinite(values).all(axis=1)
+        timestamp, values = timestamp[complete], values[complete]
+        if len(timestamp) == 0:
+            return self
+        if np.any(np.diff(timestamp) < 0):
+            order = np.argsort(timestamp, kind="stable")
+            timestamp, values = timestamp[order], values[order]
+
+        history_time, history_values = self._history
+        joined_time = np.concatenate([history_time, timestamp])
+        joined = np.concatenate([history_values, values])
+        if len(history_time) and history_time[-1] > timestamp[0]:
+            order = np.argsort(joined_time, kind="stable")
+            joined_time, joined = joined_time[order], joined[order]
+
+        # Her gecikme için t - l dakikasındaki okumanın konumu (yoksa çift yok)
+        partners = []
+        for lag in self.lags:
+            target = timestamp - lag
+            position = np.minimum(np.searchsorted(joined_time, target), len(joined_time) - 1)
+            partners.append((position, joined_time[position] == target))
+
+        day = timestamp // MINUTES_PER_DAY
+        bounds = np.concatenate([[0], np.flatnonzero(np.diff(day)) + 1, [len(day)]])
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            block = _empty(len(self.lags), len(self.sensors))
+            for index, (position, valid) in enumerate(partners):
+                valid = valid[start:stop]
+                b = values[start:stop][valid]
+                if len(b) == 0:
+                    continue
+                a = joined[position[start:stop][valid]]
+                mean_a, mean_b = a.mean(axis=0), b.mean(axis=0)
+                delta_a, delta_b = a - mean_a, b - mean_b
+                block["count"][index] = len(b)
+                block["mean_a"][index] = mean_a
+                block["mean_b"][index] = mean_b
+                block["comoment"][index] = delta_a.T @ delta_b
+                block["m2_a"][index] = (delta_a ** 2).sum(axis=0)
+                block["m2_b"][index] = (delta_b ** 2).sum(axis=0)
+            key = int(day[start])
+            self.blocks[key] = merge_moments([self.blocks[key], block]) if key in self.blocks else block
+
+        recent = joined_time >= joined_time[-1] - self.depth
+        self._history = (joined_time[recent], joined[recent])
+        self._cache = {}
+        return self
+
+    @classmethod
+    def combine(cls, engines, source=None):
+        """
+        Birçok motorun gün momentlerini birleştirir (ör. filo geneli korelasyon);
+        her gün için tek bir k'lı birleştirme yapılır
+        """
+        engines = list(engines)
+        merged = cls(engines[0].sensors, engines[0].lags, source=source) if engines else cls(source=source)
+        days = {}
+        for engine in engines:
+            for key, block in engine.blocks.items():
+                days.setdefault(key, []).append(block)
+        merged.blocks = {key: parts[0] if len(parts) == 1 else merge_moments(parts) for key, parts in days.items()}
+        return merged
+
+    def merge(self, other):
+        return CorrelationEngine.combine([self, other], self.source)
+
+    def summary(self, days=None, last=None):
+        """
+        Seçilen haftanın günleri ve/veya son `last` epoch günü için birleşik momentler
+        """
+        key = (tuple(days) if days is not None else None, last)
+        if key not in self._cache:
+            keys = sorted(self.blocks)
+            if last and keys:
+                keys = [day for day in keys if day > keys[-1] - last]
+            if days is not None:
+                # WEEK_ORIGIN bir pazartesi; epoch gününün haftadaki yeri DAYS sırasıyla aynı
+                codes = {DAYS.index(day) for day in days}
+                origin = WEEK_ORIGIN // MINUTES_PER_DAY
+                keys = [day for day in keys if (day - origin) % len(DAYS) in codes]
+            parts = [self.blocks[day] for day in keys]
+            self._cache[key] = merge_moments(parts) if parts else _empty(len(self.lags), len(self.sensors))
+        return self._cache[key]
+
+    def correlation(self, lag=0, days=None, last=None):
+        """
+        (sensör, sensör) Pearson korelasyon matrisi; satır sensörü `lag` dakika önde
+        """
+        moments = self.summary(days, last)
+        index = self.lags.index(lag)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return moments["comoment"][index] / np.sqrt(np.outer(moments["m2_a"][index], moments["m2_b"][index]))
+
+    def lag_profile(self, first, second, days=None, last=None):
+        """
+        Gecikmeye göre korelasyon: pozitif gecikmede `first`, negatifte `second` önde
+        """
+        moments = self.summary(days, last)
+        i, j = self.sensors.index(first), self.sensors.index(second)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            leading = moments["comoment"][:, i, j] / np.sqrt(moments["m2_a"][:, i] * moments["m2_b"][:, j])
+            trailing = moments["comoment"][:, j, i] / np.sqrt(moments["m2_a"][:, j] * moments["m2_b"][:, i])
+        lags = np.asarray(self.lags)
+        # Gecikme 0 iki yönde aynıdır; bir kez alınır
+        keep = lags > 0
+        return (np.concatenate([-lags[keep][::-1], lags]),
+                np.concatenate([trailing[keep][::-1], leading]))
@@ -0,0 +1,76 @@
+"""
+Görsel doğruluğu koruyan seyreltme (LTTB ve piksel başına min/max)
+"""
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: seriyi görsel şeklini koruyarak `threshold`
+    noktaya indirir ve seçilen noktaların indekslerini döndürür
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # İlk ve son nokta sabit; aradaki noktalar threshold-2 kovaya bölünür
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(y, buckets):
+    """
+    Her kovadaki en küçük ve en büyük noktayı tutar (piksel başına min/max)
+    """
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+
+    # Eşit boyutlu kovalar: sona +/-inf eklenip (kova, boyut) matrisine çevrilir
+    size = -(-n // buckets)
+    y = np.asarray(y, dtype=np.float64)
+    low = np.full(buckets * size, np.inf)
+    high = np.full(buckets * size, -np.inf)
+    low[:n] = high[:n] = y
+    offsets = np.arange(0, buckets * size, size)
+    lows = offsets + low.reshape(buckets, size).argmin(axis=1)
+    highs = offsets + high.reshape(buckets, size).argmax(axis=1)
+    selected = np.concatenate([[0, n - 1], lows, highs])
+    return np.unique(selected[selected < n])
+
+
+def decimate(x, y, width, keep=None, method="lttb"):
+    """
+    Seriyi yaklaşık `width` piksel genişliğine indirir.
+
+    NaN değerler atlanır; `keep` maskesindeki noktalar (ör. anomaliler) her zaman korunur.
+    Dönen indeksler artan sıradadır.
+    """
+    y = np.asarray(y)
+    finite = np.flatnonzero(np.isfinite(y))
+    if method == "lttb":
+        selected = finite[lttb(np.asarray(x)[finite], y[finite], int(width))]
+    elif method == "minmax":
+        selected = finite[minmax(y[finite], int(width) // 2)]
+    else:
+        raise ValueError(f"Bilinmeyen seyreltme yöntemi: {method}")
+
+    if keep is not None:
+        selected = np.union1d(selected, np.flatnonzero(keep))
+    return selected
@@ -0,0 +1,366 @@
+"""
+Çok odalı, çok binalı filo: oda bazında bölümlenmiş depolar ve paralel analiz
+
+Her oda kendi SensorStore'unda (ve diskte kendi anlık görüntü dizininde)
+tutulur. Oda analizleri birbirinden bağımsız olduğu için bir süreç havuzuna
+dağıtılır; sonuçlar oda başına bir satırlık özet tabloda birleştirilir.
+"""
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dashboard import analysis
+from dashboard.aggregates import DayAggregates
+from dashboard.cache import LRUCache
+from dashboard.correlation import CorrelationEngine
+from dashboard.ingest import IngestPipeline
+from dashboard.snapshot import MANIFEST, load_snapshot, load_state, save_snapshot
+from dashboard.store import StoreView
+
+ROOM_COLUMN = "Oda"
+BUILDING_COLUMN = "Bina"
+DEFAULT_ROOM = "Oda 1"
+FLEET_MANIFEST = "fleet.json"
+FORMAT_VERSION = 1
+
+# Oda başına analiz durumu (anomali puanları, trend motorları); eşik veya pencere değişiminde yeniden hesaplanmaz.
+# Süreç havuzunda her işçinin kendi önbelleği vardır
+room_cache = LRUCache(max_bytes=256 * 1024 * 1024)
+
+
+class Fleet:
+    """
+    Oda kimliği → SensorStore eşlemesi.
+
+    Diskten açılan filolarda her odanın anlık görüntü dizini de tutulur;
+    süreç havuzundaki işçiler depoyu kopyalamak yerine aynı dosyaları açar.
+    """
+
+    def __init__(self, stores, aggregates=None, paths=None, pyramids=None, correlations=None, histograms=None,
+                 alerts=None, detectors=None):
+        self.stores = dict(stores)
+        self.aggregates = dict(aggregates or {})
+        self.paths = dict(paths or {})
+        self.pyramids = dict(pyramids or {})
+        self.correlations = dict(correlations or {})
+        self.histograms = dict(histograms or {})
+        # Oturtulmuş mevsimsel anomali dedektörleri (anlık görüntüden açılan odalarda)
+        self.detectors = dict(detectors or {})
+        # Yükleme sırasında değerlendirilmiş alarm kuralları (AlertEngine), yoksa None
+        self.alerts = alerts
+
+    @property
+    def rooms(self):
+        return list(self.stores)
+
+    @property
+    def fingerprint(self):
+        return tuple((room, store.fingerprint) for room, store in self.stores.items())
+
+    def __len__(self):
+        return len(self.stores)
+
+    def __getitem__(self, room):
+        return self.stores[room]
+
+    def building(self, room):
+        return self.stores[room].room.get(BUILDING_COLUMN, "")
+
+    def buildings(self):
+        return sorted({self.building(room) for room in self.stores})
+
+    def state(self, room):
+        """
+        Odanın anlık görüntüye yazılacak türetilmiş durumu (bkz. snapshot.STATE_TYPES)
+        """
+        return {
+            "pyramid": self.pyramids.get(room),
+            "histograms": self.histograms.get(room),
+            "correlation": self.correlations.get(room),
+            "seasonal": self.detectors.get(room),
+        }
+
+    def source(self, room):
+        """
+        İşçiye gönderilecek kaynak: anlık görüntü dizini ya da depo
+        """
+        return self.paths.get(room, self.stores[room])
+
+
+class FleetPipeline:
+    """
+    Gelen parçaları 'Oda' kolonuna göre bölümleyip her oda için ayrı bir
+    IngestPipeline'a besler. 'Oda' kolonu olmayan veri tek oda kabul edilir.
+    Verilen AlertEngine tüm odaların hatlarınca paylaşılır.
+    """
+
+    def __init__(self, keep_rows=True, alerts=None):
+        self.keep_rows = keep_rows
+        self.alerts = alerts
+        self.pipelines = {}
+        self.seconds = 0.0
+
+    def _pipeline(self, room):
+        if room not in self.pipelines:
+            pipeline = IngestPipeline(keep_rows=self.keep_rows, alerts=self.alerts)
+            pipeline.room[ROOM_COLUMN] = room
+            self.pipelines[room] = pipeline
+        return self.pipelines[room]
+
+    def add(self, df):
+        if ROOM_COLUMN not in df:
+            return self._pipeline(DEFAULT_ROOM).add(df)
+        rows = 0
+        for room, part in df.groupby(df[ROOM_COLUMN].astype(str), sort=False):
+            rows += self._pipeline(room).add(part)
+        return rows
+
+    def run(self, chunks):
+        last = time.perf_counter()
+        for df in chunks:
+            self.add(df)
+            now = time.perf_counter()
+            self.seconds += now - last
+            last = now
+        return self
+
+    def fleet(self):
+        rooms = sorted(self.pipelines)
+        stores = {room: self.pipelines[room].store() for room in rooms}
+        for room in rooms:
+            # Piramitte olmayan 1 dakikalık sorgular odanın deposundan okunur
+            self.pipelines[room].pyramid.store = stores[room]
+        return Fleet(
+            stores,
+            {room: self.pipelines[room].aggregates for room in rooms},
+            pyramids={room: self.pipelines[room].pyramid for room in rooms},
+            correlations={room: self.pipelines[room].correlation for room in rooms},
+            histograms={room: self.pipelines[room].histograms for room in rooms},
+            alerts=self.alerts,
+        )
+
+    def summary(self):
+        rows = sum(pipeline.rows for pipeline in self.pipelines.values())
+        summary = {
+            "rooms": len(self.pipelines),
+            "rows": rows,
+            "rejected": sum(pipeline.rejected for pipeline in self.pipelines.values()),
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(rows / self.seconds if self.seconds else 0.0, 1),
+        }
+        if self.alerts is not None:
+            summary["alerts"] = self.alerts.fired
+        return summary
+
+
+def _room_dir(index, room):
+    # Oda kimliği dosya adı için sadeleştirilir; sıra numarası çakışmaları önler
+    return f"{index:05d}-{re.sub(r'[^0-9A-Za-z_-]+', '_', str(room))[:40]}"
+
+
+def save_fleet(path, fleet):
+    """
+    Her odayı kendi anlık görüntü dizinine, oda listesini fleet.json'a yazar
+    """
+    os.makedirs(path, exist_ok=True)
+    rooms = {}
+    for index, room in enumerate(fleet.rooms):
+        name = _room_dir(index, room)
+        save_snapshot(os.path.join(path, name), fleet[room], fleet.aggregates.get(room), fleet.state(room))
+        rooms[room] = name
+
+    # Manifest en son ve atomik yazılır; okuyucular eksik bir oda listesi görmez
+    handle, staging = tempfile.mkstemp(prefix=".fleet-", dir=path)
+    with os.fdopen(handle, "w", encoding="utf-8") as manifest:
+        json.dump({"format": FORMAT_VERSION, "rooms": rooms}, manifest, ensure_ascii=False, indent=2)
+    os.replace(staging, os.path.join(path, FLEET_MANIFEST))
+    return path
+
+
+def load_fleet(path):
+    """
+    Filo dizinini (veya tek odalı bir anlık görüntüyü) kopyalamadan açar; yazılmış
+    türetilmiş durumlar (piramit, histogram, korelasyon, mevsimsel dedektör) da açılır
+    """
+    if os.path.exists(os.path.join(path, MANIFEST)):
+        rooms = {DEFAULT_ROOM: ""}
+    else:
+        with open(os.path.join(path, FLEET_MANIFEST), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen filo formatı: {manifest.get('format')}")
+        rooms = manifest["rooms"]
+
+    fleet = Fleet({})
+    for room, name in rooms.items():
+        fleet.paths[room] = os.path.join(path, name) if name else path
+        fleet.stores[room], room_aggregates = load_snapshot(fleet.paths[room])
+        if room_aggregates is not None:
+            fleet.aggregates[room] = room_aggregates
+        state = load_state(fleet.paths[room], fleet.stores[room])
+        for kind, states in (("pyramid", fleet.pyramids), ("histograms", fleet.histograms),
+                             ("correlation", fleet.correlations), ("seasonal", fleet.detectors)):
+            if kind in state:
+                states[room] = state[kind]
+    return fleet
+
+
+def _open(source):
+    if isinstance(source, str):
+        return load_snapshot(source)
+    return source, None
+
+
+def _detector(source, store, method, column):
+    if method == "seasonal" and isinstance(source, str):
+        saved = load_state(source, store, kinds=("seasonal",)).get("seasonal")
+        if saved is not None and column in saved.sensors:
+            return saved
+    return analysis.build_anomaly_detector(store, method, sensors=[column])
+
+
+def analyze_room(source, days=None, column="Sicaklik", threshold=2.5, window=5, method="seasonal"):
+    """
+    Tek bir odanın özeti: ortalama/en yüksek değer, anomali ve trend sayıları.
+
+    Modül seviyesinde olduğu için süreç havuzunda çalıştırılabilir; anomali ve
+    trend tanımları dashboard'daki detect_anomalies/analyze_trends ile aynıdır.
+    """
+    store, _ = _open(source)
+    view = StoreView(store, days if days is not None else store.days())
+    values = view.sensor(column)
+
+    # Dedektör oda başına bir kez kurulur (anlık görüntüde mevsimsel puanlar hazırsa okunur);
+    # eşik değişimi yalnızca saklanan puanları karşılaştırır
+    zscores = room_cache.get_or_compute(
+        ("zscore", store.fingerprint, method, column),
+        lambda: _detector(source, store, method, column).zscores(column))
+    anomalies = np.abs(view.column(zscores)) > threshold
+
+    engine = room_cache.get_or_compute(("trend", store.fingerprint, column),
+                                       lambda: analysis.build_trend_engine(store, [column]))
+    trend = np.bincount(view.column(engine.trend_codes(window, column)), minlength=3)
+
+    finite = values[np.isfinite(values)]
+    return {
+        ROOM_COLUMN: store.room.get(ROOM_COLUMN, DEFAULT_ROOM),
+        BUILDING_COLUMN: store.room.get(BUILDING_COLUMN, ""),
+        "Satır": len(values),
+        "Ortalama": float(finite.mean()) if len(finite) else np.nan,
+        "En Yüksek": float(finite.max()) if len(finite) else np.nan,
+        "Anomali": int(anomalies.sum()),
+        "Yükseliş": int(trend[1]),
+        "Düşüş": int(trend[2]),
+    }
+
+
+def _aggregate_rooms(sources):
+    """
+    Bir grup odanın gün × dakika toplamlarını işçi içinde birleştirir
+    """
+    merged = None
+    for source in sources:
+        store, aggregates = _open(source)
+        aggregates = aggregates or DayAggregates.from_store(store)
+        merged = aggregates if merged is None else merged.merge(aggregates)
+    return merged
+
+
+def _correlate_rooms(sources):
+    """
+    Bir grup odanın korelasyon motorlarını işçi içinde birleştirir
+    """
+    return CorrelationEngine.combine(CorrelationEngine.from_store(_open(source)[0]) for source in sources)
+
+
+def process_pool(workers=None):
+    """
+    Komut satırı araçları için süreç havuzu.
+
+    Çok iş parçacıklı süreçte fork kilitleri kopyalayıp kilitlenebileceği için
+    forkserver (yoksa spawn) kullanılır; işçiler yalnızca dashboard.fleet'i
+    içe aktarır. Streamlit sunucusu bunun yerine iş parçacığı havuzu kullanır.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["dashboard.fleet"])
+    else:
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def _map(executor, func, items, workers):
+    if executor is None or len(items) < 2:
+        return list(map(func, items))
+    # Küçük işleri gruplayarak gönder; işçi başına birkaç grup yük dengesini korur
+    return list(executor.map(func, items, chunksize=max(len(items) // (workers * 4), 1)))
+
+
+def analyze_fleet(fleet, days=None, column="Sicaklik", threshold=2.5, window=5, executor=None, workers=None,
+                  method="seasonal"):
+    """
+    Tüm odaları (verilirse süreç havuzunda) analiz eder; oda başına bir satır
+    """
+    task = functools.partial(analyze_room, days=days, column=column, threshold=threshold, window=window,
+                             method=method)
+    rows = _map(executor, task, [fleet.source(room) for room in fleet.rooms], workers or os.cpu_count())
+    return pd.DataFrame(rows, columns=[ROOM_COLUMN, BUILDING_COLUMN, "Satır", "Ortalama", "En Yüksek",
+                                       "Anomali", "Yükseliş", "Düşüş"])
+
+
+def aggregate_fleet(fleet, executor=None, workers=None):
+    """
+    Tüm odaların gün × dakika toplamlarını birleştirir. Odalar işçi sayısı kadar
+    gruba bölünür; her işçi kendi grubunu birleştirip tek bir sonuç döndürür.
+    """
+    workers = (workers or os.cpu_count()) if executor else 1
+    sources = [fleet.source(room) for room in fleet.rooms]
+    batches = [batch for batch in (sources[i::workers] for i in range(workers)) if batch]
+    merged = None
+    for part in _map(executor, _aggregate_rooms, batches, workers):
+        merged = part if merged is None else merged.merge(part)
+    if merged is not None:
+        merged.source = "fleet-" + hashlib.sha1(repr(fleet.fingerprint).encode()).hexdigest()[:16]
+    return merged
+
+
+def correlate_fleet(fleet, executor=None, workers=None):
+    """
+    Tüm odaların sensör korelasyon momentlerini birleştirir. Yüklemede hesaplanmış
+    motorlar doğrudan kullanılır; diğer odalar aggregate_fleet gibi gruplar halinde
+    işçilerde hesaplanır.
+    """
+    engines = [fleet.correlations[room] for room in fleet.rooms if room in fleet.correlations]
+    missing = [fleet.source(room) for room in fleet.rooms if room not in fleet.correlations]
+    workers = (workers or os.cpu_count()) if executor else 1
+    batches = [batch for batch in (missing[i::workers] for i in range(workers)) if batch]
+    engines.extend(_map(executor, _correlate_rooms, batches, workers))
+    # Oda motorları değiştirilmez; birleştirme her zaman yeni bir motor döndürür
+    return CorrelationEngine.combine(engines, "fleet-" + hashlib.sha1(repr(fleet.fingerprint).encode()).hexdigest()[:16])
+
+
+def top_rooms(summary, n=10, by="Ortalama"):
+    """
+    Seçilen ölçüte göre ilk n oda (ör. en sıcak odalar)
+    """
+    return summary.nlargest(n, by)
+
+
+def building_summary(summary):
+    """
+    Bina başına oda sayısı, toplam anomali ve ortalama değer
+    """
+    return summary.groupby(BUILDING_COLUMN, sort=True).agg(
+        Oda=(ROOM_COLUMN, "count"),
+        Anomali=("Anomali", "sum"),
+        Ortalama=("Ortalama", "mean"),
+    ).reset_index()
@@ -0,0 +1,201 @@
+"""
+Gün bazında birleştirilebilir, sabit çözünürlüklü değer histogramları
+
+Her sensörün okumaları sensöre özgü bir çözünürlükte (ör. sıcaklık 0.01 °C)
+ince kovalara sayılır; yalnızca dolu kovalar seyrek olarak tutulur. Herhangi
+bir gün seçimi 7 küçük satırın toplanmasıyla, herhangi bir dilimleme veya
+yüzdelik (p50/p95/p99) kovalar üzerinden cevaplanır; maliyet satır sayısına
+değil dolu kova sayısına bağlıdır.
+"""
+import numpy as np
+
+from dashboard.store import DAYS, MINUTES_PER_DAY, SENSORS
+
+# İnce kova genişliği; yüzdelikler ve dilim sınırları bu hassasiyettedir
+RESOLUTION = {
+    "Sicaklik": 0.01,
+    "Isik Sensörü": 1,
+    "Hareket Sensörü": 1,
+    "CO2 Sensörü": 1,
+    "Nem Sensörü": 0.1,
+}
+PERCENTILES = (50, 95, 99)
+
+
+def _empty():
+    return {
+        "keys": np.empty(0, dtype=np.int64),
+        "counts": np.zeros((len(DAYS), 0), dtype=np.int64),
+        "low": np.full(len(DAYS), np.inf),
+        "high": np.full(len(DAYS), -np.inf),
+    }
+
+
+def _union(parts):
+    """
+    Farklı kova kümelerine sahip (gün, kova) sayılarını ortak kova kümesinde toplar
+    """
+    keys = np.unique(np.concatenate([part["keys"] for part in parts]))
+    counts = np.zeros((len(DAYS), len(keys)), dtype=np.int64)
+    for part in parts:
+        counts[:, np.searchsorted(keys, part["keys"])] += part["counts"]
+    return {
+        "keys": keys,
+        "counts": counts,
+        "low": np.min([part["low"] for part in parts], axis=0),
+        "high": np.max([part["high"] for part in parts], axis=0),
+    }
+
+
+class ValueHistograms:
+    """
+    Her sensör için haftanın günü × ince kova sayıları ve günlük en küçük/en
+    büyük değer. DayAggregates gibi artımlı güncellenir ve birleştirilir.
+
+    Kova k, (k·w, (k+1)·w] aralığıdır (w çözünürlük); pd.cut'ın sağdan kapalı
+    aralıklarıyla aynı yöndedir, w'nin katı olan sınırlar tam sayılır.
+    """
+
+    def __init__(self, parts, version=0, source=None, resolution=None):
+        # parts: {sensör: {"keys": (k,), "counts": (7, k), "low": (7,), "high": (7,)}}
+        self.parts = parts
+        self.version = version
+        self.source = source
+        self.resolution = dict(resolution or RESOLUTION)
+
+    @classmethod
+    def empty(cls, version=0, source=None, resolution=None):
+        return cls({name: _empty() for name in SENSORS}, version, source, resolution)
+
+    @property
+    def fingerprint(self):
+        return f"{self.source}@{self.version}"
+
+    def state(self):
+        """
+        Anlık görüntüye yazılacak (JSON meta verisi, dizi adı → dizi) ikilisi
+        """
+        meta = {"version": self.version, "source": self.source, "resolution": self.resolution}
+        arrays = {f"{SENSORS.index(name)}-{field}": array
+                  for name in SENSORS for field, array in self.parts[name].items()}
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        parts = {name: {field: arrays[f"{SENSORS.index(name)}-{field}"] for field in ("keys", "counts", "low", "high")}
+                 for name in SENSORS}
+        return cls(parts, meta["version"], meta["source"], meta["resolution"])
+
+    @classmethod
+    def from_store(cls, store):
+        histograms = cls.empty(store.version, store.source)
+        histograms.add(store.minute, store.readings)
+        return histograms
+
+    def add(self, minute, readings):
+        """
+        Yeni okumaları mevcut sayılara ekler (artımlı güncelleme)
+        """
+        day = np.asarray(minute, dtype=np.int64) // MINUTES_PER_DAY
+        for name in SENSORS:
+            values = np.asarray(readings[name], dtype=np.float64)
+            valid = np.isfinite(values)
+            if not valid.any():
+                continue
+            code, values = day[valid], values[valid]
+            keys, inverse = np.unique(np.ceil(values * (1 / self.resolution[name])).astype(np.int64) - 1,
+                                      return_inverse=True)
+            counts = np.bincount(code * len(keys) + inverse, minlength=len(DAYS) * len(keys))
+            low = np.full(len(DAYS), np.inf)
+            high = np.full(len(DAYS), -np.inf)
+            np.minimum.at(low, code, values)
+            np.maximum.at(high, code, values)
+            batch = {"keys": keys, "counts": counts.reshape(len(DAYS), len(keys)), "low": low, "high": high}
+            self.parts[name] = _union([self.parts[name], batch])
+        return self
+
+    def merge(self, other):
+        """
+        İki histogram kümesini birleştirir (ör. farklı odalar veya dosyalar)
+        """
+        parts = {name: _union([self.parts[name], other.parts[name]]) for name in SENSORS}
+        return ValueHistograms(parts, max(self.version, other.version), self.source, self.resolution)
+
+    def select(self, selected_days):
+        """
+        Seçilen günlerin histogramlarını birleştirir
+        """
+        codes = [DAYS.index(day) for day in selected_days]
+        parts = {}
+        for name in SENSORS:
+            part = self.parts[name]
+            counts = part["counts"][codes].sum(axis=0)
+            present = counts > 0
+            parts[name] = {
+                "keys": part["keys"][present],
+                "counts": counts[present],
+                "low": part["low"][codes].min(initial=np.inf),
+                "high": part["high"][codes].max(initial=-np.inf),
+            }
+        return ValueDistribution(parts, self.resolution, (self.fingerprint, tuple(selected_days)))
+
+
+class ValueDistribution:
+    """
+    Bir gün seçimi için sensör başına değer dağılımı
+    """
+
+    def __init__(self, parts, resolution, fingerprint=None):
+        self.parts = parts
+        self.resolution = resolution
+        self.fingerprint = fingerprint
+
+    def count(self, name):
+        return int(self.parts[name]["counts"].sum())
+
+    def min(self, name):
+        low = self.parts[name]["low"]
+        return float(low) if np.isfinite(low) else np.nan
+
+    def max(self, name):
+        high = self.parts[name]["high"]
+        return float(high) if np.isfinite(high) else np.nan
+
+    def _upper(self, name):
+        # Kovaların üst sınırları; çözünürlüğün katları tam temsil edilsin diye bölme ile
+        return (self.parts[name]["keys"] + 1) / (1 / self.resolution[name])
+
+    def histogram(self, name, edges):
+        """
+        (e0, e1], (e1, e2], ... aralıklarındaki okuma sayıları; ilk aralık e0'ı da içerir.
+        Aralık dışındaki okumalar sayılmaz.
+        """
+        edges = np.asarray(edges, dtype=np.float64)
+        upper = self._upper(name)
+        cumulative = np.concatenate([[0], np.cumsum(self.parts[name]["counts"])])
+        at_most = cumulative[np.searchsorted(upper, edges, side="right")]
+        counts = np.diff(at_most)
+        # include_lowest: alt sınıra eşit okumalar ilk dilime eklenir
+        counts[0] += at_most[0] - cumulative[np.searchsorted(upper, edges[0], side="left")]
+        return counts
+
+    def quantile(self, name, q):
+        """
+        Yaklaşık yüzdelik(ler), 0 <= q <= 1; hata en fazla bir kova genişliğidir
+        """
+        counts = self.parts[name]["counts"]
+        q = np.asarray(q, dtype=np.float64)
+        if len(counts) == 0:
+            return np.full(q.shape, np.nan)
+        cumulative = np.cumsum(counts)
+        # q·n'inci okumayı içeren kova; sonucun gerçek min/max dışına taşmaması için kırpılır
+        rank = np.maximum(np.ceil(q * cumulative[-1]), 1)
+        value = self._upper(name)[np.searchsorted(cumulative, rank, side="left")]
+        return np.clip(value, self.min(name), self.max(name))
+
+    def percentiles(self, name, percentiles=PERCENTILES):
+        """
+        {"p50": ..., "p95": ..., "p99": ...}
+        """
+        values = self.quantile(name, np.asarray(percentiles) / 100)
+        return {f"p{p}": float(value) for p, value in zip(percentiles, values)}
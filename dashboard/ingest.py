@@ -0,0 +1,328 @@
+"""
+Sensör kayıtları için parça parça (chunked) veri yükleme hattı
+
+Desteklenen kaynaklar: CSV, JSON-lines, JSON dizisi, Parquet dosyaları, sonuna
+yazılan bir log dosyasının takibi ve satır bazlı JSON gönderen yerel bir TCP
+soketi (MQTT benzeri kaynaklar için basit bir yer tutucu). Her parça doğrulanıp
+dashboard'un tipli şemasına çevrilir; tek parça halinde okunması gereken JSON
+dizileri dışında ham metin hiçbir zaman tamamen belleğe alınmaz.
+"""
+import argparse
+import io
+import json
+import os
+import socket
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from dashboard.aggregates import DayAggregates
+from dashboard.correlation import CorrelationEngine
+from dashboard.histogram import ValueHistograms
+from dashboard.pyramid import RollupPyramid
+from dashboard.store import BINARY_SENSORS, DAYS, MINUTES_PER_DAY, SENSORS, TIMES, WEEK_ORIGIN, SensorStore
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def read_csv_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    yield from pd.read_csv(path, chunksize=chunksize)
+
+
+def read_jsonl_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    with pd.read_json(path, lines=True, chunksize=chunksize) as reader:
+        yield from reader
+
+
+def read_json_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    .json dosyası: '[' ile başlıyorsa tek bir JSON dizisi (bütünüyle okunur), aksi halde JSON-lines
+    """
+    with open(path, encoding="utf-8") as handle:
+        first = ""
+        while not first:
+            character = handle.read(1)
+            if not character:
+                return
+            first = character.strip()
+    if first != "[":
+        yield from read_jsonl_chunks(path, chunksize)
+        return
+    df = pd.read_json(path)
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def read_parquet_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise ImportError("Parquet okumak için pyarrow gereklidir: pip install pyarrow") from exc
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+        yield batch.to_pandas()
+
+
+def _parse_lines(lines, header=None):
+    """
+    JSON veya CSV satırlarından DataFrame; CSV için başlık satırı verilmelidir
+    """
+    if header is None:
+        return pd.DataFrame.from_records([json.loads(line) for line in lines])
+    return pd.read_csv(io.StringIO("".join([header, *lines])))
+
+
+def tail_log(path, chunksize=1_000, poll_interval=1.0, stop=None):
+    """
+    Sonuna yazılan bir log dosyasını takip eder ve yeni satırları parça halinde döndürür.
+
+    .csv dosyalarında ilk satır başlık kabul edilir, diğerleri JSON-lines olarak okunur.
+    `stop` verilirse her yoklamada çağrılır; True dönerse takip biter.
+    """
+    is_csv = str(path).endswith(".csv")
+    with open(path, encoding="utf-8") as handle:
+        header = handle.readline() if is_csv else None
+        pending = []
+        while not (stop and stop()):
+            position = handle.tell()
+            line = handle.readline()
+            if line.endswith("\n"):
+                if line.strip():
+                    pending.append(line)
+                if len(pending) < chunksize:
+                    continue
+            elif line:
+                # Yarım yazılmış satır; tamamlanmasını bekle
+                handle.seek(position)
+            if pending:
+                yield _parse_lines(pending, header)
+                pending = []
+            else:
+                time.sleep(poll_interval)
+
+
+def read_socket(host="127.0.0.1", port=1883, chunksize=1_000, timeout=1.0, stop=None):
+    """
+    Satır başına bir JSON mesajı gönderen yerel bir soketten okur.
+
+    Baytlar kendi tamponumuzda biriktirilir; zaman aşımında tamponun sonundaki
+    yarım satır korunur ve sonraki baytlarla tamamlanır.
+    """
+    with socket.create_connection((host, port)) as connection:
+        connection.settimeout(timeout)
+        buffer = b""
+        pending = []
+        while not (stop and stop()):
+            try:
+                data = connection.recv(65536)
+            except socket.timeout:
+                data = None
+            if data == b"":
+                break
+            if data:
+                *lines, buffer = (buffer + data).split(b"\n")
+                pending.extend(line.decode("utf-8") for line in lines if line.strip())
+            while len(pending) >= chunksize:
+                yield _parse_lines(pending[:chunksize])
+                pending = pending[chunksize:]
+            if pending and data is None:
+                yield _parse_lines(pending)
+                pending = []
+        # Bağlantı kapanırken son satırın sonunda satır sonu olmayabilir
+        if buffer.strip():
+            pending.append(buffer.decode("utf-8"))
+        if pending:
+            yield _parse_lines(pending)
+
+
+def open_source(path, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Dosya uzantısına göre uygun okuyucuyu seçer
+    """
+    suffix = os.path.splitext(str(path))[1].lower()
+    if suffix == ".csv":
+        return read_csv_chunks(path, chunksize)
+    if suffix in (".jsonl", ".ndjson"):
+        return read_jsonl_chunks(path, chunksize)
+    if suffix == ".json":
+        return read_json_chunks(path, chunksize)
+    if suffix in (".parquet", ".pq"):
+        return read_parquet_chunks(path, chunksize)
+    raise ValueError(f"Desteklenmeyen dosya tipi: {suffix}")
+
+
+def normalize_chunk(df):
+    """
+    Bir parçayı doğrular ve tipli şemaya çevirir.
+
+    Zaman 'Gün' + 'Saat' kolonlarından ya da 'Zaman' zaman damgasından alınır.
+    Geçersiz zaman veya ikili sensör değerine sahip satırlar reddedilir; ölçüm
+    sensörlerindeki eksik/bozuk değerler NaN olarak tutulur.
+
+    Dönüş: (haftanın dakikası, okumalar, oda bilgileri, reddedilen satır sayısı,
+    epoch dakikası zaman damgaları)
+    """
+    missing = [name for name in SENSORS if name not in df]
+    if missing:
+        raise ValueError(f"Eksik sensör kolonları: {missing}")
+
+    if "Zaman" in df:
+        timestamp = pd.to_datetime(df["Zaman"], errors="coerce")
+        if timestamp.dt.tz is not None:
+            # Gün ve saat yerel saate göre; zaman damgası da yerel duvar saati olarak tutulur
+            timestamp = timestamp.dt.tz_localize(None)
+        valid = timestamp.notna().to_numpy()
+        day = np.where(valid, timestamp.dt.dayofweek.fillna(0), -1).astype(np.int64)
+        time_of_day = np.where(valid, (timestamp.dt.hour * 60 + timestamp.dt.minute).fillna(0), -1).astype(np.int64)
+        epoch = np.where(valid, timestamp.to_numpy().astype("datetime64[m]").astype(np.int64), 0)
+    elif "Gün" in df and "Saat" in df:
+        day = pd.Categorical(df["Gün"], categories=DAYS).codes.astype(np.int64)
+        time_of_day = pd.Categorical(df["Saat"].astype(str).str.slice(0, 5), categories=TIMES).codes.astype(np.int64)
+        epoch = WEEK_ORIGIN + day * MINUTES_PER_DAY + time_of_day
+    else:
+        raise ValueError("Zaman bilgisi için 'Zaman' ya da 'Gün' ve 'Saat' kolonları gereklidir")
+
+    valid = (day >= 0) & (time_of_day >= 0)
+    readings = {}
+    for name in SENSORS:
+        values = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64)
+        if name in BINARY_SENSORS:
+            valid &= (values == 0) | (values == 1)
+        readings[name] = values
+
+    room = {}
+    if "Metrekare" in df:
+        area = pd.to_numeric(df["Metrekare"], errors="coerce").dropna()
+        if len(area):
+            room["Metrekare"] = int(area.iloc[0])
+    if "Bina" in df:
+        building = df["Bina"].dropna()
+        if len(building):
+            room["Bina"] = str(building.iloc[0])
+
+    minute = (day * MINUTES_PER_DAY + time_of_day)[valid]
+    readings = {name: values[valid] for name, values in readings.items()}
+    return minute, readings, room, int(len(df) - valid.sum()), epoch[valid]
+
+
+class IngestPipeline:
+    """
+    Parçaları tipli depoya ve artımlı toplamlara ekleyen yükleme hattı.
+
+    `keep_rows=False` ile ham satırlar saklanmaz, yalnızca toplamlar güncellenir;
+    aylarca geçmiş veri sabit bellekle geri doldurulabilir. Bir AlertEngine
+    verilirse kurallar her parça üzerinde, geldiği anda değerlendirilir.
+    """
+
+    def __init__(self, keep_rows=True, source=None, alerts=None):
+        self.keep_rows = keep_rows
+        self.source = source or uuid.uuid4().hex
+        self.alerts = alerts
+        self.aggregates = DayAggregates.empty(source=self.source)
+        self.pyramid = RollupPyramid(source=self.source)
+        self.correlation = CorrelationEngine(source=self.source)
+        self.histograms = ValueHistograms.empty(source=self.source)
+        self.room = {}
+        self.rows = 0
+        self.rejected = 0
+        self.chunks = 0
+        self.seconds = 0.0
+        self._minutes = []
+        self._timestamps = []
+        self._readings = {name: [] for name in SENSORS}
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def add(self, df):
+        """
+        Tek bir parçayı işler ve eklenen satır sayısını döndürür
+        """
+        minute, readings, room, rejected, timestamp = normalize_chunk(df)
+        self.aggregates.add(minute, readings)
+        self.pyramid.add(timestamp, readings)
+        self.correlation.update(timestamp, readings)
+        self.histograms.add(minute, readings)
+        if self.keep_rows:
+            self._minutes.append(minute.astype(np.uint16))
+            self._timestamps.append(timestamp)
+            for name in SENSORS:
+                self._readings[name].append(readings[name].astype(np.float32))
+        self.room.update(room)
+        if self.alerts is not None:
+            self.alerts.update(timestamp, readings, self.room.get("Oda"))
+        self.rows += len(minute)
+        self.rejected += rejected
+        self.chunks += 1
+        self.aggregates.version = self.pyramid.version = self.correlation.version = self.chunks
+        self.histograms.version = self.chunks
+        return len(minute)
+
+    def run(self, chunks):
+        """
+        Kaynağı sonuna kadar tüketir; süre okuma ve dönüştürme dahil ölçülür
+        """
+        last = time.perf_counter()
+        for df in chunks:
+            self.add(df)
+            now = time.perf_counter()
+            self.seconds += now - last
+            last = now
+        return self
+
+    def store(self):
+        """
+        Şimdiye kadar yüklenen satırlardan salt okunur bir SensorStore oluşturur
+        """
+        if not self.keep_rows:
+            raise ValueError("keep_rows=False ile ham satırlar saklanmaz")
+        minute = np.concatenate(self._minutes) if self._minutes else np.empty(0, dtype=np.uint16)
+        timestamp = np.concatenate(self._timestamps) if self._timestamps else np.empty(0, dtype=np.int64)
+        readings = {
+            name: np.concatenate(parts) if parts else np.empty(0, dtype=np.float32)
+            for name, parts in self._readings.items()
+        }
+        return SensorStore(minute, readings, self.room or None, version=self.chunks, source=self.source,
+                           timestamp=timestamp)
+
+    def summary(self):
+        summary = {
+            "rows": self.rows,
+            "rejected": self.rejected,
+            "chunks": self.chunks,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+        if self.alerts is not None:
+            summary["alerts"] = self.alerts.fired
+        return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sensör kayıtlarını yükler ve hızını raporlar")
+    parser.add_argument("path", help="CSV, JSON-lines veya Parquet dosyası")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--aggregates-only", action="store_true", help="Ham satırları saklama, yalnızca toplamları güncelle")
+    parser.add_argument("--alerts", nargs="?", const="", metavar="KURALLAR",
+                        help="Alarm kurallarını yüklerken değerlendir (JSON kural dosyası; verilmezse varsayılanlar)")
+    parser.add_argument("--alert-log", help="Tetiklenen alarmların yazılacağı JSON-lines dosyası")
+    args = parser.parse_args(argv)
+
+    if args.alerts is None:
+        pipeline = IngestPipeline(keep_rows=not args.aggregates_only)
+    else:
+        # Kurallar oda başına değerlendirilir; 'Oda' kolonu varsa veri odalara bölümlenir
+        from dashboard.alerts import AlertEngine, load_rules
+        from dashboard.fleet import FleetPipeline
+
+        alerts = AlertEngine(load_rules(args.alerts or None), args.alert_log)
+        pipeline = FleetPipeline(keep_rows=not args.aggregates_only, alerts=alerts)
+    pipeline.run(open_source(args.path, args.chunksize))
+    print(json.dumps(pipeline.summary(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Oturumlar arasında paylaşılan arka plan iş kuyruğu
+
+Analiz ve çizim işleri script çalıştırmasını bekletmeden bir iş parçacığı
+havuzunda çalışır. İşler sonuç anahtarıyla (fonksiyon + argümanların parmak
+izi) tekilleştirilir; aynı sonucu isteyen oturumlar tek işi paylaşır. Her
+oturumun her paneli bir "yuva"dır (slot): yuvaya yeni bir iş gönderildiğinde,
+eski işi bekleyen başka yuva kalmadıysa eski iş iptal edilir. Henüz başlamamış
+işler hiç çalışmaz, çalışan işler bir sonraki `checkpoint()` çağrısında durur.
+"""
+import functools
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+
+from dashboard.cache import LRUCache
+
+_local = threading.local()
+
+
+def checkpoint():
+    """
+    Çalışan iş iptal edildiyse CancelledError fırlatır; iş dışında hiçbir şey yapmaz
+    """
+    job = getattr(_local, "job", None)
+    if job is not None and job.cancelled:
+        raise CancelledError()
+
+
+class Job:
+    """
+    Tek bir arka plan hesaplaması ve onu bekleyen yuvalar
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.slots = set()
+        self.future = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        self.future.cancel()
+
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout=None):
+        """
+        En çok `timeout` saniye bekler; iş bittiyse True
+        """
+        wait_futures([self.future], timeout)
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()
+
+
+class JobRunner:
+    """
+    İptal edilebilir, tekilleştirilen işler için iş parçacığı havuzu.
+
+    Biten işlerin sonuçları `max_bytes` bütçeli bir LRU önbellekte tutulur;
+    aynı anahtar yeniden istendiğinde iş kuyruğa girmeden hazır döner ve bir
+    panelin önceki sonucu yenisi hesaplanırken gösterilebilir. Sonuçlar küçük
+    tutulmalıdır (görüntü baytları, özet tablolar); ham satırlar zaten veri
+    önbelleğindedir.
+    """
+
+    def __init__(self, max_workers=2, max_bytes=32 * 1024 * 1024):
+        self.results = LRUCache(max_bytes=max_bytes)
+        self.submitted = 0
+        self.shared = 0
+        self.cancelled = 0
+        self.failed = 0
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="oda-job")
+        self._jobs = {}
+        self._slots = {}
+        self._lock = threading.RLock()
+
+    def submit(self, slot, key, func, *args, **kwargs):
+        """
+        `func(*args, **kwargs)` işini `slot` yuvası için kuyruğa alır; yuvanın
+        önceki işi artık kimse tarafından beklenmiyorsa iptal edilir
+        """
+        sentinel = object()
+        value = self.results.get(key, sentinel)
+        with self._lock:
+            if value is not sentinel:
+                job = Job(key)
+                job.future = Future()
+                job.future.set_result(value)
+            else:
+                job = self._jobs.get(key)
+                if job is None or job.cancelled:
+                    job = Job(key)
+                    self._jobs[key] = job
+                    self.submitted += 1
+                    job.future = self._executor.submit(self._run, job, func, args, kwargs)
+                    job.future.add_done_callback(functools.partial(self._finished, job))
+                elif slot not in job.slots:
+                    self.shared += 1
+            previous = self._slots.pop(slot, None)
+            if previous is not None and previous is not job:
+                self._release(previous, slot)
+            if not job.done():
+                job.slots.add(slot)
+                self._slots[slot] = job
+        return job
+
+    def result(self, key, default=None):
+        """
+        Biten bir işin önbellekteki sonucu (ör. yenisi hesaplanırken gösterilecek eski sonuç)
+        """
+        return self.results.get(key, default)
+
+    def _release(self, job, slot):
+        job.slots.discard(slot)
+        if not job.slots and not job.done():
+            job.cancel()
+            self.cancelled += 1
+
+    def _run(self, job, func, args, kwargs):
+        if job.cancelled:
+            raise CancelledError()
+        _local.job = job
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.job = None
+
+    def _finished(self, job, future):
+        with self._lock:
+            if not (future.cancelled() or job.cancelled):
+                if future.exception() is None:
+                    # Sonuç iş listeden çıkmadan yazılır; arada gelen istek işi yeniden başlatmaz
+                    self.results.put(job.key, future.result())
+                else:
+                    self.failed += 1
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            for slot in job.slots:
+                if self._slots.get(slot) is job:
+                    del self._slots[slot]
+            job.slots.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._jobs),
+                "submitted": self.submitted,
+                "shared": self.shared,
+                "cancelled": self.cancelled,
+                "failed": self.failed,
+                "results": len(self.results),
+            }
+
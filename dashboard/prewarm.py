@@ -0,0 +1,150 @@
+"""
+Sunucu açılışında veri ve toplam önbelleklerinin doldurulması
+
+Yeni başlayan bir dashboard süreci (ör. otomatik ölçeklenen bir işçi), ilk
+oturum bağlanmadan önce veriyi yükleyip her oda için gün × dakika toplamlarını,
+toplam piramidini ve değer histogramlarını hesaplayabilir ve alarm kurallarını
+değerlendirebilir; ardından çizim kütüphanelerini arka planda içe aktarır. Her
+kaynak süreç içinde bir kez yüklenir: dashboard aynı kaynağı istediğinde hazır
+filoyu alır, ön ısıtma henüz sürüyorsa aynı yüklemeyi bekler.
+
+    python -m dashboard.prewarm --server.port 8501
+    python -m dashboard.prewarm --no-charts --server.headless true
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+from dashboard import analysis
+from dashboard.aggregates import DayAggregates
+from dashboard.alerts import AlertEngine, evaluate_fleet, load_rules
+from dashboard.fleet import DEFAULT_ROOM, Fleet, FleetPipeline, load_fleet
+from dashboard.histogram import ValueHistograms
+from dashboard.ingest import open_source
+from dashboard.pyramid import RollupPyramid
+from dashboard.render import lazy_import
+
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+# Kaynak → yükleme; tamamlanmamış yüklemeyi isteyen çağrılar aynı Future'ı bekler
+_loads = {}
+_lock = threading.Lock()
+# Alarmlar filo başına bir kez değerlendirilir (ve günlüğe bir kez yazılır)
+_alerts_lock = threading.Lock()
+
+
+def _load(snapshot_path, data_path):
+    if snapshot_path:
+        return load_fleet(snapshot_path), None
+    if data_path:
+        pipeline = FleetPipeline().run(open_source(data_path))
+        return pipeline.fleet(), pipeline.summary()
+    return Fleet({DEFAULT_ROOM: analysis.create_initial_data()}), None
+
+
+def load(snapshot_path=None, data_path=None):
+    """
+    (filo, yükleme özeti); anlık görüntü, kayıt dosyası veya (ikisi de yoksa) sentetik veri.
+    Başarısız yükleme saklanmaz, sonraki çağrı yeniden dener.
+    """
+    key = (snapshot_path, None if snapshot_path else data_path)
+    with _lock:
+        future = _loads.get(key)
+        owner = future is None
+        if owner:
+            future = _loads[key] = Future()
+    if owner:
+        try:
+            future.set_result(_load(snapshot_path, data_path))
+        except BaseException as error:
+            with _lock:
+                del _loads[key]
+            future.set_exception(error)
+    return future.result()
+
+
+def warm(fleet):
+    """
+    Eksik oda toplamlarını (gün × dakika, piramit, değer histogramı) hesaplayıp filoya yazar
+    """
+    for room in fleet.rooms:
+        store = fleet[room]
+        if room not in fleet.aggregates:
+            fleet.aggregates[room] = DayAggregates.from_store(store)
+        if room not in fleet.pyramids:
+            fleet.pyramids[room] = RollupPyramid.from_store(store)
+        if room not in fleet.histograms:
+            fleet.histograms[room] = ValueHistograms.from_store(store)
+    return fleet
+
+
+def alerts(fleet, rules_path=None, log_path=None):
+    """
+    Alarm kurallarını (yoksa varsayılanları) tüm odalar için değerlendirip filoya yazar
+    """
+    with _alerts_lock:
+        if fleet.alerts is None:
+            fleet.alerts = evaluate_fleet(fleet, AlertEngine(load_rules(rules_path), log_path))
+    return fleet.alerts
+
+
+def prewarm(snapshot_path=None, data_path=None, charts=True, rules_path=None, log_path=None):
+    """
+    Veriyi yükler, toplamları ve alarmları hesaplar, istenirse çizim modüllerini içe aktarır; adım süreleri (sn)
+    """
+    timings = {}
+    started = time.perf_counter()
+    fleet, _ = load(snapshot_path, data_path)
+    timings["veri"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    warm(fleet)
+    timings["toplamlar"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    alerts(fleet, rules_path, log_path)
+    timings["alarmlar"] = time.perf_counter() - started
+
+    if charts:
+        started = time.perf_counter()
+        lazy_import("dashboard.charts")
+        lazy_import("dashboard.vega")
+        timings["grafik kütüphaneleri"] = time.perf_counter() - started
+    return timings
+
+
+def _boot(charts):
+    try:
+        timings = prewarm(os.environ.get("ODA_SNAPSHOT_PATH"), os.environ.get("ODA_DATA_PATH"), charts,
+                          os.environ.get("ODA_ALERT_RULES"), os.environ.get("ODA_ALERT_LOG"))
+    except Exception as error:
+        # Ön ısıtma isteğe bağlıdır; hata olursa dashboard veriyi ilk oturumda kendisi yükler
+        print(f"Ön ısıtma başarısız: {error}", file=sys.stderr)
+        return
+    print("Ön ısıtma: " + " · ".join(f"{name} {seconds:.2f} sn" for name, seconds in timings.items()),
+          file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Dashboard'u başlatır; veri ve toplamlar sunucu açılırken arka planda hazırlanır",
+        epilog="Tanınmayan seçenekler 'streamlit run' komutuna aktarılır (ör. --server.port 8501)",
+    )
+    parser.add_argument("--no-charts", action="store_true", help="Çizim kütüphanelerini önceden içe aktarma")
+    args, streamlit_args = parser.parse_known_args(argv)
+
+    from streamlit.web import cli
+
+    threading.Thread(target=_boot, args=(not args.no_charts,), name="oda-prewarm", daemon=True).start()
+    sys.argv = ["streamlit", "run", MAIN_SCRIPT, *streamlit_args]
+    return cli.main()
+
+
+if __name__ == "__main__":
+    # Dashboard bu modülü 'dashboard.prewarm' adıyla içe aktarır; yüklemeler o kopyada tutulmalı
+    from dashboard.prewarm import main as _main
+
+    sys.exit(_main())
@@ -0,0 +1,192 @@
+"""
+Yeniden çalıştırma (rerun) başına adım profili ve zaman dışa aktarımı
+
+Script her çalıştığında `begin()` ile yeni bir profil açılır; `stage()`
+blokları bu profile başlangıç anı, süre ve iç içelik derinliğiyle kaydedilir.
+Profil iş parçacığına bağlıdır (Streamlit her oturumu kendi iş parçacığında
+çalıştırır); açık profil yoksa `stage()` hiçbir şey yapmaz.
+"""
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+_local = threading.local()
+
+
+class RerunProfile:
+    """
+    Tek bir script çalıştırmasının adımları (başlangıç sırasıyla)
+    """
+
+    def __init__(self):
+        self.created = time.time()
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.stages = []
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name, **labels):
+        start = time.perf_counter()
+        record = {"stage": name, "start": start - self.started, "seconds": 0.0, "depth": self._depth, **labels}
+        self.stages.append(record)
+        self._depth += 1
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            record["seconds"] = time.perf_counter() - start
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+    def to_dict(self):
+        return {
+            "time": datetime.fromtimestamp(self.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "seconds": self.seconds,
+            "stages": self.stages,
+        }
+
+
+def begin():
+    """
+    Bu iş parçacığı için yeni bir profil başlatır
+    """
+    _local.profile = RerunProfile()
+    return _local.profile
+
+
+def current():
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def stage(name, **labels):
+    """
+    Açık profil varsa bloğun süresini kaydeder; kayıt sözlüğü etiket eklemek için döner
+    """
+    profile = current()
+    if profile is None:
+        yield {}
+        return
+    with profile.stage(name, **labels) as record:
+        yield record
+
+
+def profiled(name=None):
+    """
+    Fonksiyon çağrılarını `stage` ile ölçen dekoratör
+    """
+    def decorator(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def rotating_logger(name, path, max_bytes=10 * 1024 * 1024, backups=5):
+    """
+    Satırları olduğu gibi dönen (rotating) bir dosyaya yazan logger; aynı dosya için tek işleyici
+    """
+    logger = logging.getLogger(f"{name}.{os.path.abspath(path)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    if not logger.handlers:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    return logger
+
+
+class StageMetrics:
+    """
+    Süreç ömrü boyunca adım başına toplam süre ve çağrı sayısı (Prometheus için)
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self.reruns = 0
+        self.rerun_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        with self._lock:
+            self.reruns += 1
+            self.rerun_seconds += profile.seconds or 0.0
+            for record in profile.stages:
+                seconds, count = self.totals.get(record["stage"], (0.0, 0))
+                self.totals[record["stage"]] = (seconds + record["seconds"], count + 1)
+
+    def to_prometheus(self, caches=None):
+        """
+        Prometheus metin formatı (node_exporter textfile collector ile okunabilir)
+        """
+        def label(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+        lines = [
+            "# HELP oda_rerun_seconds Script çalıştırma süresi",
+            "# TYPE oda_rerun_seconds summary",
+            f"oda_rerun_seconds_sum {self.rerun_seconds:.6f}",
+            f"oda_rerun_seconds_count {self.reruns}",
+            "# HELP oda_stage_seconds Adım süresi",
+            "# TYPE oda_stage_seconds summary",
+        ]
+        with self._lock:
+            for name, (seconds, count) in sorted(self.totals.items()):
+                lines.append(f'oda_stage_seconds_sum{{stage="{label(name)}"}} {seconds:.6f}')
+                lines.append(f'oda_stage_seconds_count{{stage="{label(name)}"}} {count}')
+        if caches:
+            for metric, kind, help_text in (
+                ("hits", "counter", "Önbellek isabetleri"),
+                ("misses", "counter", "Önbellek ıskalamaları"),
+                ("evictions", "counter", "Önbellekten çıkarılan kayıtlar"),
+                ("bytes", "gauge", "Önbellekteki bayt"),
+                ("hit_rate", "gauge", "Önbellek isabet oranı"),
+            ):
+                suffix = "_total" if kind == "counter" else ""
+                lines.append(f"# HELP oda_cache_{metric}{suffix} {help_text}")
+                lines.append(f"# TYPE oda_cache_{metric}{suffix} {kind}")
+                for cache_name, stats in sorted(caches.items()):
+                    lines.append(f'oda_cache_{metric}{suffix}{{cache="{label(cache_name)}"}} {stats[metric]}')
+        return "\n".join(lines) + "\n"
+
+
+class TimingExporter:
+    """
+    Profilleri dönen (rotating) bir JSON-lines dosyasına ve/veya bir Prometheus
+    metin dosyasına yazar. Yol verilmeyen çıktılar atlanır.
+    """
+
+    def __init__(self, jsonl_path=None, prometheus_path=None, max_bytes=10 * 1024 * 1024, backups=5):
+        self.metrics = StageMetrics()
+        self.prometheus_path = prometheus_path
+        self.logger = None
+        if jsonl_path:
+            self.logger = rotating_logger(__name__, jsonl_path, max_bytes, backups)
+
+    def export(self, profile, caches=None):
+        self.metrics.add(profile)
+        if self.logger:
+            self.logger.info(json.dumps({**profile.to_dict(), "caches": caches or {}}, ensure_ascii=False))
+        if self.prometheus_path:
+            # Toplayıcı yarım yazılmış dosya görmesin diye önce geçici dosyaya yazılır
+            directory = os.path.dirname(os.path.abspath(self.prometheus_path))
+            handle, staging = tempfile.mkstemp(prefix=".oda-", suffix=".prom", dir=directory)
+            with os.fdopen(handle, "w", encoding="utf-8") as output:
+                output.write(self.metrics.to_prometheus(caches))
+            os.replace(staging, self.prometheus_path)
@@ -0,0 +1,258 @@
+"""
+Çok çözünürlüklü zaman piramidi (5 dk → 1 saat → 1 gün)
+
+Her seviye, kova başlangıcı (epoch dakikası) başına her sensör için adet,
+toplam, minimum ve maksimum tutar. Yeni okumalar geldikçe yalnızca onların
+düştüğü kovalar güncellenir; uzun aralıklı sorgular ham satırlar yerine
+grafiği dolduran en kaba seviyeden okunur. Dakika başına kova ham depodan
+büyük olacağı için 1 dakikalık sorgular doğrudan depodaki satırlardan toplanır.
+"""
+import numpy as np
+
+from dashboard.store import SENSORS
+
+ROLLUP_STEPS = (5, 60, 1440)
+# Piramitte tutulmayan, depodan okunan dakika çözünürlüğü
+RAW_STEP = 1
+ROLLUP_LABELS = {1: "1 dk", 5: "5 dk", 60: "1 saat", 1440: "1 gün"}
+STATS = ("count", "total", "low", "high")
+
+
+def _reduce(keys, stats):
+    """
+    Sıralı anahtarlara göre ardışık satırları tek kovada birleştirir
+    """
+    if len(keys) == 0:
+        return keys, stats
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(keys)) + 1])
+    return keys[starts], {
+        "count": np.add.reduceat(stats["count"], starts, axis=0),
+        "total": np.add.reduceat(stats["total"], starts, axis=0),
+        "low": np.minimum.reduceat(stats["low"], starts, axis=0),
+        "high": np.maximum.reduceat(stats["high"], starts, axis=0),
+    }
+
+
+def _buckets(timestamp, values):
+    """
+    Okumaları epoch dakikası başına kovalara toplar
+    """
+    if np.any(np.diff(timestamp) < 0):
+        order = np.argsort(timestamp, kind="stable")
+        timestamp, values = timestamp[order], values[order]
+    valid = np.isfinite(values)
+    return _reduce(timestamp, {
+        "count": valid.astype(np.int64),
+        "total": np.where(valid, values, 0.0),
+        "low": np.where(valid, values, np.inf),
+        "high": np.where(valid, values, -np.inf),
+    })
+
+
+def _concat(chunks):
+    keys = np.concatenate([keys for keys, _ in chunks])
+    return keys, {stat: np.concatenate([stats[stat] for _, stats in chunks]) for stat in STATS}
+
+
+class Rollup:
+    """
+    Bir piramit seviyesinden okunan kovalar; MinuteAggregates ile aynı arayüz
+    """
+
+    def __init__(self, keys, stats, step, sensors=SENSORS):
+        self.keys = keys
+        self.stats = stats
+        self.step = step
+        self.sensors = list(sensors)
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def times(self):
+        return self.keys.astype("datetime64[m]")
+
+    def _column(self, stat, name):
+        return self.stats[stat][:, self.sensors.index(name)]
+
+    def count(self, name):
+        return self._column("count", name)
+
+    def mean(self, name):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self._column("total", name) / self.count(name)
+
+    def min(self, name):
+        low = self._column("low", name)
+        return np.where(np.isfinite(low), low, np.nan)
+
+    def max(self, name):
+        high = self._column("high", name)
+        return np.where(np.isfinite(high), high, np.nan)
+
+
+class RollupPyramid:
+    """
+    Artımlı güncellenen toplam piramidi.
+
+    Her seviye sıralı parçaların listesidir. Zaman sırasıyla gelen veri yalnızca
+    son kovayı günceller ve yeni kovaları sona ekler; geç gelen (sıra dışı)
+    okumalar seviyeyi bir kez yeniden birleştirir. `store` verilmişse en ince
+    seviyeden kısa aralıklar depodaki ham satırlardan dakika dakika okunur.
+    """
+
+    def __init__(self, sensors=SENSORS, steps=ROLLUP_STEPS, version=0, source=None, store=None):
+        self.sensors = list(sensors)
+        self.steps = tuple(sorted(steps))
+        self.levels = {step: [] for step in self.steps}
+        self.version = version
+        self.source = source
+        self.store = store
+        self.first = self.last = None
+        self._cache = {}
+
+    @classmethod
+    def from_store(cls, store):
+        pyramid = cls(version=store.version, source=store.source, store=store)
+        return pyramid.add(store.timestamp, store.readings)
+
+    @property
+    def fingerprint(self):
+        return f"{self.source}@{self.version}"
+
+    def state(self):
+        """
+        Anlık görüntüye yazılacak (JSON meta verisi, dizi adı → dizi) ikilisi
+        """
+        meta = {"sensors": self.sensors, "steps": list(self.steps), "version": self.version, "source": self.source,
+                "first": self.first, "last": self.last}
+        arrays = {}
+        for step in self.steps:
+            keys, stats = self._stored(step)
+            arrays[f"{step}-keys"] = keys
+            arrays.update({f"{step}-{stat}": stats[stat] for stat in STATS})
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays, store=None):
+        """
+        `state` çıktısından piramidi kurar; diziler kopyalanmaz (ör. memory-mapped)
+        """
+        pyramid = cls(meta["sensors"], meta["steps"], meta["version"], meta["source"], store)
+        pyramid.first, pyramid.last = meta["first"], meta["last"]
+        for step in pyramid.steps:
+            keys = arrays[f"{step}-keys"]
+            if len(keys):
+                pyramid.levels[step] = [(keys, {stat: arrays[f"{step}-{stat}"] for stat in STATS})]
+        return pyramid
+
+    def add(self, timestamp, readings):
+        """
+        Yeni okumaları (epoch dakikası zaman damgalarıyla) tüm seviyelere ekler
+        """
+        timestamp = np.asarray(timestamp, dtype=np.int64)
+        if len(timestamp) == 0:
+            return self
+        values = np.column_stack([np.asarray(readings[name], dtype=np.float64) for name in self.sensors])
+        first, last = int(timestamp.min()), int(timestamp.max())
+        self.first = first if self.first is None else min(self.first, first)
+        self.last = last if self.last is None else max(self.last, last)
+
+        keys, stats = _buckets(timestamp, values)
+        # Kaba seviyeler ham satırlardan değil bir önceki seviyenin kovalarından toplanır
+        for step in self.steps:
+            keys, stats = _reduce(keys // step * step, stats)
+            self._append(step, keys, stats)
+        self._cache = {}
+        return self
+
+    def _append(self, step, keys, stats):
+        chunks = self.levels[step]
+        if chunks:
+            last_keys, last_stats = chunks[-1]
+            if keys[0] < last_keys[-1]:
+                merged = _concat([*chunks, (keys, stats)])
+                order = np.argsort(merged[0], kind="stable")
+                chunks[:] = [_reduce(merged[0][order], {stat: array[order] for stat, array in merged[1].items()})]
+                return
+            if keys[0] == last_keys[-1]:
+                # Devam eden kova: son kovayı yerinde güncelle (diskten açılmış salt okunur parça önce kopyalanır)
+                if not last_stats["count"].flags.writeable:
+                    last_stats = {stat: np.array(array) for stat, array in last_stats.items()}
+                    chunks[-1] = (last_keys, last_stats)
+                last_stats["count"][-1] += stats["count"][0]
+                last_stats["total"][-1] += stats["total"][0]
+                last_stats["low"][-1] = np.minimum(last_stats["low"][-1], stats["low"][0])
+                last_stats["high"][-1] = np.maximum(last_stats["high"][-1], stats["high"][0])
+                keys, stats = keys[1:], {stat: array[1:] for stat, array in stats.items()}
+        if len(keys):
+            chunks.append((keys, {stat: np.array(array) for stat, array in stats.items()}))
+
+    def _stored(self, step):
+        if step not in self._cache:
+            chunks = self.levels[step]
+            if chunks:
+                self._cache[step] = _concat(chunks)
+            else:
+                empty = np.empty((0, len(self.sensors)))
+                self._cache[step] = (np.empty(0, dtype=np.int64), {stat: empty for stat in STATS})
+        return self._cache[step]
+
+    def span(self):
+        """
+        Verinin kapsadığı [başlangıç, bitiş) epoch dakikası aralığı
+        """
+        return (self.first, self.last + 1) if self.first is not None else (0, 0)
+
+    @property
+    def finest(self):
+        """
+        Sorgulanabilen en ince çözünürlük; depo yoksa piramidin ilk seviyesi
+        """
+        return RAW_STEP if self.store is not None else self.steps[0]
+
+    def level_for(self, start, end, width):
+        """
+        Aralığı en az `width` kovayla dolduran en kaba seviye
+        """
+        for step in reversed(self.steps):
+            if (end - start) / step >= width:
+                return step
+        return self.finest
+
+    def _raw(self, start, end):
+        """
+        [start, end) aralığındaki depo satırlarının dakika kovaları
+        """
+        timestamp = self._raw_times()
+        lo, hi = np.searchsorted(timestamp, start), np.searchsorted(timestamp, end)
+        order = self.store.time_order
+        # Sıralı depoda satırlar kopyasız bir dilimdir; değilse zaman sırası üzerinden seçilir
+        rows = slice(lo, hi) if order is None else order[lo:hi]
+        values = np.column_stack([np.asarray(self.store.readings[name][rows], dtype=np.float64)
+                                  for name in self.sensors])
+        return _buckets(timestamp[lo:hi], values)
+
+    def _raw_times(self):
+        # Depo zaman damgaları artan sırada; sıralı depolarda kopya yapılmaz, sorgular ikili aramayla dilimlenir
+        if "raw" not in self._cache:
+            order = self.store.time_order
+            self._cache["raw"] = self.store.timestamp if order is None else self.store.timestamp[order]
+        return self._cache["raw"]
+
+    def query(self, start=None, end=None, width=None, step=None):
+        """
+        [start, end) aralığının kovaları; seviye verilmezse genişliğe göre seçilir
+        """
+        first, last = self.span()
+        start = first if start is None else start
+        end = last if end is None else end
+        if step is None:
+            step = self.level_for(start, end, width) if width else self.finest
+        if step == RAW_STEP:
+            keys, stats = self._raw(start, end)
+            return Rollup(keys, stats, step, self.sensors)
+        keys, stats = self._stored(step)
+        # Aralığın başladığı kova da dahil edilir
+        lo, hi = np.searchsorted(keys, start // step * step), np.searchsorted(keys, end)
+        return Rollup(keys[lo:hi], {stat: array[lo:hi] for stat, array in stats.items()}, step, self.sensors)
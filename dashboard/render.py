@@ -0,0 +1,237 @@
+"""
+Önceden toplanmış dakika dizilerini doğrudan matplotlib ile çizen hızlı grafik yolu
+ve bitmiş grafikler için render önbelleği sarmalayıcıları
+
+Bu modül çizim kütüphanelerini içe aktarmadan yüklenebilir; matplotlib yalnızca
+bir figür çizilirken, dashboard.charts ve dashboard.vega ise `deferred` ile
+sarılmış bir grafik ilk istendiğinde yüklenir.
+"""
+import functools
+import importlib
+import io
+import sys
+import threading
+
+import numpy as np
+
+from dashboard.cache import fingerprint
+from dashboard.profiling import stage
+from dashboard.store import DAYS, MINUTES_PER_DAY, MINUTES_PER_WEEK, TIMES, WEEK_ORIGIN
+
+# pyplot'un "geçerli figür" durumu süreç geneli; oturum iş parçacıkları aynı anda çizmesin
+PYPLOT_LOCK = threading.RLock()
+# Zaman ekseninde en fazla bu kadar gün etiketi gösterilir
+MAX_DAY_TICKS = 14
+
+
+def lazy_import(module):
+    """
+    Modülü ilk istendiğinde içe aktarır; içe aktarma süresi profile ayrı bir adım olarak yazılır
+    """
+    if module in sys.modules:
+        return importlib.import_module(module)
+    with stage(f"içe aktarma: {module}"):
+        return importlib.import_module(module)
+
+
+def deferred(module, name):
+    """
+    `module.name` fonksiyonunun tembel karşılığı. Modül ilk çağrıda yüklenir;
+    ad bilgileri aynı kaldığı için render önbelleği anahtarları değişmez.
+    """
+    def call(*args, **kwargs):
+        return getattr(lazy_import(module), name)(*args, **kwargs)
+
+    call.__module__, call.__name__, call.__qualname__ = module, name, name
+    return call
+
+
+def error_band(stats, name, band="ci"):
+    """
+    Dakika başına hata bandının alt ve üst sınırları.
+
+    "ci": ortalamanın %95 güven aralığı (seaborn'un varsayılanı, bootstrap yerine
+    kareler toplamından analitik olarak), "minmax": gözlenen en küçük/en büyük değer.
+    """
+    if band == "ci":
+        mean = stats.mean(name)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            half = 1.96 * stats.std(name) / np.sqrt(stats.count(name))
+        return mean - half, mean + half
+    if band == "minmax":
+        return stats.min(name), stats.max(name)
+    raise ValueError(f"Bilinmeyen bant tipi: {band}")
+
+
+def minute_axis(ax, present, step=60):
+    """
+    Dolu dakikaları 0..n-1 konumlarına yerleştirir; yalnızca saat başlarını etiketler
+    """
+    x = np.arange(len(present))
+    ticks = np.flatnonzero(present % step == 0)
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(np.asarray(TIMES)[present[ticks]], rotation=90)
+    ax.set_xlim(-0.5, max(len(present), 1) - 0.5)
+    return x
+
+
+def day_ticks(timestamps, max_ticks=MAX_DAY_TICKS):
+    """
+    Epoch dakikası ekseni için gün başı işaretleri ve etiketleri; bir haftadan uzun
+    aralıklarda etiketlere tarih eklenir, işaretler `max_ticks` sayısını aşmayacak şekilde seyreltilir
+    """
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.int64), []
+    first, last = int(timestamps.min()), int(timestamps.max())
+    days = np.arange(first // MINUTES_PER_DAY, last // MINUTES_PER_DAY + 1)
+    days = days[::-(-len(days) // max_ticks)]
+    starts = days * MINUTES_PER_DAY
+    names = [DAYS[(start - WEEK_ORIGIN) // MINUTES_PER_DAY % len(DAYS)] for start in starts]
+    if last - first > MINUTES_PER_WEEK:
+        dates = starts.astype("datetime64[m]").astype("datetime64[D]").astype(object)
+        names = [f"{name} {date:%d.%m}" for name, date in zip(names, dates)]
+    return starts, names
+
+
+def time_axis(ax, timestamps):
+    """
+    Gerçek zaman (epoch dakikası) ekseninde gün başlarını gün adları (ve tarihleri) ile etiketler
+    """
+    if len(timestamps) == 0:
+        return
+    starts, labels = day_ticks(timestamps)
+    ax.set_xticks(starts)
+    ax.set_xticklabels(labels, rotation=45)
+    ax.set_xlim(int(timestamps.min()), int(timestamps.max()))
+
+
+def chart_width(fig, ax):
+    """
+    Eksenin piksel cinsinden genişliği; seyreltme hedefi olarak kullanılır
+    """
+    return max(int(ax.get_position().width * fig.get_figwidth() * fig.dpi), 3)
+
+
+def draw_minute_bars(ax, stats, name, color, band=None):
+    """
+    Dakika ortalamalarını tek bir PolyCollection olarak çizer (1440 ayrı Rectangle yerine);
+    istenirse hata çubukları tek bir LineCollection
+    """
+    from matplotlib.collections import LineCollection, PolyCollection
+
+    present = stats.present(name)
+    x = minute_axis(ax, present)
+    height = stats.mean(name)[present]
+    left, right = x - 0.4, x + 0.4
+    zero = np.zeros_like(height)
+    verts = np.stack([
+        np.column_stack([left, zero]),
+        np.column_stack([left, height]),
+        np.column_stack([right, height]),
+        np.column_stack([right, zero]),
+    ], axis=1)
+    ax.add_collection(PolyCollection(verts, facecolors=color, linewidths=0))
+    ax.update_datalim(np.column_stack([x, height]))
+    ax.update_datalim([(0, 0)])
+    ax.autoscale_view(scalex=False)
+    if band:
+        low, high = (limit[present] for limit in error_band(stats, name, band))
+        segments = np.stack([np.column_stack([x, low]), np.column_stack([x, high])], axis=1)
+        ax.add_collection(LineCollection(segments, colors="#444444", linewidths=0.8, alpha=0.6))
+    return ax
+
+
+def draw_minute_line(ax, stats, name, color, band=None, marker=None):
+    """
+    Dakika ortalamaları tek bir çizgi; istenirse hata bandı fill_between ile
+    """
+    present = stats.present(name)
+    x = minute_axis(ax, present)
+    if band:
+        low, high = (limit[present] for limit in error_band(stats, name, band))
+        ax.fill_between(x, low, high, color=color, alpha=0.2, linewidth=0)
+    ax.plot(x, stats.mean(name)[present], color=color, linewidth=2, marker=marker, markersize=3)
+    return ax
+
+
+def rasterize(fig, fmt="png", dpi=100):
+    """
+    Figürü PNG/SVG baytlarına çevirir ve pyplot kaydından hemen kapatır
+    """
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def cached_figure(cache, fmt="png", dpi=100):
+    """
+    Figür döndüren fonksiyonu, bitmiş görüntü baytlarını `cache` içinde saklayan
+    bir fonksiyona çevirir.
+
+    Anahtar argümanların parmak izidir (veri sürümü + gün seçimi + parametreler);
+    isabette matplotlib hiç çalışmaz. Figür çizildikten hemen sonra kapatılır,
+    pyplot'un figür kaydı uzun süre çalışan süreçte büyümez. Iskalamada figür
+    kurulumu ve kodlama açık profile ayrı adımlar olarak yazılır.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, fingerprint(args), fingerprint(kwargs), fmt, dpi)
+
+            def render():
+                with PYPLOT_LOCK:
+                    with stage(f"{func.__name__}/çizim"):
+                        fig = func(*args, **kwargs)
+                    with stage(f"{func.__name__}/{fmt.upper()}"):
+                        return rasterize(fig, fmt, dpi)
+
+            with stage(func.__name__) as record:
+                record["cached"] = key in cache
+                return cache.get_or_compute(key, render)
+
+        return wrapper
+
+    return decorator
+
+
+def cached_spec(cache):
+    """
+    altair grafiği döndüren fonksiyonu, Vega-Lite spec sözlüğünü `cache` içinde
+    saklayan bir fonksiyona çevirir (cached_figure'ın tarayıcı karşılığı)
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, fingerprint(args), fingerprint(kwargs))
+
+            def build():
+                with stage(f"{func.__name__}/spec"):
+                    return func(*args, **kwargs).to_dict()
+
+            with stage(func.__name__) as record:
+                record["cached"] = key in cache
+                return cache.get_or_compute(key, build)
+
+        return wrapper
+
+    return decorator
+
+
+def draw_rollup(ax, rollup, name, color, band=True):
+    """
+    Piramit kovalarının ortalaması tek çizgi; istenirse kova içi min/max bandı
+    """
+    x = rollup.times
+    if band:
+        ax.fill_between(x, rollup.min(name), rollup.max(name), color=color, alpha=0.2, linewidth=0)
+    ax.plot(x, rollup.mean(name), color=color, linewidth=1.5)
+    return ax
@@ -0,0 +1,258 @@
+"""
+Streamlit olmadan toplu rapor: tüm odalar ve sensörler için analiz ve grafikler
+
+Her oda bir süreç havuzu işçisinde işlenir: anomali/trend analizleri her
+sensör için çalıştırılır, sensör başına tüm grafik tipleri PNG/SVG olarak
+yazılır. Oda × sensör özeti summary.csv/summary.json'a, üretilen dosyaların
+listesi report.json'a yazılır; dashboard ODA_REPORT_PATH ile bu dosyaları
+yeniden çizmeden gösterebilir.
+
+    python -m dashboard.report --snapshot /var/lib/oda/snapshot --output rapor --format png svg
+    python -m dashboard.report --rooms 500 --days 7 --output rapor --workers 16
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from dashboard import analysis
+from dashboard.aggregates import DayAggregates
+from dashboard.fleet import (
+    BUILDING_COLUMN,
+    DEFAULT_ROOM,
+    ROOM_COLUMN,
+    Fleet,
+    FleetPipeline,
+    _map,
+    _open,
+    _room_dir,
+    load_fleet,
+    process_pool,
+)
+from dashboard.histogram import PERCENTILES, ValueHistograms
+from dashboard.ingest import open_source
+from dashboard.pyramid import RollupPyramid
+from dashboard.store import MINUTES_PER_DAY, SENSOR_COLUMNS, SENSORS, StoreView
+from dashboard.trend import TREND_LABELS, RollingTrendEngine
+
+REPORT_MANIFEST = "report.json"
+FORMAT_VERSION = 1
+CHART_TYPES = ("column", "line", "pie", "anomaly", "trend", "rollup")
+SUMMARY_COLUMNS = [ROOM_COLUMN, BUILDING_COLUMN, "Sensör", "Satır", "Ortalama", "En Düşük", "En Yüksek",
+                   *(f"p{p}" for p in PERCENTILES), "Anomali", "Anomali Oranı", *TREND_LABELS.tolist()]
+
+
+def full_range(pyramid):
+    """
+    Verinin kapsadığı tam günler; dashboard'daki tarih aralığı seçiminin varsayılanı
+    """
+    first, last = pyramid.span()
+    return first // MINUTES_PER_DAY * MINUTES_PER_DAY, ((last - 1) // MINUTES_PER_DAY + 1) * MINUTES_PER_DAY
+
+
+def report_room(source, output, formats=("png",), threshold=2.5, window=5, dpi=100, method="seasonal"):
+    """
+    Tek odanın tüm sensörleri için özet satırları ve grafik dosyaları.
+
+    Modül seviyesinde olduğu için süreç havuzunda çalıştırılabilir; dönen yollar
+    `output` dizinine görelidir.
+    """
+    # Çizim kütüphaneleri yalnızca rapor üretilirken yüklenir; dashboard bu modülden
+    # yalnızca ReportArtifacts'ı kullanır
+    import matplotlib.pyplot as plt
+
+    from dashboard import charts
+
+    store, aggregates = _open(source)
+    view = StoreView(store, store.days())
+    stats = (aggregates or DayAggregates.from_store(store)).select(view.days)
+    distribution = ValueHistograms.from_store(store).select(view.days)
+    detector = analysis.build_anomaly_detector(store, method)
+    engine = RollingTrendEngine(windows=(window,))
+    engine.update(store.readings)
+    pyramid = RollupPyramid.from_store(store)
+    start, end = full_range(pyramid)
+
+    os.makedirs(output, exist_ok=True)
+    rows, artifacts = [], {}
+    for sensor, column in SENSOR_COLUMNS.items():
+        anomalies = analysis.detect_anomalies(view, column, threshold, detector)
+        trends = analysis.analyze_trends(view, column, window, engine)
+        values = view.sensor(column)
+        finite = values[np.isfinite(values)]
+        anomaly_count = int(anomalies["Anomali"].sum())
+        trend_counts = trends["Trend"].value_counts()
+        rows.append({
+            ROOM_COLUMN: store.room.get(ROOM_COLUMN, DEFAULT_ROOM),
+            BUILDING_COLUMN: store.room.get(BUILDING_COLUMN, ""),
+            "Sensör": sensor,
+            "Satır": len(values),
+            "Ortalama": float(finite.mean()) if len(finite) else np.nan,
+            "En Düşük": float(finite.min()) if len(finite) else np.nan,
+            "En Yüksek": float(finite.max()) if len(finite) else np.nan,
+            **distribution.percentiles(column),
+            "Anomali": anomaly_count,
+            "Anomali Oranı": anomaly_count / len(values) if len(values) else 0.0,
+            **{label: int(trend_counts.get(label, 0)) for label in TREND_LABELS.tolist()},
+        })
+
+        builders = {
+            "column": lambda: charts.create_sensor_column_chart(view, stats, sensor),
+            "line": lambda: charts.create_sensor_line_chart(view, stats, sensor),
+            "pie": lambda: charts.create_sensor_pie_chart(distribution, sensor),
+            "anomaly": lambda: charts.create_anomaly_chart(view, anomalies, sensor),
+            "trend": lambda: charts.create_trend_chart(view, trends, sensor),
+            "rollup": lambda: charts.create_rollup_chart(pyramid, sensor, start, end),
+        }
+        files = artifacts.setdefault(sensor, {})
+        for chart in CHART_TYPES:
+            # Figür bir kez kurulur, her formatta kaydedilip kapatılır
+            fig = builders[chart]()
+            try:
+                for fmt in formats:
+                    # Dosya adı snapshot'taki gibi sensör sırasından; Türkçe karakter içermez
+                    name = f"{SENSORS.index(column)}-{chart}.{fmt}"
+                    fig.savefig(os.path.join(output, name), format=fmt, dpi=dpi, bbox_inches="tight")
+                    files.setdefault(chart, {})[fmt] = name
+            finally:
+                plt.close(fig)
+    return rows, {"fingerprint": store.fingerprint, "charts": artifacts}
+
+
+def _report_task(task):
+    source, output, formats, threshold, window, dpi, method = task
+    return report_room(source, output, formats, threshold, window, dpi, method)
+
+
+def build_report(fleet, output, formats=("png",), threshold=2.5, window=5, dpi=100, executor=None, workers=None,
+                 method="seasonal"):
+    """
+    Filodaki tüm odaların raporunu (verilirse süreç havuzunda) üretir; özet tabloyu döndürür
+    """
+    os.makedirs(output, exist_ok=True)
+    directories = {room: _room_dir(index, room) for index, room in enumerate(fleet.rooms)}
+    tasks = [(fleet.source(room), os.path.join(output, directories[room]), tuple(formats), threshold, window, dpi,
+              method) for room in fleet.rooms]
+    results = _map(executor, _report_task, tasks, workers or os.cpu_count())
+
+    rows, rooms = [], {}
+    for room, (room_rows, artifacts) in zip(fleet.rooms, results):
+        rows.extend(room_rows)
+        rooms[room] = {"dir": directories[room], **artifacts}
+    summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    summary.to_csv(os.path.join(output, "summary.csv"), index=False)
+    summary.to_json(os.path.join(output, "summary.json"), orient="records", force_ascii=False, indent=2)
+
+    # Manifest en son ve atomik yazılır; dashboard yarım kalmış bir raporu okumaz
+    manifest = {
+        "format": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "threshold": threshold,
+        "window": window,
+        "method": method,
+        "dpi": dpi,
+        "rooms": rooms,
+    }
+    handle, staging = tempfile.mkstemp(prefix=".report-", dir=output)
+    with os.fdopen(handle, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, ensure_ascii=False, indent=2)
+    os.replace(staging, os.path.join(output, REPORT_MANIFEST))
+    return summary
+
+
+class ReportArtifacts:
+    """
+    Önceden üretilmiş rapor dosyaları; yalnızca aynı veri sürümü ve aynı
+    parametrelerle üretilmiş grafikler döndürülür
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, REPORT_MANIFEST), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if manifest.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Desteklenmeyen rapor formatı: {manifest.get('format')}")
+        self.threshold = manifest["threshold"]
+        self.window = manifest["window"]
+        self.method = manifest["method"]
+        self.rooms = manifest["rooms"]
+
+    def get(self, store, sensor, chart, fmt="png", threshold=None, window=None, method=None):
+        """
+        Görüntü baytları; rapor bu depo/parametreler için üretilmediyse None
+        """
+        entry = self.rooms.get(store.room.get(ROOM_COLUMN, DEFAULT_ROOM))
+        if entry is None or entry["fingerprint"] != store.fingerprint:
+            return None
+        if threshold is not None and not np.isclose(threshold, self.threshold):
+            return None
+        if window is not None and window != self.window:
+            return None
+        if method is not None and method != self.method:
+            return None
+        name = entry["charts"].get(sensor, {}).get(chart, {}).get(fmt)
+        if name is None:
+            return None
+        with open(os.path.join(self.path, entry["dir"], name), "rb") as handle:
+            return handle.read()
+
+
+def _load(args):
+    if args.snapshot:
+        return load_fleet(args.snapshot)
+    if args.data:
+        return FleetPipeline().run(open_source(args.data)).fleet()
+    return Fleet({
+        f"Oda {room + 1}": analysis.create_initial_data(args.days, args.seed, room={ROOM_COLUMN: f"Oda {room + 1}"},
+                                                        index=room)
+        for room in range(args.rooms)
+    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tüm odalar ve sensörler için analiz özeti ve grafik dosyaları üretir")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--snapshot", help="Anlık görüntü (tek oda veya filo) dizini")
+    source.add_argument("--data", help="CSV, JSON-lines veya Parquet dosyası")
+    parser.add_argument("--rooms", type=int, default=1, help="Kaynak verilmezse sentetik oda sayısı")
+    parser.add_argument("--days", type=int, default=7, help="Kaynak verilmezse sentetik gün sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", required=True, help="Raporun yazılacağı dizin")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=["png", "svg"])
+    parser.add_argument("--threshold", type=float, default=2.5, help="Anomali Z-score eşiği")
+    parser.add_argument("--window", type=int, default=5, help="Trend penceresi")
+    parser.add_argument("--method", default="seasonal", choices=analysis.ANOMALY_METHODS, help="Anomali yöntemi")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Süreç sayısı")
+    args = parser.parse_args(argv)
+
+    import matplotlib.pyplot as plt
+
+    plt.switch_backend("Agg")
+    started = time.perf_counter()
+    fleet = _load(args)
+    loaded = time.perf_counter()
+    if args.workers > 1 and len(fleet) > 1:
+        with process_pool(args.workers) as executor:
+            summary = build_report(fleet, args.output, args.format, args.threshold, args.window, args.dpi,
+                                   executor, args.workers, args.method)
+    else:
+        summary = build_report(fleet, args.output, args.format, args.threshold, args.window, args.dpi,
+                               method=args.method)
+    finished = time.perf_counter()
+
+    files = len(fleet) * len(SENSOR_COLUMNS) * len(CHART_TYPES) * len(args.format)
+    print(f"{len(fleet):,} oda, {files:,} grafik: yükleme {loaded - started:.1f} sn, "
+          f"rapor {finished - loaded:.1f} sn ({args.workers} işçi)", file=sys.stderr)
+    print(summary.groupby("Sensör", sort=False)[["Anomali", *TREND_LABELS.tolist()]].sum().to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+Günlük döngüye duyarlı (mevsimsel) anomali tespiti
+
+Okumalar sensör × günün dilimi × (gün, dilim içi dakika) matrisine yerleştirilir.
+Her sensör ve günün her dilimi (varsayılan 15 dakika) için tüm günler boyunca
+medyan ve MAD (medyan mutlak sapma) taban çizgisi tüm sensörlerde birlikte,
+vektörel olarak hesaplanır; bir okumanın puanı kendi diliminin taban çizgisinden
+sağlam (robust) Z-score cinsinden sapmasıdır. Böylece gece/gündüz döngüsü
+anomali sayılmaz, mesai dışı sapmalar kaçırılmaz.
+"""
+import numpy as np
+
+from dashboard.store import BINARY_SENSORS, MINUTES_PER_DAY, SENSORS
+
+# Normal dağılımda MAD ve ortalama mutlak sapmayı standart sapmaya çeviren sabitler
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+
+def nanmedian(values, axis):
+    """
+    NaN'ları yok sayan medyan; tek sıralamayla (NaN'lar sona dizilir).
+
+    np.nanmedian küçük eksenlerde maskeli dizilere, büyüklerde satır satır
+    döngüye düşer; burada tüm sütunlar aynı anda okunur.
+    """
+    ordered = np.sort(values, axis=axis)
+    count = np.expand_dims(np.isfinite(values).sum(axis=axis), axis)
+    # Dolu olmayan sütunlarda indeks 0 ve değer NaN kalır
+    low = np.take_along_axis(ordered, np.maximum((count - 1) // 2, 0), axis)
+    high = np.take_along_axis(ordered, count // 2, axis)
+    return np.squeeze((low + high) / 2, axis)
+
+
+class SeasonalAnomalyDetector:
+    """
+    Günün dilimi bazında medyan/MAD taban çizgisiyle sağlam Z-score.
+
+    OnlineAnomalyDetector ile aynı arayüzü (zscores, anomalies, bounds) sunar;
+    detect_anomalies ve anomali grafiği iki dedektörle de çalışır. Tek bir
+    dakikanın birkaç günlük örneği MAD için fazla gürültülü olduğundan taban
+    çizgisi `bucket` dakikalık dilimlerden hesaplanır. Medyan birleştirilebilir
+    bir istatistik olmadığı için yeni veride `fit` matrisi baştan kurar; matris
+    sensör başına gün × 1440 float32 hücredir.
+    """
+
+    def __init__(self, sensors=SENSORS, bucket=15):
+        if MINUTES_PER_DAY % bucket:
+            raise ValueError(f"Dilim günü tam bölmeli: {bucket}")
+        self.sensors = list(sensors)
+        self.bucket = bucket
+        shape = (len(self.sensors), MINUTES_PER_DAY // bucket)
+        self.median = np.full(shape, np.nan, dtype=np.float32)
+        self.scale = np.full(shape, np.nan, dtype=np.float32)
+        self.days = 0
+        self._slot = np.empty(0, dtype=np.int64)
+        self._scores = np.empty((len(self.sensors), 0), dtype=np.float32)
+
+    def state(self):
+        """
+        Anlık görüntüye yazılacak (JSON meta verisi, dizi adı → dizi) ikilisi
+        """
+        meta = {"sensors": self.sensors, "bucket": self.bucket, "days": self.days}
+        # Dilim numarası günde en fazla 1440 olduğundan 16 bitte saklanır
+        arrays = {"median": self.median, "scale": self.scale, "slot": self._slot.astype(np.uint16),
+                  "scores": self._scores}
+        return meta, arrays
+
+    @classmethod
+    def from_state(cls, meta, arrays):
+        detector = cls(meta["sensors"], meta["bucket"])
+        detector.days = meta["days"]
+        detector.median, detector.scale = arrays["median"], arrays["scale"]
+        detector._slot, detector._scores = arrays["slot"], arrays["scores"]
+        return detector
+
+    def fit(self, timestamp, readings):
+        """
+        Taban çizgisini epoch dakikası zaman damgalı okumalardan kurar ve her okumayı puanlar
+        """
+        timestamp = np.asarray(timestamp, dtype=np.int64)
+        values = np.stack([np.asarray(readings[name], dtype=np.float32) for name in self.sensors])
+        minute = timestamp % MINUTES_PER_DAY
+        day = timestamp // MINUTES_PER_DAY
+        day -= day.min() if len(day) else 0
+        self.days = int(day.max()) + 1 if len(day) else 0
+        slot = minute // self.bucket
+
+        # Her dilimin tüm günlerdeki örnekleri tek satırda; aynı hücreye düşen tekrar okumalarda sonuncusu kullanılır
+        matrix = np.full((len(self.sensors), MINUTES_PER_DAY // self.bucket, self.days * self.bucket), np.nan,
+                         dtype=np.float32)
+        matrix[:, slot, day * self.bucket + minute % self.bucket] = values
+        self.median = nanmedian(matrix, axis=2)
+        count = np.isfinite(matrix).sum(axis=2)
+
+        # İkili sensörlerde medyan/MAD 0-1 arasında sıçrar; dilimin açık olma oranı ve standart sapması kullanılır
+        binary = np.flatnonzero(np.isin(self.sensors, BINARY_SENSORS))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rate = np.nansum(matrix[binary], axis=2) / count[binary]
+        rate_std = np.sqrt(rate * (1 - rate))
+
+        # Sapmalar aynı matrisin üzerine yazılır; ikinci bir kopya tutulmaz
+        np.subtract(matrix, self.median[:, :, None], out=matrix)
+        np.abs(matrix, out=matrix)
+        mad = nanmedian(matrix, axis=2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_ad = np.nansum(matrix, axis=2) / count
+        # Örneklerin yarıdan fazlası aynı değerdeyse MAD sıfırdır; ortalama mutlak sapmaya düşülür
+        self.scale = np.where(mad > 0, MAD_SCALE * mad, MEAN_AD_SCALE * mean_ad).astype(np.float32)
+        self.median[binary] = rate
+        self.scale[binary] = rate_std
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = (values - self.median[:, slot]) / self.scale[:, slot]
+        # Sabit dilimlerde (ölçek 0) sapma yoktur
+        scores[np.isnan(scores) & np.isfinite(values)] = 0.0
+        self._slot = slot
+        self._scores = scores.astype(np.float32, copy=False)
+        return self
+
+    def zscores(self, sensor=None):
+        """
+        Saklanan sağlam Z-score'lar (n, sensör); sensör verilirse yalnızca o kolon
+        """
+        return self._scores.T if sensor is None else self._scores[self.sensors.index(sensor)]
+
+    def anomalies(self, threshold, sensor=None):
+        """
+        Sensör başına anomali maskesi; sensör verilmezse (n, sensör)
+        """
+        return np.abs(self.zscores(sensor)) > threshold
+
+    def bounds(self, threshold, sensor):
+        """
+        Her okuma için günün o dilimine ait alt ve üst eşik değerleri
+        """
+        j = self.sensors.index(sensor)
+        median = self.median[j, self._slot]
+        spread = threshold * self.scale[j, self._slot]
+        return median - spread, median + spread
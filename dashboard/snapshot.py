@@ -0,0 +1,199 @@
+"""
+Memory-mapped disk anlık görüntüsü (snapshot)
+
+Her kolon ayrı bir .npy dosyası olarak yazılır, manifest.json kolonları ve
+oda bilgilerini listeler. Okurken dosyalar np.load(mmap_mode="r") ile açılır;
+aynı makinedeki tüm Streamlit süreçleri sayfaları işletim sisteminin sayfa
+önbelleği üzerinden paylaşır ve açılış süresi veri boyutundan bağımsızdır.
+Türetilmiş oda durumu (toplam piramidi, değer histogramları, korelasyon
+momentleri, mevsimsel taban çizgisi) da aynı şekilde yazılır; soğuk açılışta
+satırlar yeniden taranmaz.
+"""
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from dashboard.aggregates import DayAggregates
+from dashboard.correlation import CorrelationEngine
+from dashboard.histogram import ValueHistograms
+from dashboard.pyramid import RollupPyramid
+from dashboard.seasonal import SeasonalAnomalyDetector
+from dashboard.store import SENSORS, SensorStore
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+# Anlık görüntüye yazılabilen türetilmiş durumlar; her biri state() / from_state() sunar
+STATE_TYPES = {
+    "pyramid": RollupPyramid,
+    "histograms": ValueHistograms,
+    "correlation": CorrelationEngine,
+    "seasonal": SeasonalAnomalyDetector,
+}
+
+
+def _column_file(name):
+    # Kolon adlarındaki boşluk ve Türkçe karakterler dosya adında sorun çıkarmasın
+    return f"{SENSORS.index(name)}.npy" if name in SENSORS else f"{name}.npy"
+
+
+def save_snapshot(path, store, aggregates=None, state=None):
+    """
+    Depoyu (ve varsa gün × dakika toplamlarını) `path` dizinine yazar.
+
+    `state` türetilmiş durumları ad → nesne olarak verir (adlar STATE_TYPES'taki
+    gibi); None olanlar yazılmaz.
+
+    Dizin önce geçici bir konuma yazılıp sonra yerine taşınır; okuyan süreçler
+    hiçbir zaman yarım yazılmış bir anlık görüntü görmez.
+    """
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".snapshot-", dir=parent)
+
+    columns = {
+        "minute": store.minute,
+        "timestamp": store.timestamp,
+        "day_code": store.day_code,
+        "time_code": store.time_code,
+    }
+    manifest = {
+        "format": FORMAT_VERSION,
+        "version": store.version,
+        "source": store.source,
+        "rows": len(store),
+        "room": store.room,
+        "columns": {},
+        "readings": {},
+        "aggregates": {},
+        "state": {},
+    }
+    for key, array in columns.items():
+        np.save(os.path.join(staging, f"{key}.npy"), array)
+        manifest["columns"][key] = f"{key}.npy"
+    for name in SENSORS:
+        file_name = _column_file(name)
+        np.save(os.path.join(staging, file_name), store.readings[name])
+        manifest["readings"][name] = file_name
+
+    if aggregates is not None:
+        for name in SENSORS:
+            for stat, array in aggregates.parts[name].items():
+                file_name = f"agg-{SENSORS.index(name)}-{stat}.npy"
+                np.save(os.path.join(staging, file_name), array)
+                manifest["aggregates"].setdefault(name, {})[stat] = file_name
+
+    for kind, value in (state or {}).items():
+        if value is None:
+            continue
+        meta, arrays = value.state()
+        files = {}
+        for key, array in arrays.items():
+            files[key] = f"{kind}-{key}.npy"
+            np.save(os.path.join(staging, files[key]), array)
+        manifest["state"][kind] = {"meta": meta, "arrays": files}
+
+    with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, ensure_ascii=False, indent=2)
+
+    if os.path.exists(path):
+        retired = tempfile.mkdtemp(prefix=".retired-", dir=parent)
+        os.replace(path, os.path.join(retired, "snapshot"))
+        os.replace(staging, path)
+        shutil.rmtree(retired, ignore_errors=True)
+    else:
+        os.replace(staging, path)
+    return path
+
+
+def _manifest(path):
+    with open(os.path.join(path, MANIFEST), encoding="utf-8") as handle:
+        manifest = json.load(handle)
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Desteklenmeyen anlık görüntü formatı: {manifest.get('format')}")
+    return manifest
+
+
+def load_snapshot(path):
+    """
+    Anlık görüntüyü kopyalamadan açar; (depo, toplamlar veya None) döndürür
+    """
+    manifest = _manifest(path)
+
+    def open_array(file_name):
+        return np.load(os.path.join(path, file_name), mmap_mode="r")
+
+    columns = {key: open_array(file_name) for key, file_name in manifest["columns"].items()}
+    readings = {name: open_array(file_name) for name, file_name in manifest["readings"].items()}
+    store = SensorStore(
+        columns["minute"],
+        readings,
+        room=manifest["room"],
+        version=manifest["version"],
+        codes=(columns["day_code"], columns["time_code"]),
+        source=manifest.get("source"),
+        # Zaman damgası kolonu olmayan eski anlık görüntülerde dakikadan türetilir
+        timestamp=columns.get("timestamp"),
+    )
+
+    aggregates = None
+    if manifest["aggregates"]:
+        parts = {
+            name: {stat: open_array(file_name) for stat, file_name in stats.items()}
+            for name, stats in manifest["aggregates"].items()
+        }
+        aggregates = DayAggregates(parts, manifest["version"], store.source)
+    return store, aggregates
+
+
+def load_state(path, store, kinds=tuple(STATE_TYPES)):
+    """
+    Anlık görüntüdeki türetilmiş durumları kopyalamadan açar; ad → nesne.
+
+    Durumu yazılmamış (ör. eski) anlık görüntülerde eksik adlar sözlükte yer almaz.
+    Piramit, dakika sorguları için verilen depoya bağlanır.
+    """
+    saved = _manifest(path).get("state", {})
+    state = {}
+    for kind in kinds:
+        if kind not in saved:
+            continue
+        arrays = {key: np.load(os.path.join(path, file_name), mmap_mode="r")
+                  for key, file_name in saved[kind]["arrays"].items()}
+        if kind == "pyramid":
+            state[kind] = RollupPyramid.from_state(saved[kind]["meta"], arrays, store)
+        else:
+            state[kind] = STATE_TYPES[kind].from_state(saved[kind]["meta"], arrays)
+    return state
+
+
+def main(argv=None):
+    from dashboard.analysis import build_anomaly_detector
+    from dashboard.fleet import FleetPipeline, save_fleet
+    from dashboard.ingest import open_source
+
+    parser = argparse.ArgumentParser(description="Sensör kayıtlarından memory-mapped anlık görüntü oluşturur")
+    parser.add_argument("source", help="CSV, JSON-lines veya Parquet dosyası")
+    parser.add_argument("path", help="Anlık görüntü dizini")
+    args = parser.parse_args(argv)
+
+    # 'Oda' kolonu olan kaynaklar oda başına bir alt dizine bölümlenir
+    pipeline = FleetPipeline().run(open_source(args.source))
+    fleet = pipeline.fleet()
+    # Mevsimsel taban çizgisi artımlı kurulamaz; anlık görüntü oluşturulurken oda başına bir kez oturtulur
+    for room in fleet.rooms:
+        fleet.detectors[room] = build_anomaly_detector(fleet[room])
+    if len(fleet) == 1:
+        room = fleet.rooms[0]
+        save_snapshot(args.path, fleet[room], fleet.aggregates[room], fleet.state(room))
+    else:
+        save_fleet(args.path, fleet)
+    print(json.dumps(pipeline.summary(), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
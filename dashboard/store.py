@@ -0,0 +1,267 @@
+"""
+Tipli, kolon bazlı sensör veri deposu
+"""
+import uuid
+
+import numpy as np
+import pandas as pd
+
+DAYS = ["Pazartesi", "Sali", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+TIMES = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
+MINUTES_PER_DAY = len(TIMES)
+MINUTES_PER_WEEK = MINUTES_PER_DAY * len(DAYS)
+
+SENSORS = ["Sicaklik", "Isik Sensörü", "Hareket Sensörü", "CO2 Sensörü", "Nem Sensörü"]
+BINARY_SENSORS = ("Isik Sensörü", "Hareket Sensörü")
+
+# Arayüzde görünen sensör adlarının veri setindeki karşılıkları
+SENSOR_COLUMNS = {
+    "Sıcaklık": "Sicaklik",
+    "Işık Sensörü": "Isik Sensörü",
+    "CO2 Sensörü": "CO2 Sensörü",
+    "Hareket Sensörü": "Hareket Sensörü",
+    "Nem Sensörü": "Nem Sensörü",
+}
+
+# Gerçek zaman damgası olmayan (Gün/Saat) veriler bu Pazartesi'den başlayan hafta kabul edilir
+WEEK_ORIGIN = int(np.datetime64("2024-01-01T00:00", "m").astype(np.int64))
+
+TABLE_COLUMNS = ["Gün", "Saat", "Sicaklik", "Metrekare", "Isik Sensörü", "Hareket Sensörü", "CO2 Sensörü", "Nem Sensörü"]
+
+
+def sensor_dtype(name):
+    """
+    İkili sensörler uint8, ölçüm sensörleri float32 olarak saklanır
+    """
+    return np.uint8 if name in BINARY_SENSORS else np.float32
+
+
+class SensorStore:
+    """
+    Sensör okumalarını tipli kolonlar halinde tutan salt okunur veri deposu.
+
+    Zaman anahtarı haftanın dakikasıdır (0-10079); gün ve saat bu anahtardan
+    türetilen kategorik kodlardır. Gerçek zaman damgası epoch dakikası olarak
+    ayrıca tutulur; verilmezse WEEK_ORIGIN haftasına yerleştirilir. Oda
+    bilgileri (Metrekare vb.) okumalardan ayrı tutulur.
+    """
+
+    def __init__(self, minute, readings, room=None, version=0, codes=None, source=None, timestamp=None):
+        self.minute = np.ascontiguousarray(minute, dtype=np.uint16)
+        if timestamp is None:
+            timestamp = WEEK_ORIGIN + self.minute.astype(np.int64)
+        self.timestamp = np.ascontiguousarray(timestamp, dtype=np.int64)
+        if codes is None:
+            codes = (self.minute // MINUTES_PER_DAY, self.minute % MINUTES_PER_DAY)
+        # Anlık görüntüden gelen (memory-mapped) kodlar kopyalanmadan kullanılır
+        self.day_code = np.ascontiguousarray(codes[0], dtype=np.uint8)
+        self.time_code = np.ascontiguousarray(codes[1], dtype=np.uint16)
+        self.readings = {
+            name: np.ascontiguousarray(readings[name], dtype=sensor_dtype(name))
+            for name in SENSORS
+        }
+        self.room = {"Metrekare": 50, **(room or {})}
+        self.version = version
+        # Kaynak + sürüm, önbellek anahtarı olarak içeriğin yerine kullanılır
+        self.source = source or uuid.uuid4().hex
+
+        # Depo oturumlar arasında paylaşılır; yanlışlıkla yazılmasını engelle
+        for array in self._arrays():
+            array.flags.writeable = False
+
+    @classmethod
+    def from_frame(cls, df, room=None, version=0):
+        """
+        'Gün', 'Saat' ve sensör kolonlarını içeren bir DataFrame'den depo oluşturur
+        """
+        day = pd.Categorical(df["Gün"], categories=DAYS).codes.astype(np.int64)
+        time = pd.Categorical(df["Saat"], categories=TIMES).codes.astype(np.int64)
+        if (day < 0).any() or (time < 0).any():
+            raise ValueError("Bilinmeyen gün veya saat değeri")
+        if room is None and "Metrekare" in df:
+            room = {"Metrekare": int(df["Metrekare"].iloc[0])}
+        return cls(day * MINUTES_PER_DAY + time, {name: df[name].to_numpy() for name in SENSORS}, room, version)
+
+    @property
+    def day_ranges(self):
+        """
+        Her gün için (başlangıç, bitiş) aralıkları ve gerekiyorsa satır sırası.
+
+        Günleri ardışık ve zamana göre sıralı depolarda (tek hafta) sıra None'dır
+        ve aralıklar doğrudan kolonlara uygulanır (kopyasız dilimler). Aksi halde
+        satırlar güne, gün içinde zaman damgasına göre sıralanır; haftalar
+        birbirine karışmaz. İlk kullanımda bir kez hesaplanır.
+        """
+        if not hasattr(self, "_day_ranges"):
+            counts = np.bincount(self.day_code, minlength=len(DAYS))
+            offsets = np.concatenate([[0], np.cumsum(counts)])
+            order = None
+            if len(self) and (np.any(np.diff(self.day_code.astype(np.int16)) < 0)
+                              or self.time_order is not None):
+                order = np.lexsort((self.timestamp, self.day_code))
+                order.flags.writeable = False
+            self._day_ranges = (offsets, order)
+        return self._day_ranges
+
+    @property
+    def time_order(self):
+        """
+        Zaman damgasına göre satır sırası; depo zaten sıralıysa None
+        """
+        if not hasattr(self, "_time_order"):
+            order = None
+            if len(self) and np.any(np.diff(self.timestamp) < 0):
+                order = np.argsort(self.timestamp, kind="stable")
+                order.flags.writeable = False
+            self._time_order = order
+        return self._time_order
+
+    @property
+    def fingerprint(self):
+        return f"{self.source}@{self.version}"
+
+    def _arrays(self):
+        return (self.minute, self.timestamp, self.day_code, self.time_code, *self.readings.values())
+
+    def __len__(self):
+        return len(self.minute)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._arrays())
+
+    def days(self):
+        """
+        Veride bulunan günleri hafta sırasıyla döndürür
+        """
+        present = np.bincount(self.day_code, minlength=len(DAYS))
+        return [DAYS[code] for code in np.flatnonzero(present)]
+
+    def sensor(self, name, mask=None):
+        values = self.readings[name]
+        return values if mask is None else values[mask]
+
+    def day_mask(self, selected_days):
+        """
+        Seçilen günlere ait satırlar için boolean maske
+        """
+        lookup = np.zeros(len(DAYS), dtype=bool)
+        lookup[[DAYS.index(day) for day in selected_days]] = True
+        return lookup[self.day_code]
+
+    def day(self, mask=None):
+        codes = self.day_code if mask is None else self.day_code[mask]
+        return pd.Categorical.from_codes(codes, categories=DAYS)
+
+    def time(self, mask=None):
+        codes = self.time_code if mask is None else self.time_code[mask]
+        return pd.Categorical.from_codes(codes, categories=TIMES)
+
+    def to_frame(self, mask=None, columns=None):
+        """
+        Tablo ve geriye dönük uyumluluk için DataFrame görünümü
+        """
+        columns = columns or TABLE_COLUMNS
+        if mask is None:
+            rows = len(self)
+        elif isinstance(mask, slice):
+            rows = len(range(*mask.indices(len(self))))
+        else:
+            mask = np.asarray(mask)
+            rows = int(np.count_nonzero(mask)) if mask.dtype == bool else len(mask)
+        data = {}
+        for column in columns:
+            if column == "Dakika":
+                data[column] = self.minute if mask is None else self.minute[mask]
+            elif column == "Zaman":
+                timestamp = self.timestamp if mask is None else self.timestamp[mask]
+                data[column] = timestamp.astype("datetime64[m]")
+            elif column == "Gün":
+                data[column] = self.day(mask)
+            elif column == "Saat":
+                data[column] = self.time(mask)
+            elif column in self.room:
+                value = self.room[column]
+                data[column] = np.full(rows, value, dtype=np.uint16 if isinstance(value, int) else object)
+            else:
+                data[column] = self.sensor(column, mask)
+        return pd.DataFrame(data)
+
+
+class StoreView:
+    """
+    Paylaşılan, değişmez bir depo üzerinde gün seçimi.
+
+    Oturumda yalnızca seçilen günler tutulur; satırlar zaman sırasıyla
+    döner. Tek haftalık sıralı depolarda ardışık günler tek bir dilim
+    olarak, veri kopyalanmadan döndürülür.
+    """
+
+    def __init__(self, store, days):
+        selected = set(days)
+        self.store = store
+        self.days = tuple(day for day in DAYS if day in selected)
+        self._rows = None
+
+    @property
+    def fingerprint(self):
+        return (self.store.fingerprint, self.days)
+
+    def ranges(self):
+        """
+        Seçilen günlerin birleştirilmiş (başlangıç, bitiş) aralıkları
+        """
+        offsets, _ = self.store.day_ranges
+        ranges = []
+        for day in self.days:
+            code = DAYS.index(day)
+            start, stop = int(offsets[code]), int(offsets[code + 1])
+            if start == stop:
+                continue
+            if ranges and ranges[-1][1] == start:
+                ranges[-1] = (ranges[-1][0], stop)
+            else:
+                ranges.append((start, stop))
+        return ranges
+
+    def __len__(self):
+        return sum(stop - start for start, stop in self.ranges())
+
+    def index(self):
+        """
+        Satır seçici, zaman sırasıyla: tek aralıkta dilim (kopyasız), aksi halde satır indeksleri
+        """
+        _, order = self.store.day_ranges
+        ranges = self.ranges()
+        if order is None and len(ranges) == 1:
+            return slice(*ranges[0])
+        if not ranges:
+            return np.empty(0, dtype=np.int64)
+        if order is None:
+            return np.concatenate([np.arange(start, stop) for start, stop in ranges])
+        if self._rows is None:
+            # Birden fazla hafta: seçilen günlerin satırları zaman sırasıyla (sıralama yok, tek geçiş)
+            selected = self.store.day_mask(self.days)
+            time_order = self.store.time_order
+            if time_order is None:
+                self._rows = slice(0, len(self.store)) if selected.all() else np.flatnonzero(selected)
+            else:
+                self._rows = time_order[np.flatnonzero(selected[time_order])]
+        return self._rows
+
+    def column(self, array):
+        return array[self.index()]
+
+    def sensor(self, name):
+        return self.column(self.store.readings[name])
+
+    @property
+    def minute(self):
+        return self.column(self.store.minute)
+
+    @property
+    def timestamp(self):
+        return self.column(self.store.timestamp)
+
+    def to_frame(self, columns=None):
+        return self.store.to_frame(self.index(), columns)
@@ -0,0 +1,58 @@
+"""
+Grafik motorlarının (sunucuda matplotlib, tarayıcıda Vega-Lite) ortak renkleri ve dilimleri
+
+Aynı görünüm iki motorda da aynı renk ve anlamla çizilsin diye renkler ve
+pasta dilimlerinin hesabı burada tutulur; bu modül çizim kütüphanesi içe aktarmaz.
+"""
+import numpy as np
+import pandas as pd
+
+# Tek sensör grafikleri
+COLUMN_COLOR = "#3498DB"
+LINE_COLOR = "#2ECC71"
+BAND_COLOR = "#444444"
+
+# Anomali ve trend grafikleri (matplotlib'in 'b', 'r', 'g', 'y' kısaltmaları)
+SERIES_COLOR = "#0000FF"
+ANOMALY_COLOR = "#FF0000"
+MOVING_AVERAGE_COLOR = "#FF0000"
+TREND_COLORS = {"Yükseliş": "#008000", "Düşüş": "#FF0000", "Stabil": "#BFBF00"}
+
+# Çoklu sensör grafiğinde her sensörün rengi
+SENSOR_COLORS = {
+    "Sicaklik": "#FF3333",    # Parlak Kırmızı
+    "Isik Sensörü": "#FFD700", # Altın Sarısı
+    "CO2 Sensörü": "#33CC33",  # Parlak Yeşil
+    "Hareket Sensörü": "#FF8000", # Turuncu
+    "Nem Sensörü": "#3399FF"   # Parlak Mavi
+}
+
+# Sıcaklık dağılımı sabit konfor aralıklarıyla gösterilir; aralık dışındaki okumalar
+# uçlardaki açık dilimlere düşer (boşsa dilim gösterilmez)
+TEMPERATURE_BINS = [-np.inf, 20, 22, 24, 26, 28, 30, np.inf]
+TEMPERATURE_LABELS = ["<20°C", "20-22°C", "22-24°C", "24-26°C", "26-28°C", "28-30°C", ">30°C"]
+PIE_COLORS = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC']
+# Beşten fazla dilim için (seaborn "pastel" paleti)
+PASTEL_COLORS = ['#a1c9f4', '#ffb482', '#8de5a1', '#ff9f9b', '#d0bbff',
+                 '#debb9b', '#fab0e4', '#cfcfcf', '#fffea3', '#b9f2f0']
+
+
+def pie_colors(count):
+    palette = PIE_COLORS if count <= len(PIE_COLORS) else PASTEL_COLORS
+    return [palette[i % len(palette)] for i in range(count)]
+
+
+def pie_slices(values, sensor_data, bins=5):
+    """
+    Pasta dilimlerinin okuma sayıları (etiket → adet, büyükten küçüğe); `values` bir ValueDistribution
+    """
+    if sensor_data == "Sicaklik":
+        counts = pd.Series(values.histogram(sensor_data, TEMPERATURE_BINS), index=TEMPERATURE_LABELS)
+        open_ended = counts.index.isin([TEMPERATURE_LABELS[0], TEMPERATURE_LABELS[-1]])
+        counts = counts[~open_ended | (counts > 0)]
+    else:
+        # Diğer sensörler için değer aralıklarını otomatik belirle
+        edges = np.linspace(values.min(sensor_data), values.max(sensor_data), bins + 1)
+        labels = [f"{edges[i]:.1f}-{edges[i+1]:.1f}" for i in range(len(edges)-1)]
+        counts = pd.Series(values.histogram(sensor_data, edges), index=labels)
+    return counts.sort_values(ascending=False)
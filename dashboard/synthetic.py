@@ -0,0 +1,268 @@
+"""
+Yük testi için ölçeklenebilir, tohumlu sentetik sensör verisi
+
+Her oda için kalıcı bir profil (alan, mesai saatleri, taban sıcaklık/CO2/nem)
+ve her oda-gün için ayrı bir rastgele akış tohumdan türetilir; aynı tohum ve
+parametreler parça boyutundan bağımsız olarak aynı satırları üretir. Doluluk
+mesai saatlerinde 15 dakikalık bloklar halinde belirlenir; hareket ve ışık
+doluluktan, sıcaklık/CO2/nem ise doluluğun üstel ortalamasından (odanın ısınıp
+havasının ağırlaşması) ve günlük dış döngüden türetilir. İstenen oranda ani
+sıçrama (anomali) eklenir.
+
+Veri gün × oda grupları halinde parça parça üretilir ve diske yazılır; 100M+
+satır belleğe alınmadan CSV, JSON-lines veya Parquet dosyasına yazılabilir:
+
+    python -m dashboard.synthetic --rooms 1000 --days 100 --output yuk.parquet
+    python -m dashboard.synthetic --rooms 10 --days 30 --interval 5 --anomaly-rate 0.01 --output yuk.csv
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.store import MINUTES_PER_DAY, MINUTES_PER_WEEK, SENSORS, WEEK_ORIGIN, SensorStore
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+DEFAULT_ANOMALY_RATE = 0.001
+ROOMS_PER_BUILDING = 20
+# Doluluk bu uzunlukta bloklar halinde değişir (dakika)
+OCCUPANCY_BLOCK = 15
+# Doluluğun sıcaklık, CO2 ve nem üzerindeki etkisinin zaman sabitleri (dakika)
+HEAT_MINUTES = 60
+CO2_MINUTES = 30
+HUMIDITY_MINUTES = 90
+
+
+def _seed(seed):
+    # Tohum verilmezse her çağrıda farklı (ama çağrı içinde tutarlı) bir akış
+    return np.random.SeedSequence().entropy if seed is None else seed
+
+
+def room_profile(seed, index):
+    """
+    Odanın gün boyunca değişmeyen özellikleri; aynı (tohum, oda) için her zaman aynıdır
+    """
+    rng = np.random.default_rng([_seed(seed), index, 0])
+    area = int(rng.integers(15, 121))
+    start = rng.uniform(7.5, 9.5) * 60
+    return {
+        "Oda": f"Oda {index + 1}",
+        "Bina": f"Bina {index // ROOMS_PER_BUILDING + 1}",
+        "Metrekare": area,
+        "start": start,
+        "end": start + rng.uniform(8, 10) * 60,
+        "peak": rng.uniform(0.6, 0.95),
+        "weekend": rng.uniform(0.0, 0.2),
+        # Kişi yoğunluğu: küçük odalar aynı doluluğa daha hızlı tepki verir
+        "density": min(2.0, 40 / area),
+        "temperature": rng.uniform(20.5, 22.5),
+        "swing": rng.uniform(0.8, 2.0),
+        "co2": rng.uniform(400, 450),
+        "humidity": rng.uniform(40, 55),
+    }
+
+
+def _ema(values, interval, minutes):
+    """
+    Satır boyunca üstel ortalama x[n] = a·x[n-1] + (1-a)·u[n], x[-1] = 0;
+    döngü yerine kapalı formda (bir gün içinde üsler taşmaz)
+    """
+    a = np.exp(-interval / minutes)
+    growth = np.exp(np.arange(values.shape[1]) * interval / minutes)
+    return (1 - a) * np.cumsum(values * growth, axis=1) / growth
+
+
+def _field(profiles, name):
+    return np.array([profile[name] for profile in profiles])[:, None]
+
+
+def _spike(draw, low, high):
+    """
+    (-1, 1) aralığındaki çekilişi işaretli sıçrama büyüklüğüne çevirir; 0 sıçrama yok demektir
+    """
+    return np.sign(draw) * (low + (high - low) * np.abs(draw))
+
+
+def simulate(profiles, day, interval=1, anomaly_rate=DEFAULT_ANOMALY_RATE, seed=None):
+    """
+    Bir gün için odaların okumaları; her dizi (oda, örnek) biçimindedir.
+    Her oda-gün kendi akışından üretilir, sonuç hangi odalarla birlikte üretildiğine bağlı değildir.
+    """
+    samples = MINUTES_PER_DAY // interval
+    blocks = MINUTES_PER_DAY // OCCUPANCY_BLOCK
+    clock = np.arange(samples) * interval
+    block_clock = np.arange(blocks) * OCCUPANCY_BLOCK
+    weekend = day % 7 >= 5  # Başlangıç (WEEK_ORIGIN) pazartesidir
+
+    occupied = np.empty((len(profiles), samples), dtype=bool)
+    motion = np.empty_like(occupied)
+    light = np.empty_like(occupied)
+    noise = np.empty((3, len(profiles), samples))
+    spikes = np.empty((3, len(profiles), samples))
+    for row, profile in enumerate(profiles):
+        rng = np.random.default_rng([_seed(seed), profile["index"], 1, day])
+        working = (block_clock >= profile["start"]) & (block_clock < profile["end"])
+        lunch = (block_clock >= 12 * 60) & (block_clock < 13 * 60)
+        chance = profile["peak"] * working * np.where(lunch, 0.5, 1.0) * (profile["weekend"] if weekend else 1.0)
+        blocked = rng.random(blocks) < chance + 0.01
+        occupied[row] = blocked[clock // OCCUPANCY_BLOCK]
+        draws = rng.random((3, samples))
+        motion[row] = (occupied[row] & (draws[0] < 0.6)) | (draws[0] > 0.995)
+        light[row] = occupied[row] | (draws[1] < 0.01)
+        noise[:, row] = rng.standard_normal((3, samples))
+        spikes[:, row] = np.where(rng.random((3, samples)) < anomaly_rate, rng.uniform(-1, 1, (3, samples)), 0)
+
+    # Dış sıcaklık döngüsü; en yüksek 15:00, en düşük 03:00
+    outside = np.sin(2 * np.pi * (clock / MINUTES_PER_DAY - 0.375))
+    presence = occupied.astype(np.float64) * _field(profiles, "density")
+
+    # Sıçramalar sensör ölçeğinde: 4-8 °C, 800-1600 ppm (yalnızca artış), 15-30 puan nem
+    temperature = (_field(profiles, "temperature") + _field(profiles, "swing") * outside
+                   + 2.0 * _ema(presence, interval, HEAT_MINUTES) + 0.15 * noise[0] + _spike(spikes[0], 4, 8))
+    co2 = (_field(profiles, "co2") + 700 * _ema(presence, interval, CO2_MINUTES) + 10 * noise[1]
+           + np.abs(_spike(spikes[1], 800, 1600)))
+    humidity = (_field(profiles, "humidity") - 3 * outside + 8 * _ema(presence, interval, HUMIDITY_MINUTES)
+                + noise[2] + _spike(spikes[2], 15, 30))
+    return {
+        "Sicaklik": temperature.astype(np.float32),
+        "Isik Sensörü": light.astype(np.float32),
+        "Hareket Sensörü": motion.astype(np.float32),
+        "CO2 Sensörü": np.maximum(co2, 0).astype(np.float32),
+        "Nem Sensörü": np.clip(humidity, 0, 100).astype(np.float32),
+    }
+
+
+def _profiles(seed, indices):
+    return [{"index": index, **room_profile(seed, index)} for index in indices]
+
+
+def _check(interval):
+    if interval < 1 or MINUTES_PER_DAY % interval:
+        raise ValueError(f"Örnekleme aralığı günü tam bölmelidir (dakika): {interval}")
+
+
+def generate(rooms=1, days=7, interval=1, anomaly_rate=DEFAULT_ANOMALY_RATE, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS,
+             start=WEEK_ORIGIN):
+    """
+    Yükleme hattının şemasında (Zaman, Oda, Bina, Metrekare, sensörler) DataFrame parçaları.
+
+    Parçalar gün sırasıyla, her gün içinde oda grupları halinde üretilir; bir parça
+    en fazla `chunk_rows` satırdır (tek bir oda-gün bundan büyükse o kadar).
+    `start` epoch dakikası olarak başlangıç günüdür ve pazartesi olmalıdır.
+    """
+    _check(interval)
+    seed = _seed(seed)
+    samples = MINUTES_PER_DAY // interval
+    group = max(1, chunk_rows // samples)
+    clock = np.arange(samples, dtype=np.int64) * interval
+    for day in range(days):
+        for first in range(0, rooms, group):
+            profiles = _profiles(seed, range(first, min(first + group, rooms)))
+            readings = simulate(profiles, day, interval, anomaly_rate, seed)
+            codes = np.repeat(np.arange(len(profiles)), samples)
+            timestamp = np.tile(start + day * MINUTES_PER_DAY + clock, len(profiles))
+            # Oda ve bina adları kategorik; 1M satırlık parçada metin kolonu kopyalanmaz
+            buildings = list(dict.fromkeys(profile["Bina"] for profile in profiles))
+            building_codes = np.array([buildings.index(profile["Bina"]) for profile in profiles])
+            yield pd.DataFrame({
+                "Zaman": timestamp.astype("datetime64[m]").astype("datetime64[ns]"),
+                "Oda": pd.Categorical.from_codes(codes, [profile["Oda"] for profile in profiles]),
+                "Bina": pd.Categorical.from_codes(building_codes[codes], buildings),
+                "Metrekare": np.repeat([profile["Metrekare"] for profile in profiles], samples),
+                **{name: readings[name].ravel() for name in SENSORS},
+            })
+
+
+def create_store(days=7, seed=None, index=0, interval=1, anomaly_rate=DEFAULT_ANOMALY_RATE, room=None):
+    """
+    Tek bir odanın verisi doğrudan depo olarak (dosyaya yazmadan); `generate` ile aynı satırlar
+    """
+    _check(interval)
+    seed = _seed(seed)
+    profiles = _profiles(seed, [index])
+    parts = [simulate(profiles, day, interval, anomaly_rate, seed) for day in range(days)]
+    readings = {
+        name: np.concatenate([part[name][0] for part in parts]) if parts else np.empty(0, dtype=np.float32)
+        for name in SENSORS
+    }
+    offset = np.arange(days * MINUTES_PER_DAY, step=interval, dtype=np.int64)
+    profile = profiles[0]
+    return SensorStore(offset % MINUTES_PER_WEEK, readings, room={"Metrekare": profile["Metrekare"], **(room or {})},
+                       timestamp=WEEK_ORIGIN + offset)
+
+
+def write(chunks, path):
+    """
+    Parçaları dosya uzantısına göre CSV, JSON-lines veya Parquet olarak sırayla yazar; satır sayısı döner
+    """
+    suffix = os.path.splitext(str(path))[1].lower()
+    rows = 0
+    if suffix in (".parquet", ".pq"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Parquet yazmak için pyarrow gereklidir: pip install pyarrow") from exc
+        writer = None
+        try:
+            for df in chunks:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    # Kategorik kolonlar sözlük kodlu yazılır; indeks genişliği parçadan parçaya değişmesin
+                    schema = pa.schema([
+                        field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+                        if pa.types.is_dictionary(field.type) else field
+                        for field in table.schema
+                    ], metadata=table.schema.metadata)
+                    writer = pq.ParquetWriter(path, schema)
+                writer.write_table(table.cast(schema))
+                rows += len(df)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+    if suffix not in (".csv", ".jsonl", ".ndjson", ".json"):
+        raise ValueError(f"Desteklenmeyen dosya tipi: {suffix}")
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        for df in chunks:
+            if suffix == ".csv":
+                df.to_csv(handle, index=False, header=rows == 0)
+            else:
+                df.to_json(handle, orient="records", lines=True, date_format="iso", force_ascii=False)
+            rows += len(df)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Yük testi için tohumlu sentetik filo verisi üretir")
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--interval", type=int, default=1, help="Örnekleme aralığı (dakika)")
+    parser.add_argument("--anomaly-rate", type=float, default=DEFAULT_ANOMALY_RATE,
+                        help="Sıcaklık, CO2 ve nem okumalarında sıçrama oranı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Parça başına en fazla satır")
+    parser.add_argument("--output", required=True, help="CSV, JSON-lines veya Parquet dosyası")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = write(generate(args.rooms, args.days, args.interval, args.anomaly_rate, args.seed, args.chunk_rows),
+                 args.output)
+    seconds = time.perf_counter() - started
+    print(json.dumps({
+        "rows": rows,
+        "rooms": args.rooms,
+        "days": args.days,
+        "bytes": os.path.getsize(args.output),
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows / seconds if seconds else 0.0, 1),
+    }, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
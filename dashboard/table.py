@@ -0,0 +1,67 @@
+"""
+Sunucu tarafında sayfalanan veri tablosu
+
+Sıralama ve filtreler doğrudan depo kolonları üzerinde satır indeksleriyle
+yapılır; tarayıcıya yalnızca görünen sayfa DataFrame olarak gönderilir.
+"""
+import numpy as np
+
+from dashboard.store import SENSORS, TABLE_COLUMNS
+
+PAGE_SIZES = (50, 100, 500, 1000)
+
+
+def key_column(store, name):
+    """
+    Sıralama/filtre için kolonun ham dizisi; sabit oda kolonları için None.
+
+    'Gün' haftanın dakikasına göre sıralanır (gün, sonra saat), 'Saat' için
+    değerler günün dakikasıdır (0-1439).
+    """
+    if name in ("Gün", "Dakika"):
+        return store.minute
+    if name == "Saat":
+        return store.time_code
+    if name in SENSORS:
+        return store.readings[name]
+    return None
+
+
+def query_rows(view, sort_by=None, descending=False, filters=()):
+    """
+    Görünümdeki satırların filtrelenmiş ve sıralanmış depo indeksleri.
+
+    filters: (kolon, alt, üst) üçlüleri; sınırlar dahildir, None sınırsızdır.
+    NaN değerler filtreye takılır, sıralamada her iki yönde de en sonda kalır.
+    """
+    index = view.index()
+    rows = np.arange(index.start, index.stop) if isinstance(index, slice) else np.asarray(index, dtype=np.int64)
+    for column, low, high in filters:
+        values = key_column(view.store, column)
+        if values is None:
+            continue
+        values = values[rows]
+        keep = np.ones(len(rows), dtype=bool)
+        if low is not None:
+            keep &= values >= low
+        if high is not None:
+            keep &= values <= high
+        rows = rows[keep]
+
+    values = key_column(view.store, sort_by) if sort_by else None
+    if values is not None:
+        values = values[rows].astype(np.float64)
+        rows = rows[np.argsort(-values if descending else values, kind="stable")]
+    return rows
+
+
+def page_count(rows, page_size):
+    return max(-(-rows // page_size), 1)
+
+
+def table_page(store, rows, page, page_size, columns=TABLE_COLUMNS):
+    """
+    Yalnızca istenen sayfanın satırlarını DataFrame'e çevirir (sayfa 0'dan başlar)
+    """
+    start = page * page_size
+    return store.to_frame(rows[start:start + page_size], columns)
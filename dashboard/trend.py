@@ -0,0 +1,119 @@
+"""
+Artımlı hareketli ortalama ve trend motoru
+"""
+import numpy as np
+
+from dashboard.store import SENSORS
+
+TREND_LABELS = np.array(["Stabil", "Yükseliş", "Düşüş"])
+TREND_WINDOWS = tuple(range(3, 16))
+
+
+class RollingTrendEngine:
+    """
+    Birden fazla pencere boyutu için hareketli ortalama ve trend yönü.
+
+    Her oda için son `max(windows)` okuma bir halka tamponda tutulur; yeni
+    okumalar geldiğinde yalnızca onlar için ortalama ve trend hesaplanır ve
+    oda başına ayrı saklanır. Yalnızca `windows` ile istenen pencereler
+    hesaplanır; her pencere okuma başına sensör sayısı × 5 bayt yer tutar.
+
+    Trend tanımı analyze_trends ile aynıdır: hareketli ortalama bir önceki
+    okumadan büyükse 'Yükseliş', küçükse 'Düşüş', aksi halde 'Stabil'.
+
+    `keep_history=False` ile geçmiş saklanmaz; `update` yalnızca yeni okumaların
+    trend kodlarını döndürür (akan veri üzerinde kural değerlendirmesi için).
+    """
+
+    def __init__(self, sensors=SENSORS, windows=TREND_WINDOWS, keep_history=True):
+        self.sensors = list(sensors)
+        self.windows = tuple(windows)
+        self.keep_history = keep_history
+        self.depth = max(self.windows)
+        self.buffers = {}
+        # Oda → pencere → parçalar; odaların serileri birbirine karışmaz
+        self._averages = {}
+        self._trends = {}
+        self._cache = {}
+
+    @property
+    def nbytes(self):
+        """
+        Saklanan geçmişin ve tamponların bayt cinsinden boyutu
+        """
+        history = [chunk for store in (self._averages, self._trends) for windows in store.values()
+                   for chunks in windows.values() for chunk in chunks]
+        cached = [array for cache in self._cache.values() for array in cache.values()]
+        buffers = [buffer[0] for buffer in self.buffers.values()]
+        return sum(array.nbytes for array in history + cached + buffers)
+
+    def _buffer(self, room):
+        # Halka tampon: son `depth` okuma ve tampondaki gerçek okuma sayısı
+        if room not in self.buffers:
+            self.buffers[room] = [np.full((self.depth, len(self.sensors)), np.nan), 0]
+        return self.buffers[room]
+
+    def update(self, readings, room=0):
+        """
+        Yeni okumaları (zaman sırasıyla) işler; maliyet yalnızca yeni okuma sayısıyla orantılıdır.
+        Pencere → yeni okumaların trend kodları (okuma × sensör) döner.
+        """
+        values = np.column_stack([np.asarray(readings[name], dtype=np.float64) for name in self.sensors])
+        n = len(values)
+        if n == 0:
+            return {window: np.zeros((0, len(self.sensors)), dtype=np.int8) for window in self.windows}
+        buffer = self._buffer(room)
+        history, seen = buffer
+        tail = min(seen, self.depth)
+
+        # Tampondaki son okumalar + yeni okumalar üzerinde kümülatif toplam
+        joined = np.concatenate([history[self.depth - tail:], values])
+        valid = np.isfinite(joined)
+        cumulative = np.vstack([np.zeros((1, len(self.sensors))), np.cumsum(np.where(valid, joined, 0), axis=0)])
+        cumulative_valid = np.vstack([np.zeros((1, len(self.sensors)), dtype=np.int64), np.cumsum(valid, axis=0)])
+        previous = joined[tail - 1:-1] if tail else np.vstack([np.full((1, len(self.sensors)), np.nan), values[:-1]])
+
+        end = np.arange(tail + 1, tail + n + 1)
+        trends = {}
+        for window in self.windows:
+            start = end - window
+            enough = start >= 0
+            start = np.maximum(start, 0)
+            full = (cumulative_valid[end] - cumulative_valid[start]) == window
+            with np.errstate(invalid="ignore"):
+                average = np.where(enough[:, None] & full, (cumulative[end] - cumulative[start]) / window, np.nan)
+            # pandas rolling() ile aynı: pencere dolmadan (veya NaN içerirken) ortalama NaN
+            trend = np.zeros(average.shape, dtype=np.int8)
+            with np.errstate(invalid="ignore"):
+                trend[average > previous] = 1
+                trend[average < previous] = 2
+            trends[window] = trend
+            if self.keep_history:
+                self._averages.setdefault(room, {}).setdefault(window, []).append(average.astype(np.float32))
+                self._trends.setdefault(room, {}).setdefault(window, []).append(trend)
+
+        buffer[0] = np.concatenate([history, values])[-self.depth:]
+        buffer[1] = seen + n
+        self._cache.pop(room, None)
+        return trends
+
+    def _stored(self, kind, window, room):
+        if window not in self.windows:
+            raise KeyError(f"Pencere hesaplanmadı: {window} (hesaplananlar: {self.windows})")
+        cache = self._cache.setdefault(room, {})
+        if (kind, window) not in cache:
+            chunks = (self._averages if kind == "average" else self._trends).get(room, {}).get(window, [])
+            cache[(kind, window)] = np.concatenate(chunks) if chunks else np.empty((0, len(self.sensors)))
+        return cache[(kind, window)]
+
+    def moving_average(self, window, sensor, room=0):
+        return self._stored("average", window, room)[:, self.sensors.index(sensor)]
+
+    def trend_codes(self, window, sensor, room=0):
+        """
+        0: Stabil, 1: Yükseliş, 2: Düşüş
+        """
+        return self._stored("trend", window, room)[:, self.sensors.index(sensor)]
+
+    def trend(self, window, sensor, room=0):
+        return TREND_LABELS[self.trend_codes(window, sensor, room)]
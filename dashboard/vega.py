@@ -0,0 +1,206 @@
+"""
+Tarayıcıda çizilen (Vega-Lite) grafikler
+
+matplotlib grafikleriyle aynı görünümleri aynı renk ve anlamla üretir; fakat
+sunucuda piksel çizilmez. Tarayıcıya yalnızca önceden toplanmış küçük diziler
+(dakika ortalamaları, seyreltilmiş seriler, pasta dilimleri) gönderilir;
+yakınlaştırma ve kaydırma tarayıcıda, yeniden çalıştırma olmadan yapılır.
+Fonksiyonlar Streamlit'e bağımlı değildir ve altair grafikleri döndürür;
+dashboard bunları `render.cached_spec` ile Vega-Lite spec sözlüğü olarak önbelleğe alır.
+"""
+import altair as alt
+import numpy as np
+import pandas as pd
+
+from dashboard.decimate import decimate
+from dashboard.render import day_ticks, error_band
+from dashboard.store import MINUTES_PER_DAY, SENSOR_COLUMNS
+from dashboard.style import (
+    ANOMALY_COLOR,
+    BAND_COLOR,
+    COLUMN_COLOR,
+    LINE_COLOR,
+    MOVING_AVERAGE_COLOR,
+    SENSOR_COLORS,
+    SERIES_COLOR,
+    TREND_COLORS,
+    pie_colors,
+    pie_slices,
+)
+
+# Seyreltilmiş serilerin hedef nokta sayısı (matplotlib grafiğinin piksel genişliği kadar)
+SERIES_POINTS = 1000
+# Tarayıcıya giden değerlerin ondalık basamağı; spec boyutunu yarıya indirir
+DECIMALS = 3
+HEIGHT = 400
+
+# Eksen etiketleri tarayıcıda hesaplanır; veriye metin kolonu eklenmez
+_MINUTE_LABEL = "timeFormat(datetime(2024, 0, 1, 0, datum.value), '%H:%M')"
+
+
+def _minute_axis():
+    return alt.Axis(values=list(range(0, MINUTES_PER_DAY, 60)), labelExpr=_MINUTE_LABEL, labelAngle=-90)
+
+
+def _time_axis(timestamps):
+    """
+    Gerçek zaman (epoch dakikası) ekseninde gün başları gün adlarıyla (uzun aralıklarda tarihle) etiketlenir
+    """
+    starts, labels = day_ticks(timestamps)
+    if len(starts) == 0:
+        return alt.Axis(title="Gün")
+    lookup = "{" + ", ".join(f"'{start}': '{label}'" for start, label in zip(starts.tolist(), labels)) + "}"
+    return alt.Axis(title="Gün", values=starts.tolist(), labelExpr=f"{lookup}[datum.value]", labelAngle=-45)
+
+
+def _minute_frame(stats, name, band=None):
+    present = stats.present(name)
+    frame = pd.DataFrame({"Dakika": present, "Değer": stats.mean(name)[present]})
+    if band:
+        low, high = error_band(stats, name, band)
+        frame["Alt"], frame["Üst"] = low[present], high[present]
+    return frame.round(DECIMALS)
+
+
+def _legend(domain, colors, title=None):
+    return alt.Color("Seri:N", title=title, scale=alt.Scale(domain=domain, range=colors),
+                     legend=alt.Legend(orient="top-right"))
+
+
+def sensor_column_chart(stats, sensor, band=None):
+    """
+    Dakika ortalamaları sütun grafiği; istenirse hata çubukları
+    """
+    frame = _minute_frame(stats, SENSOR_COLUMNS[sensor], band)
+    base = alt.Chart(frame).encode(x=alt.X("Dakika:Q", title="Saat", axis=_minute_axis(),
+                                           scale=alt.Scale(domain=[0, MINUTES_PER_DAY])))
+    chart = base.mark_bar(color=COLUMN_COLOR).encode(
+        x2="Bitiş:Q",
+        y=alt.Y("Değer:Q", title="Değer"),
+        tooltip=[alt.Tooltip("Değer:Q", format=".2f")],
+    ).transform_calculate(Bitiş="datum.Dakika + 0.8")
+    if band:
+        chart += base.mark_rule(color=BAND_COLOR, opacity=0.6).encode(y="Alt:Q", y2="Üst:Q")
+    return chart.properties(title=f"{sensor} - Sütun Grafiği", width="container", height=HEIGHT).interactive()
+
+
+def sensor_line_chart(stats, sensor, band=None):
+    """
+    Dakika ortalamaları çizgi grafiği; istenirse hata bandı
+    """
+    frame = _minute_frame(stats, SENSOR_COLUMNS[sensor], band)
+    base = alt.Chart(frame).encode(x=alt.X("Dakika:Q", title="Saat", axis=_minute_axis(),
+                                           scale=alt.Scale(domain=[0, MINUTES_PER_DAY])))
+    chart = base.mark_line(color=LINE_COLOR, strokeWidth=2, point=alt.OverlayMarkDef(color=LINE_COLOR, size=12)).encode(
+        y=alt.Y("Değer:Q", title="Değer"),
+        tooltip=[alt.Tooltip("Değer:Q", format=".2f")],
+    )
+    if band:
+        chart = base.mark_area(color=LINE_COLOR, opacity=0.2).encode(y="Alt:Q", y2="Üst:Q") + chart
+    return chart.properties(title=f"{sensor} - Çizgi Grafiği", width="container", height=HEIGHT).interactive()
+
+
+def sensor_pie_chart(values, sensor, bins=5):
+    """
+    Değer aralıklarının payı; dilimler değer histogramından sayılır
+    """
+    counts = pie_slices(values, SENSOR_COLUMNS[sensor], bins)
+    frame = pd.DataFrame({"Aralık": counts.index, "Adet": counts.to_numpy()})
+    base = alt.Chart(frame).transform_joinaggregate(Toplam="sum(Adet)").transform_calculate(
+        Oran="datum.Toplam ? datum.Adet / datum.Toplam : 0"
+    ).encode(
+        theta=alt.Theta("Adet:Q", stack=True),
+        order=alt.Order("Adet:Q", sort="descending"),
+    )
+    arcs = base.mark_arc(outerRadius=150).encode(
+        color=alt.Color("Aralık:N", sort=counts.index.tolist(),
+                        scale=alt.Scale(domain=counts.index.tolist(), range=pie_colors(len(counts)))),
+        tooltip=["Aralık:N", "Adet:Q", alt.Tooltip("Oran:Q", format=".1%")],
+    )
+    labels = base.mark_text(radius=110, color="#333333").encode(text=alt.Text("Oran:Q", format=".1%"))
+    return (arcs + labels).properties(title=f"{sensor} - Değer Dağılımı", width="container", height=HEIGHT)
+
+
+def multi_sensor_chart(stats, sensors):
+    """
+    Seçilen sensörlerin normalize edilmiş dakika ortalamaları, yan yana sütunlar
+    """
+    minutes = stats.present(sensors[0])
+    frame = pd.DataFrame({"Dakika": minutes})
+    for sensor in sensors:
+        values = stats.mean(sensor)[minutes]
+        low, high = np.nanmin(values), np.nanmax(values)
+        frame[sensor] = (values - low) / (high - low) * 100 if high != low else values
+    return alt.Chart(frame.round(DECIMALS)).transform_fold(list(sensors), as_=["Sensör", "Değer"]).mark_bar().encode(
+        x=alt.X("Dakika:O", title=None, axis=alt.Axis(values=list(range(0, MINUTES_PER_DAY, 60)),
+                                                      labelExpr=_MINUTE_LABEL, labelAngle=-90)),
+        xOffset=alt.XOffset("Sensör:N", sort=list(sensors)),
+        y=alt.Y("Değer:Q", title="Normalize Edilmiş Değer (%)"),
+        color=alt.Color("Sensör:N", sort=list(sensors), legend=alt.Legend(orient="top-right"),
+                        scale=alt.Scale(domain=list(sensors), range=[SENSOR_COLORS[sensor] for sensor in sensors])),
+        tooltip=["Sensör:N", alt.Tooltip("Değer:Q", format=".1f")],
+    ).properties(title="Çoklu Sensör Grafiği (Normalize Edilmiş)", width="container", height=HEIGHT)
+
+
+def anomaly_chart(view, df, sensor="Sıcaklık"):
+    """
+    Anomali tespiti sonuçları; seri grafik genişliğine seyreltilir, anomaliler korunur
+    """
+    x = view.timestamp
+    y = view.sensor(SENSOR_COLUMNS[sensor])
+    anomaly = df['Anomali'].to_numpy()
+    idx = decimate(x, y, SERIES_POINTS, keep=anomaly)
+    series = pd.DataFrame({
+        "Zaman": x[idx],
+        "Normal Değerler": y[idx],
+        "Üst Eşik": df['Ust_Esik'].to_numpy()[idx],
+        "Alt Eşik": df['Alt_Esik'].to_numpy()[idx],
+    }).round(DECIMALS)
+    points = pd.DataFrame({"Zaman": x[anomaly], "Değer": y[anomaly], "Seri": "Anomaliler"}).round(DECIMALS)
+    domain = ["Normal Değerler", "Anomaliler", "Üst Eşik", "Alt Eşik"]
+    color = _legend(domain, [SERIES_COLOR, ANOMALY_COLOR, ANOMALY_COLOR, ANOMALY_COLOR])
+    x_axis = alt.X("Zaman:Q", axis=_time_axis(x), scale=alt.Scale(zero=False))
+
+    lines = alt.Chart(series).transform_fold(["Normal Değerler", "Üst Eşik", "Alt Eşik"], as_=["Seri", "Değer"])
+    lines = lines.mark_line().encode(
+        x=x_axis,
+        y=alt.Y("Değer:Q", title="Sıcaklık (°C)" if sensor == "Sıcaklık" else "Değer", scale=alt.Scale(zero=False)),
+        color=color,
+        detail="Seri:N",
+        strokeDash=alt.condition("datum.Seri == 'Normal Değerler'", alt.value([1, 0]), alt.value([6, 4])),
+        opacity=alt.condition("datum.Seri == 'Normal Değerler'", alt.value(1.0), alt.value(0.3)),
+    )
+    dots = alt.Chart(points).mark_circle(size=100, opacity=1).encode(
+        x=x_axis, y="Değer:Q", color=color, tooltip=[alt.Tooltip("Değer:Q", format=".2f")],
+    )
+    return (lines + dots).properties(title=f"{sensor} Anomalileri", width="container", height=HEIGHT).interactive()
+
+
+def trend_chart(view, df, sensor="Sıcaklık"):
+    """
+    Trend analizi sonuçları; seri ve hareketli ortalama seyreltilir, trend noktaları seyreltilmiş seride
+    """
+    x = view.timestamp
+    y = view.sensor(SENSOR_COLUMNS[sensor])
+    moving_average = df['Hareketli_Ortalama'].to_numpy()
+    idx = decimate(x, y, SERIES_POINTS)
+    avg_idx = decimate(x, moving_average, SERIES_POINTS)
+    series = pd.concat([
+        pd.DataFrame({"Zaman": x[idx], "Değer": y[idx], "Seri": sensor}),
+        pd.DataFrame({"Zaman": x[avg_idx], "Değer": moving_average[avg_idx], "Seri": "Hareketli Ortalama"}),
+    ]).round(DECIMALS)
+    points = pd.DataFrame({"Zaman": x[idx], "Değer": y[idx], "Seri": df['Trend'].to_numpy()[idx]}).round(DECIMALS)
+    domain = [sensor, "Hareketli Ortalama", *TREND_COLORS]
+    color = _legend(domain, [SERIES_COLOR, MOVING_AVERAGE_COLOR, *TREND_COLORS.values()])
+    x_axis = alt.X("Zaman:Q", axis=_time_axis(x), scale=alt.Scale(zero=False))
+
+    lines = alt.Chart(series).mark_line().encode(
+        x=x_axis,
+        y=alt.Y("Değer:Q", title="Sıcaklık (°C)" if sensor == "Sıcaklık" else "Değer", scale=alt.Scale(zero=False)),
+        color=color,
+        strokeDash=alt.condition(f"datum.Seri == '{sensor}'", alt.value([1, 0]), alt.value([6, 4])),
+    )
+    dots = alt.Chart(points).mark_circle(size=50, opacity=1).encode(
+        x=x_axis, y="Değer:Q", color=color, tooltip=["Seri:N", alt.Tooltip("Değer:Q", format=".2f")],
+    )
+    return (lines + dots).properties(title=f"{sensor} Trend Analizi", width="container", height=HEIGHT).interactive()
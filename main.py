@@ -1,34 +1,222 @@
-import streamlit as st
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import streamlit as st
 import numpy as np
-import matplotlib.patches as path_effects
+
+from dashboard import (
+    MINUTES_PER_DAY,
+    SENSOR_COLUMNS,
+    TABLE_COLUMNS,
+    DayAggregates,
+    analysis,
+    prewarm,
+)
+from dashboard.cache import LRUCache, fingerprint, memoize
+from dashboard.correlation import CorrelationEngine
+from dashboard.fleet import (
+    analyze_fleet,
+    building_summary,
+    correlate_fleet,
+    top_rooms,
+)
+from dashboard.histogram import PERCENTILES, ValueHistograms
+from dashboard.jobs import JobRunner, checkpoint
+from dashboard.profiling import TimingExporter, begin, stage
+from dashboard.pyramid import RollupPyramid
+from dashboard.report import ReportArtifacts, full_range
+from dashboard.render import cached_figure, cached_spec, deferred, lazy_import
+from dashboard.table import PAGE_SIZES, page_count, query_rows, table_page
 
 # Sayfa başlığı ve stil ayarları
 st.set_page_config(page_title="Oda Sicakliği Dashboard", layout="wide") 
 
+# Bu çalıştırmanın adım profili; stage() blokları ve önbellekli fonksiyonlar buraya yazar
+profile = begin()
+
+def emit(element, *args, **kwargs):
+    """
+    Streamlit öğesini gönderir; gönderim süresi profile ayrı bir adım olarak yazılır
+    """
+    with stage(f"st.{element.__name__}"):
+        return element(*args, **kwargs)
+
+# Veri yüklemeleri süreç içinde kaynak başına bir kez yapılır; sunucu `python -m dashboard.prewarm`
+# ile başlatıldıysa veri ve oda toplamları ilk oturumdan önce hazırlanmıştır (veya hazırlanıyordur)
+
 # Veri seti oluşturma
-@st.cache_data
+@st.cache_resource
 def create_initial_data():
-    saatler = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)]
-    gunler = ["Pazartesi", "Sali", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
-    num_entries = len(saatler) * len(gunler)
-
-    veri = {
-        "Gün": np.repeat(gunler, 1440),
-        "Saat": saatler * 7,
-        "Sicaklik": np.random.uniform(20, 30, num_entries),
-        "Metrekare": np.repeat(50, num_entries),
-        "Isik Sensörü": np.random.randint(0, 2, num_entries),
-        "Hareket Sensörü": np.random.randint(0, 2, num_entries),
-        "CO2 Sensörü": np.random.uniform(0, 1000, num_entries),
-        "Nem Sensörü": np.random.uniform(30, 90, num_entries),
-    }
-    return pd.DataFrame(veri)
-
-# Önce veri setini oluştur
-df_original = create_initial_data()
+    return prewarm.load()[0]
+
+# Gerçek sensör kayıtlarını parça parça yükle (CSV, JSON-lines veya Parquet); 'Oda' kolonu varsa oda bazında bölümlenir
+@st.cache_resource
+def load_data(path):
+    return prewarm.load(data_path=path)
+
+# Memory-mapped anlık görüntü (tek oda veya filo dizini); süreçler arasında işletim sistemi sayfa önbelleğiyle paylaşılır
+@st.cache_resource
+def open_snapshot(path):
+    return prewarm.load(snapshot_path=path)[0]
+
+# Önce veri setini oluştur; ODA_SNAPSHOT_PATH veya ODA_DATA_PATH tanımlıysa diskten yükle
+snapshot_path = os.environ.get("ODA_SNAPSHOT_PATH")
+data_path = os.environ.get("ODA_DATA_PATH")
+ingest_summary = None
+with stage("Veri yükleme"):
+    if snapshot_path:
+        fleet = open_snapshot(snapshot_path)
+    elif data_path:
+        fleet, ingest_summary = load_data(data_path)
+    else:
+        fleet = create_initial_data()
+
+# Birden fazla oda varsa dashboard seçilen odanın deposu üzerinde çalışır
+selected_room = fleet.rooms[0]
+if len(fleet) > 1:
+    selected_room = st.sidebar.selectbox(
+        "Oda seçin:",
+        options=fleet.rooms,
+        format_func=lambda room: f"{fleet.building(room)} / {room}" if fleet.building(room) else room,
+        key="room_select"
+    )
+store = fleet[selected_room]
+
+# Gün × dakika kısmi toplamları oda başına bir kez hesaplanır, tüm oturumlarca paylaşılır
+@st.cache_resource
+def build_aggregates(_store, fingerprint):
+    return DayAggregates.from_store(_store)
+
+with stage("Gün × dakika toplamları"):
+    aggregates = fleet.aggregates.get(selected_room) or build_aggregates(store, store.fingerprint)
+
+# 5 dk → 1 saat → 1 gün toplam piramidi; uzun aralıklar ham satırlar yerine buradan okunur
+@st.cache_resource
+def build_pyramid(_store, fingerprint):
+    return RollupPyramid.from_store(_store)
+
+with stage("Toplam piramidi"):
+    pyramid = fleet.pyramids.get(selected_room) or build_pyramid(store, store.fingerprint)
+
+# Gün × değer kovası histogramları; dağılım grafikleri ve yüzdelikler satırlar yerine buradan okunur
+@st.cache_resource
+def build_histograms(_store, fingerprint):
+    return ValueHistograms.from_store(_store)
+
+with stage("Değer histogramları"):
+    histograms = fleet.histograms.get(selected_room) or build_histograms(store, store.fingerprint)
+
+# Alarm kuralları (ODA_ALERT_RULES: JSON kural dosyası, yoksa varsayılanlar) tüm odalar için bir kez değerlendirilir;
+# tetiklenen alarmlar ODA_ALERT_LOG tanımlıysa dönen JSON-lines günlüğüne de yazılır
+alert_rules_path = os.environ.get("ODA_ALERT_RULES")
+alert_log_path = os.environ.get("ODA_ALERT_LOG")
+
+@st.cache_resource
+def build_alerts(_fleet, fingerprint, rules_path, log_path):
+    return prewarm.alerts(_fleet, rules_path, log_path)
+
+with stage("Alarm kuralları"):
+    alerts = build_alerts(fleet, fleet.fingerprint, alert_rules_path, alert_log_path)
+
+# Parmak izi anahtarlı, bayt bütçeli ortak önbellek (ODA_CACHE_MB, varsayılan 256 MB)
+@st.cache_resource
+def get_cache():
+    return LRUCache(max_bytes=int(os.environ.get("ODA_CACHE_MB", 256)) * 1024 * 1024)
+
+cache = get_cache()
+
+# Bitmiş grafik görüntüleri (PNG baytları) için ayrı bütçe (ODA_RENDER_CACHE_MB, varsayılan 64 MB)
+@st.cache_resource
+def get_render_cache():
+    return LRUCache(max_bytes=int(os.environ.get("ODA_RENDER_CACHE_MB", 64)) * 1024 * 1024)
+
+render_cache = get_render_cache()
+
+# Filo analizleri paralel çalışır (ODA_WORKERS, varsayılan çekirdek sayısı); çok iş parçacıklı
+# sunucuda süreç çatallamak yerine iş parçacığı havuzu kullanılır, numpy çekirdekleri GIL'i bırakır
+@st.cache_resource
+def get_worker_pool():
+    return ThreadPoolExecutor(max_workers=int(os.environ.get("ODA_WORKERS", 0)) or None)
+
+def fleet_executor():
+    """
+    (havuz, işçi sayısı); tek işçide havuz açılmaz
+    """
+    workers = int(os.environ.get("ODA_WORKERS", 0)) or os.cpu_count()
+    return (get_worker_pool() if workers > 1 else None), workers
+
+# Analiz ve çizim işleri oturumlar arasında paylaşılan arka plan kuyruğunda çalışır
+# (ODA_JOB_WORKERS, varsayılan 2); kaydırıcı hızla oynatılınca eskiyen işler iptal edilir
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(int(os.environ.get("ODA_JOB_WORKERS", 2)))
+
+jobs = get_job_runner()
+
+# Önbellekteki veya hızlı biten sonuçlar aynı çalıştırmada gösterilir; daha uzun süren işler beklenmez
+JOB_WAIT_SECONDS = 0.1
+# Bekleyen işler varken tamamlanma bu aralıkla yoklanır
+JOB_POLL_SECONDS = 0.5
+
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
+
+def background(panel, func, *args):
+    """
+    func(*args) arka plan işi olarak çalışır. Kısa sürede biterse (sonuç, None),
+    bitmezse panelin son gösterilen sonucu (ilk seferde None) ve bekleyen iş döner
+    """
+    key = (f"{func.__module__}.{func.__qualname__}", fingerprint(args))
+    with stage(f"iş: {panel}") as record:
+        job = jobs.submit((st.session_state["session_id"], panel), key, func, *args)
+        record["cached"] = job.done()
+        job.wait(JOB_WAIT_SECONDS)
+    # Oturumda yalnızca son gösterilen sonucun anahtarı tutulur; sonuç iş önbelleğindedir
+    if job.done():
+        st.session_state[f"job_{panel}"] = key
+        return job.result(), None
+    return jobs.result(st.session_state.get(f"job_{panel}")), job
+
+# Sensörler arası korelasyon momentleri; yüklemede hesaplanmışsa doğrudan kullanılır
+@st.cache_resource
+def build_correlation(_store, fingerprint):
+    return CorrelationEngine.from_store(_store)
+
+@memoize(cache)
+def fleet_correlation(fleet):
+    executor, workers = fleet_executor()
+    return correlate_fleet(fleet, executor, workers)
+
+@memoize(cache)
+def select_days(aggregates, selected_days):
+    return aggregates.select(selected_days)
+
+@memoize(cache)
+def select_values(histograms, selected_days):
+    return histograms.select(selected_days)
+
+# Toplu rapor çıktısı (python -m dashboard.report); ODA_REPORT_PATH tanımlıysa aynı veri
+# sürümü ve parametreler için grafikler yeniden çizilmeden rapordan okunur
+@st.cache_resource
+def open_report(path):
+    return ReportArtifacts(path)
+
+report_path = os.environ.get("ODA_REPORT_PATH")
+report = open_report(report_path) if report_path else None
+
+def prerendered(sensor, chart, full_view=True, **params):
+    """
+    Görünüm raporunkiyle aynıysa önceden çizilmiş görüntü, değilse None
+    """
+    if report is None or not full_view:
+        return None
+    with stage(f"rapor: {chart}"):
+        return report.get(store, sensor, chart, **params)
+
+# Tablo sıralaması/filtresi bir kez hesaplanır; sayfa değişimi yalnızca dilimleme
+table_rows = memoize(cache)(query_rows)
 
 # Session state başlangıcı (Sensör durumlarını tanımlıyoruz)
 if "show_light_column" not in st.session_state:
@@ -44,9 +232,7 @@ if "show_temperature_column" not in st.session_state:
 if "show_multi_sensor" not in st.session_state:
     st.session_state["show_multi_sensor"] = False
 if "selected_day" not in st.session_state:
-    st.session_state["selected_day"] = df_original['Gün'].unique().tolist()
-if "df_filtered" not in st.session_state:
-    st.session_state["df_filtered"] = df_original[df_original['Gün'].isin(st.session_state["selected_day"])].copy()
+    st.session_state["selected_day"] = store.days()
 if "selected_sensor" not in st.session_state:
     st.session_state["selected_sensor"] = None
 if "selected_chart_type" not in st.session_state:
@@ -146,137 +332,71 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 st.title("🌡 Oda Sicakliği Dashboard")
+if ingest_summary:
+    st.caption(f"{data_path}: {ingest_summary['rooms']:,} oda, {ingest_summary['rows']:,} satır yüklendi "
+               f"({ingest_summary['rejected']:,} reddedildi, {ingest_summary['rows_per_second']:,.0f} satır/sn)")
 st.markdown("<br>", unsafe_allow_html=True)
 
-# Veri filtreleme fonksiyonu
-@st.cache_data
-def filter_data(df, selected_days):
-    return df[df['Gün'].isin(selected_days)].copy()
-
-# Grafik oluşturma fonksiyonları
-@st.cache_data
-def create_pie_chart(df):
-    fig, ax = plt.subplots(figsize=(6, 4))
-    bins = [20, 22, 24, 26, 28, 30]
-    labels = ["20-22°C", "22-24°C", "24-26°C", "26-28°C", "28-30°C"]
-    df['Sicaklik Araliği'] = pd.cut(df['Sicaklik'], bins=bins, labels=labels)
-    df['Sicaklik Araliği'].value_counts().plot(kind='pie', autopct='%1.1f%%', 
-                                              colors=['#FFC300', '#FF5733', '#C70039', '#900C3F', '#581845'], ax=ax)
-    ax.set_ylabel("")
-    return fig
-
-@st.cache_data
-def create_line_chart(df):
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.lineplot(x=df['Saat'], y=df['Sicaklik'], ax=ax, color='#3498DB', marker='o')
-    ax.set_ylabel("Sicaklik (°C)")
-    ax.set_title("Saatlik Ortalama Sicaklik", fontsize=14)
-    plt.xticks(rotation=90, fontsize=10)
-    return fig
-
-@st.cache_data
-def create_column_chart(df):
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.barplot(x=df['Saat'], y=df['Sicaklik'], ax=ax, color='#8E44AD')
-    ax.set_ylabel("Sicaklik (°C)")
-    plt.xticks(rotation=90, fontsize=10)
-    return fig
-
-@st.cache_data
-def create_light_sensor_chart(df):
-    df_grouped = df.groupby("Saat")["Isik Sensörü"].mean().reset_index()
-    fig, ax = plt.subplots(figsize=(15, 8))
-    
-    # Arka plan rengini ayarla
-    ax.set_facecolor('#F8F9FA')
-    fig.patch.set_facecolor('#F8F9FA')
-    
-    # Grid çizgilerini ayarla
-    ax.grid(True, linestyle='--', alpha=0.3, color='#808080')
-    
-    # Sütunları çiz
-    bars = sns.barplot(data=df_grouped, x="Saat", y="Isik Sensörü", ax=ax, 
-                      color='#FFD700',  # Altın sarısı
-                      edgecolor='#FFA500',  # Turuncu kenar
-                      linewidth=1.5)
-    
-    # Sütunların üzerine değerleri yaz
-    for i, v in enumerate(df_grouped["Isik Sensörü"]):
-        ax.text(i, v + 0.01, f'{v:.2f}', ha='center', va='bottom', fontsize=8)
-    
-    # Eksen etiketlerini ve başlığı ayarla
-    ax.set_title("Saatlik Işık Sensörü Durumu\n(0: Kapalı, 1: Açık)", 
-                fontsize=14, pad=20, color='#333333', fontweight='bold')
-    ax.set_xlabel("Saat", fontsize=12, color='#333333', labelpad=10)
-    ax.set_ylabel("Işık Durumu", fontsize=12, color='#333333', labelpad=10)
-    
-    # Y ekseni aralığını 0-1 olarak ayarla ve grid çizgilerini ekle
-    ax.set_ylim(-0.05, 1.05)
-    ax.yaxis.set_ticks([0, 0.25, 0.5, 0.75, 1.0])
-    ax.yaxis.set_ticklabels(['Kapalı (0)', '0.25', '0.5', '0.75', 'Açık (1)'])
-    
-    # X ekseni etiketlerini düzenle
-    plt.xticks(rotation=45, ha='right')
-    
-    # Grafik kenarlarını ayarla
-    for spine in ax.spines.values():
-        spine.set_color('#666666')
-        spine.set_linewidth(1)
-    
-    # Grafik boyutlarını otomatik ayarla
-    plt.tight_layout()
-    
-    return fig
-
-@st.cache_data
-def create_co2_sensor_chart(df):
-    df_grouped = df.groupby("Saat")["CO2 Sensörü"].mean().reset_index()
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.barplot(data=df_grouped, x="Saat", y="CO2 Sensörü", ax=ax, color='#27AE60')
-    ax.set_ylabel("CO2 Seviyesi (ppm)")
-    ax.set_title("Saatlik CO2 Sensörü Seviyesi", fontsize=14)
-    plt.xticks(rotation=90)
-    return fig
-
-@st.cache_data
-def create_motion_sensor_chart(df):
-    df_grouped = df.groupby("Saat")["Hareket Sensörü"].mean().reset_index()
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.barplot(data=df_grouped, x="Saat", y="Hareket Sensörü", ax=ax, color='#F39C12')
-    ax.set_ylabel("Aktiflik Oranı (0-1)")
-    ax.set_title("Saatlik Hareket Sensörü Aktiflik Oranı", fontsize=14)
-    plt.xticks(rotation=90)
-    return fig
-
-@st.cache_data
-def create_humidity_sensor_chart(df):
-    df_grouped = df.groupby("Saat")["Nem Sensörü"].mean().reset_index()
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.barplot(data=df_grouped, x="Saat", y="Nem Sensörü", ax=ax, color='#5DADE2')
-    ax.set_ylabel("Nem Oranı (%)")
-    ax.set_title("Saatlik Ortalama Nem Oranı", fontsize=14)
-    plt.xticks(rotation=90)
-    return fig
+# Veri filtreleme; satırları kopyalamadan paylaşılan depo üzerinde görünüm döndürür
+filter_data = analysis.filter_data
+
+# Grafik oluşturma fonksiyonları; bitmiş görüntüler render önbelleğinde tutulur.
+# Çizim kütüphaneleri (matplotlib, seaborn, altair) ilk grafik istendiğinde yüklenir
+create_pie_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_pie_chart"))
+create_line_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_line_chart"))
+create_column_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_column_chart"))
+create_multi_sensor_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_multi_sensor_chart"))
+create_sensor_column_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_sensor_column_chart"))
+create_sensor_line_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_sensor_line_chart"))
+create_sensor_pie_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_sensor_pie_chart"))
+create_correlation_heatmap = cached_figure(render_cache)(deferred("dashboard.charts", "create_correlation_heatmap"))
+create_lag_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_lag_chart"))
+
+# Tarayıcı grafikleri; önbellekte Vega-Lite spec'leri (küçük, önceden toplanmış veriyle) tutulur
+vega_sensor_column_chart = cached_spec(render_cache)(deferred("dashboard.vega", "sensor_column_chart"))
+vega_sensor_line_chart = cached_spec(render_cache)(deferred("dashboard.vega", "sensor_line_chart"))
+vega_sensor_pie_chart = cached_spec(render_cache)(deferred("dashboard.vega", "sensor_pie_chart"))
+vega_multi_sensor_chart = cached_spec(render_cache)(deferred("dashboard.vega", "multi_sensor_chart"))
+
+def show_chart(chart):
+    """
+    Sunucu grafiği (görüntü baytları) veya tarayıcı grafiği (Vega-Lite spec) gösterir
+    """
+    if isinstance(chart, dict):
+        emit(st.vega_lite_chart, chart, use_container_width=True)
+    else:
+        emit(st.image, chart)
 
 # Haftanın günlerine göre filtreleme
-days = df_original['Gün'].unique()
+days = store.days()
 if "selected_day" not in st.session_state:
-    st.session_state["selected_day"] = days.tolist()
+    st.session_state["selected_day"] = days
 selected_day = st.multiselect("Gün Seçiniz:", days, default=st.session_state["selected_day"])
 
-# Gün seçimi değiştiğinde filtrelenmiş veriyi güncelle
-if selected_day != st.session_state["selected_day"]:
-    st.session_state["df_filtered"] = df_original[df_original['Gün'].isin(selected_day)].copy()
-
-# Eğer filtrelenmiş veri yoksa başlangıçta tanımla
-if "df_filtered" not in st.session_state:
-    st.session_state["df_filtered"] = df_original[df_original['Gün'].isin(st.session_state["selected_day"])].copy()
-
-df_filtered = st.session_state["df_filtered"].copy()
+# Oturumda yalnızca gün seçimi tutulur; satırlar paylaşılan depodan okunur
+st.session_state["selected_day"] = selected_day
+with stage("filter_data"):
+    view = filter_data(store, selected_day)
+all_days = set(selected_day) == set(days)
+minute_stats = select_days(aggregates, tuple(selected_day))
+value_stats = select_values(histograms, tuple(selected_day))
 
 # Sensör ve grafik tipi seçimi
 st.sidebar.markdown('<div class="section-title">📊 Sensör ve Grafik Seçimi</div>', unsafe_allow_html=True)
 
+# Grafik motoru: sunucuda matplotlib ile PNG veya tarayıcıda Vega-Lite (ODA_CHART_BACKEND=png|vega).
+# Tarayıcı motorunda yalnızca dakika ortalamaları ve seyreltilmiş seriler gönderilir;
+# yakınlaştırma ve ipuçları yeniden çalıştırma gerektirmez
+chart_backends = {"Sunucu (PNG)": "png", "Tarayıcı (Vega-Lite)": "vega"}
+requested_backend = os.environ.get("ODA_CHART_BACKEND", "png")
+if requested_backend not in chart_backends.values():
+    st.sidebar.warning(f"Bilinmeyen ODA_CHART_BACKEND değeri: {requested_backend!r} (png veya vega olmalı); "
+                       "PNG kullanılıyor")
+    requested_backend = "png"
+default_backend = list(chart_backends.values()).index(requested_backend)
+chart_backend = chart_backends[st.sidebar.radio("Grafik motoru:", list(chart_backends), index=default_backend,
+                                                key="chart_backend")]
+
 sensor_options = ["Sıcaklık", "Işık Sensörü", "CO2 Sensörü", "Hareket Sensörü", "Nem Sensörü"]
 chart_options = ["Sütun Grafiği", "Çizgi Grafiği", "Pasta Grafiği"]
 
@@ -298,6 +418,12 @@ if selected_sensor:
         key="chart_select"
     )
     
+    # Hızlı çizim: seaborn tahmincileri yerine önceden toplanmış dakika dizileri
+    st.sidebar.checkbox("Hızlı çizim", value=True, key="fast_render",
+                        help="Grafikleri ham satırlar yerine önceden toplanmış dakika ortalamalarından çiz")
+    st.sidebar.checkbox("Hata bantlarını göster", value=False, key="show_bands",
+                        help="Dakika ortalamaları için %95 güven aralığını çiz")
+
     if selected_chart_type:
         st.session_state["selected_sensor"] = selected_sensor
         st.session_state["selected_chart_type"] = selected_chart_type
@@ -350,87 +476,34 @@ if st.session_state.get("show_multiselect", False):
     
     if len(selected_sensors) >= 2:
         # Sensör adlarını veri setindeki karşılıklarına çevir
-        sensor_mapping = {
-            "Sıcaklık": "Sicaklik",
-            "Işık Sensörü": "Isik Sensörü",
-            "CO2 Sensörü": "CO2 Sensörü",
-            "Hareket Sensörü": "Hareket Sensörü",
-            "Nem Sensörü": "Nem Sensörü"
-        }
-        
-        selected_sensors_mapped = [sensor_mapping[sensor] for sensor in selected_sensors]
+        selected_sensors_mapped = [SENSOR_COLUMNS[sensor] for sensor in selected_sensors]
         
-        # Her sensör için değerleri normalize et
-        normalized_data = {}
-        for sensor in selected_sensors_mapped:
-            values = df_filtered.groupby("Saat")[sensor].mean().values
-            min_val = values.min()
-            max_val = values.max()
-            if max_val != min_val:
-                normalized_data[sensor] = (values - min_val) / (max_val - min_val) * 100
+        if chart_backend == "vega":
+            show_chart(vega_multi_sensor_chart(minute_stats, tuple(selected_sensors_mapped)))
+        else:
+            show_chart(create_multi_sensor_chart(minute_stats, tuple(selected_sensors_mapped)))
+
+        # Korelasyonlar ham satırlar yeniden taranmadan gün × gecikme momentlerinden okunur
+        st.markdown("#### 🔗 Sensör İlişkileri")
+        scope_col, window_col = st.columns(2)
+        scope = scope_col.radio("Kapsam:", ["Seçili oda"] + (["Tüm filo"] if len(fleet) > 1 else []),
+                                horizontal=True, key="correlation_scope")
+        windows = {"Tüm veri": None, "Son 1 gün": 1, "Son 7 gün": 7, "Son 30 gün": 30}
+        last = windows[window_col.selectbox("Pencere:", list(windows), key="correlation_window")]
+        with stage("Korelasyon momentleri"):
+            if scope == "Tüm filo":
+                engine = fleet_correlation(fleet)
             else:
-                normalized_data[sensor] = values
-        
-        # Grafik oluştur
-        fig, ax = plt.subplots(figsize=(15, 8))
-        
-        # Arka plan rengini ayarla
-        ax.set_facecolor('#F0F8FF')
-        fig.patch.set_facecolor('#F0F8FF')
-        
-        # Grid çizgilerini ayarla
-        ax.grid(True, linestyle='--', alpha=0.3, color='#808080')
-        
-        # Saatleri indeks olarak kullan
-        hours = df_filtered['Saat'].unique()
-        x = np.arange(len(hours))
-        width = 0.8 / len(selected_sensors_mapped)  # Her sensör için genişlik
-        
-        # Her sensör için renk tanımlamaları
-        sensor_colors = {
-            "Sicaklik": "#FF3333",    # Parlak Kırmızı
-            "Isik Sensörü": "#FFD700", # Altın Sarısı
-            "CO2 Sensörü": "#33CC33",  # Parlak Yeşil
-            "Hareket Sensörü": "#FF8000", # Turuncu
-            "Nem Sensörü": "#3399FF"   # Parlak Mavi
-        }
-        
-        # Seçilen sensörleri çiz
-        for i, sensor in enumerate(selected_sensors_mapped):
-            sensor_color = sensor_colors[sensor]
-            bars = ax.bar(x + i*width, normalized_data[sensor], width, 
-                         label=sensor, 
-                         color=sensor_color,
-                         edgecolor=sensor_color,  # Sensörün kendi rengi ile kenar
-                         linewidth=1.5,      # Kenar kalınlığı
-                         alpha=0.9,          # Hafif şeffaflık
-                         zorder=3)           # Sütunları grid çizgilerinin üzerine çiz
-        
-        # Eksen etiketlerini ve başlığı ayarla
-        ax.set_ylabel("Normalize Edilmiş Değer (%)", fontsize=12, color='#333333', fontweight='bold')
-        ax.set_title("Çoklu Sensör Grafiği (Normalize Edilmiş)", fontsize=16, color='#333333', fontweight='bold', pad=20)
-        
-        # X ekseni etiketlerini ayarla
-        ax.set_xticks(x + width*(len(selected_sensors_mapped)-1)/2)
-        ax.set_xticklabels(hours, rotation=90, fontsize=10, color='#333333')
-        
-        # Y ekseni etiketlerini ayarla
-        ax.tick_params(axis='y', colors='#333333', labelsize=10)
-        
-        # Açıklama kutusunu ayarla
-        legend = ax.legend(fontsize=10, 
-                          loc='upper right', 
-                          framealpha=0.95, 
-                          facecolor='white', 
-                          edgecolor='#CCCCCC')
-        
-        # Kenar çizgilerini ayarla
-        for spine in ax.spines.values():
-            spine.set_color('#666666')
-            spine.set_linewidth(1.5)
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+                engine = fleet.correlations.get(selected_room) or build_correlation(store, store.fingerprint)
+
+        heat_col, lag_col = st.columns(2)
+        with heat_col:
+            emit(st.image, create_correlation_heatmap(engine, tuple(selected_sensors), tuple(selected_day), last))
+        with lag_col:
+            first_col, second_col = st.columns(2)
+            first = first_col.selectbox("Önde giden:", selected_sensors, key="lag_first")
+            second = second_col.selectbox("Takip eden:", selected_sensors, index=1, key="lag_second")
+            emit(st.image, create_lag_chart(engine, first, second, tuple(selected_day), last))
     elif len(selected_sensors) > 0:
         st.warning("Lütfen en az 2 sensör seçin.")
     else:
@@ -443,158 +516,144 @@ if st.session_state["selected_sensor"] and st.session_state["selected_chart_type
     
     st.markdown(f"### {sensor} - {chart_type}")
     
-    # Sensör adını veri setindeki karşılığına çevir
-    sensor_mapping = {
-        "Sıcaklık": "Sicaklik",
-        "Işık Sensörü": "Isik Sensörü",
-        "CO2 Sensörü": "CO2 Sensörü",
-        "Hareket Sensörü": "Hareket Sensörü",
-        "Nem Sensörü": "Nem Sensörü"
-    }
-    
-    sensor_data = sensor_mapping[sensor]
+    fast_render = st.session_state.get("fast_render", True)
+    band = "ci" if st.session_state.get("show_bands", False) else None
+    report_view = all_days and fast_render and band is None
     
+    # Tarayıcı motoru her zaman önceden toplanmış dakika dizilerini kullanır
     if chart_type == "Sütun Grafiği":
-        # Sütun grafiği için
-        fig, ax = plt.subplots(figsize=(15, 8))
-        sns.barplot(data=df_filtered, x="Saat", y=sensor_data, ax=ax, color="#3498DB")
-        ax.set_title(f"{sensor} - Sütun Grafiği", fontsize=14)
-        ax.set_xlabel("Saat", fontsize=12)
-        ax.set_ylabel("Değer", fontsize=12)
-        plt.xticks(rotation=90)
-        plt.grid(True, linestyle='--', alpha=0.7)
-        st.pyplot(fig)
-        
+        if chart_backend == "vega":
+            show_chart(vega_sensor_column_chart(minute_stats, sensor, band))
+        else:
+            show_chart(prerendered(sensor, "column", report_view)
+                       or create_sensor_column_chart(view, minute_stats, sensor, fast_render, band))
     elif chart_type == "Çizgi Grafiği":
-        # Çizgi grafiği için
-        fig, ax = plt.subplots(figsize=(15, 8))
-        sns.lineplot(data=df_filtered, x="Saat", y=sensor_data, ax=ax, color="#2ECC71", linewidth=2, marker='o')
-        ax.set_title(f"{sensor} - Çizgi Grafiği", fontsize=14)
-        ax.set_xlabel("Saat", fontsize=12)
-        ax.set_ylabel("Değer", fontsize=12)
-        plt.xticks(rotation=90)
-        plt.grid(True, linestyle='--', alpha=0.7)
-        st.pyplot(fig)
-        
+        if chart_backend == "vega":
+            show_chart(vega_sensor_line_chart(minute_stats, sensor, band))
+        else:
+            show_chart(prerendered(sensor, "line", report_view)
+                       or create_sensor_line_chart(view, minute_stats, sensor, fast_render, band))
     else:  # Pasta Grafiği
-        fig, ax = plt.subplots(figsize=(10, 10))
-        # Veriyi kategorilere ayır
-        if sensor_data == "Sicaklik":
-            bins = [20, 22, 24, 26, 28, 30]
-            labels = ["20-22°C", "22-24°C", "24-26°C", "26-28°C", "28-30°C"]
+        pie_bins = 5
+        if sensor != "Sıcaklık":
+            pie_bins = st.slider("Dilim sayısı", 2, 12, 5, 1, key="pie_bins")
+        if chart_backend == "vega":
+            show_chart(vega_sensor_pie_chart(value_stats, sensor, pie_bins))
         else:
-            # Diğer sensörler için değer aralıklarını otomatik belirle
-            values = df_filtered[sensor_data]
-            min_val = values.min()
-            max_val = values.max()
-            bins = np.linspace(min_val, max_val, 6)  # 5 dilim için 6 sınır
-            labels = [f"{bins[i]:.1f}-{bins[i+1]:.1f}" for i in range(len(bins)-1)]
-        
-        df_filtered['Değer Aralığı'] = pd.cut(df_filtered[sensor_data], bins=bins, labels=labels)
-        value_counts = df_filtered['Değer Aralığı'].value_counts()
-        
-        colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC']
-        plt.pie(value_counts, labels=value_counts.index, autopct='%1.1f%%', colors=colors)
-        plt.title(f"{sensor} - Değer Dağılımı", pad=20, fontsize=14)
-        st.pyplot(fig)
+            show_chart(prerendered(sensor, "pie", all_days and pie_bins == 5)
+                       or create_sensor_pie_chart(value_stats, sensor, pie_bins))
+
+    # Yüzdelikler değer histogramından; maliyet satır sayısından bağımsız
+    percentile_cols = st.columns(len(PERCENTILES))
+    for column, (label, value) in zip(percentile_cols, value_stats.percentiles(SENSOR_COLUMNS[sensor]).items()):
+        column.metric(label, f"{value:,.2f}")
 
 # Tablo Görselleştirme
 if st.session_state["show_table"]:
     st.markdown("### 📊 Sicaklik Verisi Tablosu")
-    st.dataframe(
-        df_filtered[["Gün", "Saat", "Sicaklik", "Metrekare", "Isik Sensörü", "Hareket Sensörü", "CO2 Sensörü", "Nem Sensörü"]],
+
+    # Sıralama ve filtreler depo üzerinde çalışır; tarayıcıya yalnızca görünen sayfa gider
+    sort_col, order_col, size_col, page_col = st.columns(4)
+    sort_by = sort_col.selectbox("Sırala:", [""] + TABLE_COLUMNS, key="table_sort")
+    descending = order_col.radio("Yön:", ["Artan", "Azalan"], horizontal=True, key="table_order") == "Azalan"
+    page_size = size_col.selectbox("Sayfa boyutu:", PAGE_SIZES, index=1, key="table_page_size")
+
+    with st.expander("Filtreler"):
+        filter_col, low_col, high_col = st.columns(3)
+        filter_column = filter_col.selectbox("Kolon:", [""] + list(SENSOR_COLUMNS.values()), key="table_filter")
+        low = low_col.number_input("En az:", value=None, key="table_filter_low")
+        high = high_col.number_input("En çok:", value=None, key="table_filter_high")
+    filters = ((filter_column, low, high),) if filter_column else ()
+
+    rows = table_rows(view, sort_by or None, descending, filters)
+    pages = page_count(len(rows), page_size)
+    if st.session_state.get("table_page", 1) > pages:
+        st.session_state["table_page"] = pages
+    page = page_col.number_input(f"Sayfa (1-{pages}):", min_value=1, max_value=pages, step=1, key="table_page")
+
+    with stage("table_page"):
+        table = table_page(store, rows, page - 1, page_size, TABLE_COLUMNS)
+    emit(
+        st.dataframe,
+        table,
         hide_index=True,
         use_container_width=True
     )
-
-@st.cache_data
-def detect_anomalies(df, column='Sicaklik', threshold=2.5):
+    start = (page - 1) * page_size
+    st.caption(f"{min(start + 1, len(rows)):,}-{min(start + page_size, len(rows)):,} / {len(rows):,} satır")
+
+# Anomali dedektörü; tüm sensörler için puanlar yükleme sırasında bir kez hesaplanır
+# (varsayılan: günün dakikası bazında medyan/MAD, günlük döngü anomali sayılmaz).
+# Anlık görüntüden açılan odalarda oturtulmuş taban çizgisi ve puanlar diskten gelir
+@st.cache_resource
+def build_anomaly_detector(_store, fingerprint, method="seasonal", _saved=None):
+    if _saved is not None:
+        return _saved
+    return analysis.build_anomaly_detector(_store, method)
+
+@memoize(cache)
+def detect_anomalies(view, column='Sicaklik', threshold=2.5, method="seasonal"):
     """
-    Z-score tabanlı anomali tespiti
+    Günün dilimi bazında medyan/MAD taban çizgisiyle anomali tespiti; method="zscore" çevrimiçi Z-score
     """
-    # Z-score hesaplama
-    mean = df[column].mean()
-    std = df[column].std()
-    df['Z-score'] = (df[column] - mean) / std
-    
-    # Anomalileri tespit et
-    df['Anomali'] = abs(df['Z-score']) > threshold
-    df['Anomali_Degeri'] = np.where(df['Anomali'], df[column], np.nan)
-    
-    return df
+    detector = build_anomaly_detector(view.store, view.store.fingerprint, method)
+    return analysis.detect_anomalies(view, column, threshold, detector)
 
-@st.cache_data
-def analyze_trends(df, column='Sicaklik', window=5):
-    """
-    Hareketli ortalama tabanlı trend analizi
-    """
-    # Hareketli ortalama hesaplama
-    df['Hareketli_Ortalama'] = df[column].rolling(window=window).mean()
-    
-    # Trend yönü hesaplama
-    df['Trend'] = np.where(df['Hareketli_Ortalama'] > df[column].shift(1), 'Yükseliş',
-                          np.where(df['Hareketli_Ortalama'] < df[column].shift(1), 'Düşüş', 'Stabil'))
-    
-    return df
+@memoize(cache)
+def anomaly_summary(view, threshold=2.5, method="seasonal"):
+    detector = build_anomaly_detector(view.store, view.store.fingerprint, method)
+    return analysis.anomaly_summary(view, threshold, detector)
 
-@st.cache_data
-def create_anomaly_chart(df):
-    """
-    Anomali tespiti sonuçlarını görselleştiren grafik
-    """
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    # Normal veri noktaları
-    ax.plot(df['Saat'], df['Sicaklik'], 'b-', label='Normal Değerler')
-    
-    # Anomali noktaları
-    anomalies = df[df['Anomali']]
-    ax.scatter(anomalies['Saat'], anomalies['Sicaklik'], 
-              color='red', s=100, label='Anomaliler', zorder=5)
-    
-    # Z-score eşik çizgileri
-    mean = df['Sicaklik'].mean()
-    std = df['Sicaklik'].std()
-    ax.axhline(y=mean + 2.5*std, color='r', linestyle='--', alpha=0.3, label='Üst Eşik')
-    ax.axhline(y=mean - 2.5*std, color='r', linestyle='--', alpha=0.3, label='Alt Eşik')
-    
-    ax.set_title('Sıcaklık Anomalileri', fontsize=14)
-    ax.set_xlabel('Saat')
-    ax.set_ylabel('Sıcaklık (°C)')
-    ax.legend()
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    
-    return fig
+# Trend motoru; depo başına bir kez tüm pencerelerle hesaplanır, pencere değişimi yalnızca okumadır
+@st.cache_resource
+def build_trend_engine(_store, fingerprint):
+    return analysis.build_trend_engine(_store)
 
-@st.cache_data
-def create_trend_chart(df):
+@memoize(cache)
+def analyze_trends(view, column='Sicaklik', window=5):
     """
-    Trend analizi sonuçlarını görselleştiren grafik
+    Hareketli ortalama tabanlı trend analizi
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
-    
-    # Orijinal veri
-    ax.plot(df['Saat'], df['Sicaklik'], 'b-', label='Sıcaklık')
-    
-    # Hareketli ortalama
-    ax.plot(df['Saat'], df['Hareketli_Ortalama'], 'r--', label='Hareketli Ortalama')
-    
-    # Trend noktaları
-    trend_colors = {'Yükseliş': 'g', 'Düşüş': 'r', 'Stabil': 'y'}
-    for trend, color in trend_colors.items():
-        mask = df['Trend'] == trend
-        ax.scatter(df.loc[mask, 'Saat'], df.loc[mask, 'Sicaklik'], 
-                  color=color, s=50, label=trend)
-    
-    ax.set_title('Sıcaklık Trend Analizi', fontsize=14)
-    ax.set_xlabel('Saat')
-    ax.set_ylabel('Sıcaklık (°C)')
-    ax.legend()
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    
-    return fig
+    engine = build_trend_engine(view.store, view.store.fingerprint)
+    return analysis.analyze_trends(view, column, window, engine)
+
+@cached_figure(render_cache)
+def create_anomaly_chart(view, threshold=2.5, sensor="Sıcaklık", method="seasonal"):
+    return lazy_import("dashboard.charts").create_anomaly_chart(view, detect_anomalies(view, SENSOR_COLUMNS[sensor], threshold, method), sensor)
+
+@cached_figure(render_cache)
+def create_trend_chart(view, window=5):
+    return lazy_import("dashboard.charts").create_trend_chart(view, analyze_trends(view, window=window))
+
+@cached_spec(render_cache)
+def vega_anomaly_chart(view, threshold=2.5, sensor="Sıcaklık", method="seasonal"):
+    return lazy_import("dashboard.vega").anomaly_chart(view, detect_anomalies(view, SENSOR_COLUMNS[sensor], threshold, method), sensor)
+
+@cached_spec(render_cache)
+def vega_trend_chart(view, window=5):
+    return lazy_import("dashboard.vega").trend_chart(view, analyze_trends(view, window=window))
+
+# Panel işleri: analiz ve grafik tek işte; analizden sonra iş iptal edildiyse çizime geçilmez.
+# Sonuçlar küçük tutulur (görüntü baytları veya spec'ler ve özetler), satır tabloları veri önbelleğinde kalır.
+def anomaly_panel(view, threshold, sensor, method, full_view, backend="png"):
+    anomalies = detect_anomalies(view, SENSOR_COLUMNS[sensor], threshold, method)
+    summary = anomaly_summary(view, threshold, method)
+    checkpoint()
+    if backend == "vega":
+        chart = vega_anomaly_chart(view, threshold, sensor, method)
+    else:
+        chart = (prerendered(sensor, "anomaly", full_view, threshold=threshold, method=method)
+                 or create_anomaly_chart(view, threshold, sensor, method))
+    return {"chart": chart, "rows": len(anomalies), "anomalies": int(anomalies["Anomali"].sum()), "summary": summary}
+
+def trend_panel(view, window, full_view, backend="png"):
+    trends = analyze_trends(view, window=window)["Trend"].value_counts()
+    checkpoint()
+    if backend == "vega":
+        chart = vega_trend_chart(view, window)
+    else:
+        chart = prerendered("Sıcaklık", "trend", full_view, window=window) or create_trend_chart(view, window)
+    return {"chart": chart, "trends": trends}
 
 # Ana dashboard arayüzü
 st.sidebar.title("Analiz Seçenekleri")
@@ -602,27 +661,66 @@ st.sidebar.title("Analiz Seçenekleri")
 # Anomali ve trend analizi için parametreler
 st.sidebar.subheader("Anomali ve Trend Analizi")
 anomaly_threshold = st.sidebar.slider("Anomali Tespiti Eşik Değeri (Z-score)", 1.5, 3.5, 2.5, 0.1)
+anomaly_methods = {"Günlük döngüye göre (medyan/MAD)": "seasonal", "Genel ortalamaya göre": "zscore"}
+anomaly_method = anomaly_methods[st.sidebar.radio("Anomali yöntemi:", list(anomaly_methods), key="anomaly_method")]
+anomaly_sensor = st.sidebar.selectbox("Anomali sensörü:", sensor_options, key="anomaly_sensor")
 trend_window = st.sidebar.slider("Trend Analizi Pencere Boyutu", 3, 15, 5, 1)
 
-# Veriyi analiz et
-df_analyzed = detect_anomalies(st.session_state["df_filtered"], threshold=anomaly_threshold)
-df_analyzed = analyze_trends(df_analyzed, window=trend_window)
+# Önbellek durumu
+with st.sidebar.expander("Önbellek Durumu"):
+    cache_stats = cache.stats()
+    st.write(f"Kayıt: {cache_stats['entries']} · "
+             f"{cache_stats['bytes'] / 2**20:.1f} / {cache_stats['max_bytes'] / 2**20:.0f} MB")
+    st.write(f"İsabet: {cache_stats['hits']} · Iskalama: {cache_stats['misses']} · "
+             f"Çıkarma: {cache_stats['evictions']} · Oran: {cache_stats['hit_rate']:.0%}")
+    render_stats = render_cache.stats()
+    st.write(f"Grafik görüntüleri: {render_stats['entries']} · "
+             f"{render_stats['bytes'] / 2**20:.1f} / {render_stats['max_bytes'] / 2**20:.0f} MB · "
+             f"Oran: {render_stats['hit_rate']:.0%}")
+    job_stats = jobs.stats()
+    st.write(f"Arka plan işleri: {job_stats['pending']} bekliyor · {job_stats['submitted']} gönderildi · "
+             f"{job_stats['shared']} paylaşıldı · {job_stats['cancelled']} iptal · {job_stats['failed']} hata")
+
+show_profile = st.sidebar.checkbox("⏱ Adım profilini göster", value=False, key="show_profile",
+                                   help="Bu çalıştırmadaki adımların sürelerini şelale grafiği olarak göster")
+
+# Veriyi analiz et; analizler ve grafikler arka planda hesaplanır, yenisi hazır olana kadar önceki sonuç gösterilir.
+# Paylaşılan kaynaklar (st.cache_resource) işlerden önce script iş parçacığında hazırlanır.
+build_anomaly_detector(store, store.fingerprint, anomaly_method,
+                       fleet.detectors.get(selected_room) if anomaly_method == "seasonal" else None)
+build_trend_engine(store, store.fingerprint)
+anomaly_result, anomaly_job = background("anomaly", anomaly_panel, view, anomaly_threshold, anomaly_sensor,
+                                         anomaly_method, all_days, chart_backend)
+trend_result, trend_job = background("trend", trend_panel, view, trend_window, all_days, chart_backend)
+pending_jobs = [job for job in (anomaly_job, trend_job) if job is not None]
+
+def updating(job):
+    if job is not None:
+        st.caption("⏳ Yeni parametrelerle hesaplanıyor; önceki sonuç gösteriliyor")
 
 # Anomali ve trend analizi grafikleri
 st.markdown("### 🔍 Anomali ve Trend Analizi")
 col1, col2 = st.columns(2)
 
 with col1:
-    st.pyplot(create_anomaly_chart(df_analyzed))
+    if anomaly_result is None:
+        st.info("⏳ Anomali grafiği hazırlanıyor...")
+    else:
+        updating(anomaly_job)
+        show_chart(anomaly_result["chart"])
     st.markdown("""
     **Anomali Tespiti:**
-    - Kırmızı noktalar anormal sıcaklık değerlerini gösterir
-    - Kesikli çizgiler Z-score eşik değerlerini gösterir
-    - Eşik değeri yan panelden ayarlanabilir
+    - Kırmızı noktalar anormal değerleri gösterir
+    - Kesikli çizgiler Z-score eşik değerlerini gösterir; günlük döngü yönteminde eşikler günün saatine göre değişir
+    - Eşik değeri, yöntem ve sensör yan panelden ayarlanabilir
     """)
 
 with col2:
-    st.pyplot(create_trend_chart(df_analyzed))
+    if trend_result is None:
+        st.info("⏳ Trend grafiği hazırlanıyor...")
+    else:
+        updating(trend_job)
+        show_chart(trend_result["chart"])
     st.markdown("""
     **Trend Analizi:**
     - Mavi çizgi gerçek sıcaklık değerlerini gösterir
@@ -632,13 +730,149 @@ with col2:
 
 # Anomali istatistikleri
 st.markdown("### 📊 Anomali İstatistikleri")
-anomaly_stats = df_analyzed['Anomali'].value_counts()
-st.write(f"Toplam veri noktası sayısı: {len(df_analyzed)}")
-st.write(f"Anomali sayısı: {anomaly_stats.get(True, 0)}")
-st.write(f"Anomali oranı: {anomaly_stats.get(True, 0)/len(df_analyzed)*100:.2f}%")
+if anomaly_result is not None:
+    updating(anomaly_job)
+    anomaly_rows, anomaly_count = anomaly_result["rows"], anomaly_result["anomalies"]
+    st.write(f"Toplam veri noktası sayısı: {anomaly_rows}")
+    st.write(f"Anomali sayısı: {anomaly_count}")
+    st.write(f"Anomali oranı: {anomaly_count / anomaly_rows * 100 if anomaly_rows else 0:.2f}%")
+    st.write("Tüm sensörler:")
+    emit(st.dataframe, anomaly_result["summary"], hide_index=True, use_container_width=True,
+         column_config={"Oran (%)": st.column_config.NumberColumn(format="%.2f")})
 
 # Trend istatistikleri
 st.markdown("### 📈 Trend İstatistikleri")
-trend_stats = df_analyzed['Trend'].value_counts()
-st.write("Trend dağılımı:")
-st.bar_chart(trend_stats)
\ No newline at end of file
+if trend_result is not None:
+    updating(trend_job)
+    st.write("Trend dağılımı:")
+    emit(st.bar_chart, trend_result["trends"])
+
+# Alarmlar; seçilen günlerde tetiklenenler en yeniden eskiye
+ALERT_ROWS = 200
+
+st.markdown("### 🚨 Alarmlar")
+alert_rooms = [selected_room]
+if len(fleet) > 1 and st.checkbox("Tüm odaların alarmlarını göster", value=False, key="alerts_all_rooms"):
+    alert_rooms = None
+with stage("Alarm tablosu"):
+    alert_table = alerts.table(alert_rooms, selected_day)
+if alert_table.empty:
+    st.success("Seçilen günlerde tetiklenen alarm yok")
+else:
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        st.write("Kural başına alarm sayısı:")
+        emit(st.bar_chart, alert_table["Kural"].value_counts(sort=False))
+    with col2:
+        emit(st.dataframe, alert_table.head(ALERT_ROWS), hide_index=True, use_container_width=True,
+             column_config={"Değer": st.column_config.NumberColumn(format="%.1f")})
+        st.caption(f"{len(alert_table):,} alarm" + (f"; en yeni {ALERT_ROWS} gösteriliyor"
+                                                     if len(alert_table) > ALERT_ROWS else ""))
+with st.expander("Alarm kuralları"):
+    emit(st.dataframe, alerts.rule_table(), hide_index=True, use_container_width=True)
+    if alert_log_path:
+        st.caption(f"Tetiklenen alarmlar {alert_log_path} dosyasına yazılır")
+
+create_rollup_chart = cached_figure(render_cache)(deferred("dashboard.charts", "create_rollup_chart"))
+
+# Uzun dönem grafiği de arka planda çizilir; ilk çalıştırma çizim kütüphanelerinin yüklenmesini beklemez
+def rollup_panel(pyramid, sensor, start, end, full_view):
+    return prerendered(sensor, "rollup", full_view) or create_rollup_chart(pyramid, sensor, start, end)
+
+st.markdown("### 📅 Uzun Dönem Görünümü")
+first_minute, last_minute = pyramid.span()
+if last_minute > first_minute:
+    first_date = np.datetime64(first_minute, "m").astype(object).date()
+    last_date = np.datetime64(last_minute - 1, "m").astype(object).date()
+    col1, col2 = st.columns([1, 2])
+    long_range_sensor = col1.selectbox("Sensör:", sensor_options, key="long_range_sensor")
+    date_range = col2.date_input("Tarih aralığı:", value=(first_date, last_date),
+                                 min_value=first_date, max_value=last_date, key="long_range_dates")
+    if len(date_range) == 2:
+        start = int(np.datetime64(date_range[0], "m").astype(np.int64))
+        end = int(np.datetime64(date_range[1], "m").astype(np.int64)) + MINUTES_PER_DAY
+        rollup_image, rollup_job = background("rollup", rollup_panel, pyramid, long_range_sensor, start, end,
+                                              (start, end) == full_range(pyramid))
+        if rollup_job is not None:
+            pending_jobs.append(rollup_job)
+        if rollup_image is None:
+            st.info("⏳ Uzun dönem grafiği hazırlanıyor...")
+        else:
+            updating(rollup_job)
+            show_chart(rollup_image)
+
+# Filo görünümü; oda analizleri paylaşılan iş parçacığı havuzunda paralel çalışır
+@memoize(cache)
+def summarize_fleet(fleet, selected_days, threshold, window, method):
+    executor, workers = fleet_executor()
+    return analyze_fleet(fleet, selected_days, threshold=threshold, window=window, executor=executor, workers=workers,
+                         method=method)
+
+if len(fleet) > 1:
+    st.markdown("### 🏢 Filo Görünümü")
+    fleet_summary, fleet_job = background("fleet", summarize_fleet, fleet, tuple(selected_day), anomaly_threshold,
+                                          trend_window, anomaly_method)
+    if fleet_job is not None:
+        pending_jobs.append(fleet_job)
+    if fleet_summary is None:
+        st.info("⏳ Oda analizleri hazırlanıyor...")
+    else:
+        updating(fleet_job)
+        top_n = st.slider("Gösterilecek oda sayısı", 1, len(fleet), min(10, len(fleet)), 1, key="fleet_top_n")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**En sıcak odalar**")
+            emit(st.dataframe, top_rooms(fleet_summary, top_n), hide_index=True, use_container_width=True)
+        with col2:
+            st.markdown("**Bina başına anomali sayısı**")
+            buildings = building_summary(fleet_summary)
+            emit(st.bar_chart, buildings.set_index("Bina")["Anomali"])
+            emit(st.dataframe, buildings, hide_index=True, use_container_width=True)
+
+# Bekleyen işler varsa yalnızca bu parça yoklanır; hepsi bitince sayfa yeni sonuçlarla yeniden çalışır.
+# Script işleri beklemediği için kaydırıcı hareketleri kuyrukta birikmez.
+@st.fragment(run_every=JOB_POLL_SECONDS if pending_jobs else None)
+def watch_jobs():
+    if pending_jobs and all(job.done() for job in pending_jobs):
+        st.rerun()
+
+watch_jobs()
+
+# Adım süreleri ve önbellek isabet oranları; ODA_PROFILE_LOG (dönen JSON-lines) ve
+# ODA_PROMETHEUS_PATH (Prometheus metin dosyası) tanımlıysa her çalıştırmada dışa aktarılır
+@st.cache_resource
+def get_exporter():
+    return TimingExporter(
+        os.environ.get("ODA_PROFILE_LOG"),
+        os.environ.get("ODA_PROMETHEUS_PATH"),
+        max_bytes=int(os.environ.get("ODA_PROFILE_LOG_MB", 10)) * 1024 * 1024,
+    )
+
+profile.finish()
+get_exporter().export(profile, {"veri": cache.stats(), "grafik": render_cache.stats()})
+
+if show_profile:
+    with st.sidebar.expander("Adım Profili", expanded=True):
+        st.write(f"Toplam: {profile.seconds * 1000:.0f} ms · {len(profile.stages)} adım")
+        waterfall = pd.DataFrame({
+            "Adım": [f"{index + 1:02d} {'· ' * record['depth']}{record['stage']}"
+                     for index, record in enumerate(profile.stages)],
+            "Başlangıç (ms)": [record["start"] * 1000 for record in profile.stages],
+            "Bitiş (ms)": [(record["start"] + record["seconds"]) * 1000 for record in profile.stages],
+            "Süre (ms)": [record["seconds"] * 1000 for record in profile.stages],
+            "Önbellek": [{True: "isabet", False: "ıskalama"}.get(record.get("cached"), "-")
+                         for record in profile.stages],
+        })
+        import altair as alt
+
+        st.altair_chart(
+            alt.Chart(waterfall).mark_bar().encode(
+                x=alt.X("Başlangıç (ms)", title="ms"),
+                x2="Bitiş (ms)",
+                y=alt.Y("Adım", sort=None, title=None),
+                color=alt.Color("Önbellek", scale=alt.Scale(domain=["isabet", "ıskalama", "-"],
+                                                            range=["#1ABC9C", "#E74C3C", "#8E44AD"])),
+                tooltip=["Adım", alt.Tooltip("Süre (ms)", format=".1f"), "Önbellek"],
+            ),
+            use_container_width=True,
+        )
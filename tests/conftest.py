@@ -0,0 +1,29 @@
+"""
+Testlerin paylaştığı sentetik depolar
+"""
+import numpy as np
+import pytest
+
+from dashboard.store import SENSORS, SensorStore
+from dashboard.synthetic import create_store
+
+
+@pytest.fixture(scope="session")
+def store():
+    """
+    Tohumlu 10 günlük tek oda; ölçüm sensörlerinde rastgele eksik (NaN) okumalar vardır
+    """
+    base = create_store(days=10, seed=7)
+    rng = np.random.default_rng(7)
+    readings = {}
+    for name in SENSORS:
+        values = np.array(base.readings[name])
+        if values.dtype.kind == "f":
+            values[rng.random(len(values)) < 0.01] = np.nan
+        readings[name] = values
+    return SensorStore(base.minute, readings, base.room, version=1, timestamp=base.timestamp)
+
+
+@pytest.fixture(scope="session")
+def frame(store):
+    return store.to_frame(columns=["Zaman", "Gün", "Saat", *SENSORS])
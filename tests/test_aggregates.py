@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.aggregates import DayAggregates
+from dashboard.store import DAYS, SENSORS
+
+SELECTIONS = [["Pazartesi"], ["Sali", "Cumartesi", "Pazar"], DAYS]
+
+
+@pytest.mark.parametrize("days", SELECTIONS)
+@pytest.mark.parametrize("stat", ["mean", "std", "min", "max", "count"])
+def test_select_matches_groupby(store, frame, days, stat):
+    stats = DayAggregates.from_store(store).select(days)
+    grouped = frame[frame["Gün"].isin(days)].groupby("Saat", observed=True)
+    for name in SENSORS:
+        expected = getattr(grouped[name], stat)()
+        expected = expected[grouped[name].count() > 0]
+        actual = stats.series(name, stat)
+        assert list(actual.index) == list(expected.index.astype(str))
+        np.testing.assert_allclose(actual.to_numpy(np.float64), expected.to_numpy(np.float64), rtol=1e-5,
+                                   atol=1e-4)
+
+
+def test_incremental_add_and_merge_match_single_pass(store):
+    whole = DayAggregates.from_store(store)
+    half = len(store) // 2
+    first = DayAggregates.empty().add(store.minute[:half], {name: store.readings[name][:half] for name in SENSORS})
+    second = DayAggregates.empty().add(store.minute[half:], {name: store.readings[name][half:] for name in SENSORS})
+    merged = first.merge(second).select(["Sali", "Pazar"])
+    expected = whole.select(["Sali", "Pazar"])
+    for name in SENSORS:
+        for stat in ("count", "mean", "std", "min", "max"):
+            np.testing.assert_allclose(getattr(merged, stat)(name), getattr(expected, stat)(name), rtol=1e-9)
+
+
+def test_select_without_rows_is_empty(store):
+    empty = DayAggregates.empty().select(["Pazartesi"])
+    assert empty.series("Sicaklik").empty
+    assert isinstance(empty.series("Sicaklik"), pd.Series)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.alerts import AlertEngine, AlertRule
+from dashboard.store import MINUTES_PER_DAY, SENSORS
+
+RULES = [
+    {"name": "CO2 (dolu oda)", "severity": "kritik", "for": 10,
+     "when": [{"sensor": "CO2 Sensörü", "op": ">", "value": 500},
+              {"sensor": "Hareket Sensörü", "op": "==", "value": 1, "hold": 5}]},
+    {"name": "Nem aralık dışı", "for": 2, "when": [{"sensor": "Nem Sensörü", "op": "outside", "value": [50, 55]}]},
+    {"name": "Sıcaklık yükselişi", "severity": "bilgi", "count": 4,
+     "when": [{"sensor": "Sicaklik", "trend": "Yükseliş", "window": 3}]},
+    {"name": "Sıcak ve aydınlık", "count": 3,
+     "when": [{"sensor": "Sicaklik", "op": ">", "value": 23}, {"sensor": "Isik Sensörü", "op": "==", "value": 1}]},
+    {"name": "Nem aralıkta", "severity": "bilgi", "for": 20, "gap": 2,
+     "when": [{"sensor": "Nem Sensörü", "op": "between", "value": [50, 55]}]},
+]
+
+
+@pytest.fixture(scope="module")
+def rows(store):
+    # Ara ara atlanan dakikalar koşuları `gap` sınırında keser
+    keep = np.random.default_rng(3).random(len(store)) > 0.02
+    keep[3 * MINUTES_PER_DAY:] = False
+    return store.timestamp[keep], {name: store.readings[name][keep] for name in SENSORS}
+
+
+def _evaluate(timestamp, readings, size):
+    engine = AlertEngine([AlertRule.from_dict(spec) for spec in RULES])
+    for start in range(0, len(timestamp), size):
+        for room in ("A", "B"):
+            part = {name: values[start:start + size] for name, values in readings.items()}
+            if room == "B":
+                part["Sicaklik"] = part["Sicaklik"] + 1
+            engine.update(timestamp[start:start + size], part, room)
+    return engine
+
+
+@pytest.mark.parametrize("size", [1, 13, 1440])
+def test_alerts_do_not_depend_on_chunk_size(rows, size):
+    expected = _evaluate(*rows, len(rows[0]))
+    actual = _evaluate(*rows, size)
+    assert expected.fired > 0
+    assert (expected.table()["Kural"].value_counts() > 0).all()
+    assert actual.fired == expected.fired
+    columns = ["Oda", "Kural", "Başlangıç", "Tetiklenme", "Bitiş", "Değer"]
+    pd.testing.assert_frame_equal(actual.table().sort_values(columns, ignore_index=True),
+                                  expected.table().sort_values(columns, ignore_index=True))
+
+
+def test_duration_fires_once_per_run():
+    engine = AlertEngine([AlertRule.from_dict({"name": "Sıcak", "for": 3,
+                                               "when": [{"sensor": "Sicaklik", "op": ">", "value": 25}]})])
+    temperature = np.array([20, 26, 26, 26, 26, 20, 26, 26, 20, 26, 26, 26], dtype=np.float64)
+    engine.update(np.arange(len(temperature)), {"Sicaklik": temperature})
+    table = engine.table().sort_values("Tetiklenme", ignore_index=True)
+    minutes = {column: table[column].to_numpy().astype("datetime64[m]").astype(np.int64).tolist()
+               for column in ("Başlangıç", "Tetiklenme", "Bitiş")}
+    assert minutes["Başlangıç"] == [1, 9]
+    assert minutes["Tetiklenme"] == [3, 11]
+    # Son koşu veri sonunda hâlâ açık; bitişi bilinmiyor
+    assert minutes["Bitiş"][0] == 4
+    assert table["Bitiş"].isna().tolist() == [False, True]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from dashboard.cache import LRUCache, estimate_size, fingerprint, memoize
+from dashboard.store import StoreView
+
+
+def test_evicts_least_recently_used_within_byte_budget():
+    cache = LRUCache(max_bytes=3000)
+    for key in "abc":
+        cache.put(key, np.zeros(125))  # 1000 bayt
+    assert cache.bytes == 3000 and len(cache) == 3
+
+    cache.get("a")
+    cache.put("d", np.zeros(250))
+    # En uzun süredir kullanılmayan iki değer çıkar; yeni okunan "a" kalır
+    assert "a" in cache and "d" in cache
+    assert "b" not in cache and "c" not in cache
+    assert cache.bytes == 3000 and cache.evictions == 2
+
+
+def test_replacing_a_key_updates_size_and_oversized_values_are_not_kept():
+    cache = LRUCache(max_bytes=1000)
+    cache.put("a", np.zeros(100))
+    cache.put("a", np.zeros(25))
+    assert cache.bytes == 200 and len(cache) == 1
+
+    value = np.zeros(1000)
+    assert cache.put("büyük", value) is value
+    assert "büyük" not in cache and "a" in cache
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = LRUCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("k", lambda: calls.append(1) or "değer") == "değer"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1
+
+
+def test_estimate_size_of_nested_arrays():
+    parts = {"a": np.zeros(10), "b": (np.zeros(5, dtype=np.int32), b"xyz")}
+    assert estimate_size(parts) >= 80 + 20 + 3
+
+
+def test_fingerprint_rejects_unknown_types():
+    assert fingerprint(("a", 1, [2.5, None])) == ("tuple", ("a", 1, ("list", (2.5, None))))
+    assert fingerprint({"b": 1, "a": 2}) == fingerprint({"a": 2, "b": 1})
+    with pytest.raises(TypeError):
+        fingerprint(np.zeros(3))
+
+
+def test_memoize_keys_on_view_fingerprint(store):
+    cache = LRUCache()
+    calls = []
+
+    @memoize(cache)
+    def row_count(view, column="Sicaklik"):
+        calls.append(view.fingerprint)
+        return len(view.sensor(column))
+
+    monday = StoreView(store, ["Pazartesi"])
+    assert row_count(monday) == row_count(StoreView(store, ["Pazartesi"]))
+    assert len(calls) == 1
+    row_count(monday, column="Nem Sensörü")
+    row_count(StoreView(store, ["Pazartesi", "Sali"]))
+    assert len(calls) == 3
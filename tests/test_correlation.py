@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from dashboard.correlation import CorrelationEngine
+from dashboard.store import SENSORS
+
+
+def _pairs(frame, lag):
+    # t dakikasındaki okuma ile t - lag dakikasındaki okuma; yalnızca tüm sensörleri dolu satırlar
+    complete = frame.set_index("Zaman")[["Gün", *SENSORS]].dropna()
+    complete[SENSORS] = complete[SENSORS].astype(np.float64)
+    return complete.join(complete[SENSORS].shift(lag, freq="min"), rsuffix="_a", how="inner")
+
+
+def _expected(pairs):
+    return np.array([[np.corrcoef(pairs[f"{first}_a"], pairs[second])[0, 1] for second in SENSORS]
+                     for first in SENSORS])
+
+
+def test_lag_zero_matches_dataframe_corr(store, frame):
+    engine = CorrelationEngine.from_store(store)
+    expected = frame[SENSORS].dropna().astype(np.float64).corr().to_numpy()
+    np.testing.assert_allclose(engine.correlation(0), expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("lag", [1, 5, 60])
+def test_lagged_correlation_matches_shift(store, frame, lag):
+    engine = CorrelationEngine.from_store(store)
+    np.testing.assert_allclose(engine.correlation(lag), _expected(_pairs(frame, lag)), atol=1e-9)
+
+
+def test_day_selection_matches_filtered_pairs(store, frame):
+    engine = CorrelationEngine.from_store(store)
+    days = ["Sali", "Pazar"]
+    pairs = _pairs(frame, 10)
+    np.testing.assert_allclose(engine.correlation(10, days=days), _expected(pairs[pairs["Gün"].isin(days)]),
+                               atol=1e-9)
+
+
+def test_chunked_updates_match_single_pass(store):
+    whole = CorrelationEngine.from_store(store)
+    chunked = CorrelationEngine()
+    for start in range(0, len(store), 777):
+        chunked.update(store.timestamp[start:start + 777],
+                       {name: store.readings[name][start:start + 777] for name in SENSORS})
+    for lag in chunked.lags:
+        np.testing.assert_allclose(chunked.correlation(lag), whole.correlation(lag), atol=1e-9)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from dashboard.decimate import decimate, lttb, minmax
+
+
+@pytest.fixture(scope="module")
+def series():
+    rng = np.random.default_rng(3)
+    x = np.arange(20_000, dtype=np.float64)
+    y = np.sin(x / 500) + rng.normal(0, 0.05, len(x))
+    # Tek noktalık sıçramalar seyreltmede kaybolmamalı
+    y[[4_321, 15_000]] = [6.0, -6.0]
+    return x, y
+
+
+def test_lttb_keeps_endpoints_and_peaks(series):
+    x, y = series
+    selected = lttb(x, y, 500)
+    assert len(selected) == 500
+    assert selected[0] == 0 and selected[-1] == len(x) - 1
+    assert np.all(np.diff(selected) > 0)
+    assert {4_321, 15_000} <= set(selected.tolist())
+
+
+def test_lttb_short_series_is_untouched():
+    np.testing.assert_array_equal(lttb(np.arange(10), np.arange(10), 20), np.arange(10))
+    np.testing.assert_array_equal(lttb(np.arange(10), np.arange(10), 2), np.arange(10))
+
+
+def test_minmax_keeps_each_bucket_extremes(series):
+    _, y = series
+    buckets = 250
+    selected = minmax(y, buckets)
+    assert len(selected) <= 2 * buckets + 2
+    size = -(-len(y) // buckets)
+    for start in range(0, len(y), size):
+        bucket = y[start:start + size]
+        assert start + int(bucket.argmin()) in selected
+        assert start + int(bucket.argmax()) in selected
+    assert selected[0] == 0 and selected[-1] == len(y) - 1
+
+
+def test_decimate_skips_nan_and_keeps_marked_points(series):
+    x, y = series
+    y = y.copy()
+    y[100:200] = np.nan
+    keep = np.zeros(len(y), dtype=bool)
+    keep[[7, 9_999]] = True
+    for method in ("lttb", "minmax"):
+        selected = decimate(x, y, 800, keep=keep, method=method)
+        assert np.all(np.diff(selected) > 0)
+        assert not np.isnan(y[selected]).any()
+        assert {7, 9_999} <= set(selected.tolist())
+        assert len(selected) <= 800 + 2 + keep.sum()
+
+
+def test_decimate_rejects_unknown_method(series):
+    x, y = series
+    with pytest.raises(ValueError):
+        decimate(x, y, 100, method="ortalama")
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from dashboard import analysis
+from dashboard.fleet import analyze_room, room_cache
+from dashboard.store import StoreView
+
+
+@pytest.mark.parametrize("method", analysis.ANOMALY_METHODS)
+def test_threshold_changes_reuse_room_state(store, method):
+    room_cache.clear()
+    analyze_room(store, method=method)
+    misses = room_cache.misses
+    view = StoreView(store, store.days())
+    detector = analysis.build_anomaly_detector(store, method)
+    for threshold in (1.5, 2.5, 4.0):
+        for window in (3, 9):
+            row = analyze_room(store, threshold=threshold, window=window, method=method)
+            expected = analysis.detect_anomalies(view, "Sicaklik", threshold, detector)["Anomali"].sum()
+            assert row["Anomali"] == expected
+            trends = analysis.analyze_trends(view, "Sicaklik", window)["Trend"].value_counts()
+            assert (row["Yükseliş"], row["Düşüş"]) == (trends["Yükseliş"], trends["Düşüş"])
+    # Dedektör ve trend motoru yalnızca ilk çağrıda kuruldu
+    assert room_cache.misses == misses
+
+
+def test_days_filter_reads_cached_scores(store):
+    everything = analyze_room(store)
+    monday = analyze_room(store, days=["Pazartesi"])
+    assert monday["Satır"] == int(np.count_nonzero(store.day_code == 0))
+    assert monday["Anomali"] <= everything["Anomali"]
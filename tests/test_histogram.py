@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.histogram import PERCENTILES, RESOLUTION, ValueHistograms
+from dashboard.store import SENSORS
+
+
+@pytest.mark.parametrize("days", [["Pazartesi"], ["Çarşamba", "Cumartesi", "Pazar"]])
+@pytest.mark.parametrize("name", SENSORS)
+def test_percentiles_within_one_bucket_of_numpy(store, frame, days, name):
+    values = frame.loc[frame["Gün"].isin(days), name].dropna().to_numpy(np.float64)
+    actual = ValueHistograms.from_store(store).select(days).percentiles(name)
+    for p in PERCENTILES:
+        # Kova ve float32 okumaların yuvarlanması için küçük pay
+        assert abs(actual[f"p{p}"] - np.percentile(values, p)) <= RESOLUTION[name] * (1 + 1e-6) + 1e-4
+
+
+def test_histogram_matches_pd_cut(store, frame):
+    edges = [15, 20, 22.5, 25, 27.5, 30, 40]
+    values = frame["Sicaklik"].dropna()
+    expected = pd.cut(values, edges, include_lowest=True).value_counts(sort=False).to_numpy()
+    distribution = ValueHistograms.from_store(store).select(list(frame["Gün"].cat.categories))
+    np.testing.assert_array_equal(distribution.histogram("Sicaklik", edges), expected)
+
+
+def test_merge_matches_single_pass(store):
+    half = len(store) // 2
+    first = ValueHistograms.empty().add(store.minute[:half], {name: store.readings[name][:half] for name in SENSORS})
+    second = ValueHistograms.empty().add(store.minute[half:], {name: store.readings[name][half:] for name in SENSORS})
+    merged = first.merge(second).select(["Sali", "Perşembe"])
+    expected = ValueHistograms.from_store(store).select(["Sali", "Perşembe"])
+    for name in SENSORS:
+        assert merged.count(name) == expected.count(name)
+        assert merged.percentiles(name) == expected.percentiles(name)
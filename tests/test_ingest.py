@@ -0,0 +1,56 @@
+import json
+import socket
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from dashboard.ingest import IngestPipeline, open_source, read_socket
+from dashboard.store import SENSORS
+
+
+def _records(frame, rows):
+    return [{key: (value.item() if hasattr(value, "item") else value) for key, value in record.items()}
+            for record in frame.head(rows).astype({"Gün": str, "Saat": str}).to_dict("records")]
+
+
+def test_socket_keeps_partial_lines_across_timeouts(frame):
+    records = _records(frame.drop(columns="Zaman"), 25)
+    payload = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records).encode("utf-8")
+    server = socket.create_server(("127.0.0.1", 0))
+    port = server.getsockname()[1]
+
+    def send():
+        connection, _ = server.accept()
+        with connection:
+            # Satırların ortasından (çok baytlı karakterler dahil) bölünmüş parçalar, aralarında zaman aşımı
+            for start in range(0, len(payload), 97):
+                connection.sendall(payload[start:start + 97])
+                time.sleep(0.03)
+
+    sender = threading.Thread(target=send)
+    sender.start()
+    try:
+        chunks = list(read_socket(port=port, chunksize=10, timeout=0.01))
+    finally:
+        sender.join()
+        server.close()
+    received = pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(received, pd.DataFrame.from_records(records))
+    assert max(len(chunk) for chunk in chunks) <= 10
+
+
+def test_json_array_and_json_lines_files(frame, tmp_path):
+    rows = frame.drop(columns="Zaman").head(50).astype({"Gün": str, "Saat": str})
+    array = tmp_path / "dizi.json"
+    array.write_text(rows.to_json(orient="records", force_ascii=False), encoding="utf-8")
+    lines = tmp_path / "satirlar.json"
+    lines.write_text(rows.to_json(orient="records", lines=True, force_ascii=False), encoding="utf-8")
+    for path in (array, lines):
+        pipeline = IngestPipeline()
+        pipeline.run(open_source(path, chunksize=20))
+        store = pipeline.store()
+        assert pipeline.chunks == 3
+        np.testing.assert_allclose(store.readings["Sicaklik"], rows["Sicaklik"], rtol=1e-6)
+        assert list(store.readings) == SENSORS
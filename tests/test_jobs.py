@@ -0,0 +1,141 @@
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+from dashboard.jobs import JobRunner, checkpoint
+
+TIMEOUT = 5
+
+
+def _blocking(started, release, value):
+    """
+    Bırakılana kadar checkpoint() ile bekleyen iş
+    """
+    started.set()
+    while not release.wait(0.01):
+        checkpoint()
+    return value
+
+
+def _settle(runner):
+    """
+    Biten işlerin tamamlanma geri çağrıları (önbellek, sayaçlar) işlenene kadar bekler
+    """
+    deadline = time.monotonic() + TIMEOUT
+    while runner.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def runner():
+    runner = JobRunner(max_workers=2)
+    yield runner
+    runner._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def test_superseded_result_is_never_shown(runner):
+    started, release = threading.Event(), threading.Event()
+    old = runner.submit("panel", "eski", _blocking, started, release, "eski sonuç")
+    assert started.wait(TIMEOUT)
+    new = runner.submit("panel", "yeni", lambda: "yeni sonuç")
+
+    assert new.wait(TIMEOUT) and new.result() == "yeni sonuç"
+    # Eskiyen iş bir sonraki checkpoint()'te durur
+    assert old.wait(TIMEOUT) and old.cancelled
+    with pytest.raises(CancelledError):
+        old.result()
+    _settle(runner)
+    assert runner.result("eski") is None
+    assert runner.result("yeni") == "yeni sonuç"
+    assert runner.stats()["cancelled"] == 1
+    release.set()
+
+
+def test_superseded_job_finishing_anyway_is_not_cached(runner):
+    started, release = threading.Event(), threading.Event()
+
+    def uninterruptible():
+        # checkpoint() çağırmayan iş iptalden sonra da sonuna kadar çalışır
+        started.set()
+        release.wait(TIMEOUT)
+        return "eski sonuç"
+
+    old = runner.submit("panel", "eski", uninterruptible)
+    assert started.wait(TIMEOUT)
+    runner.submit("panel", "yeni", lambda: "yeni sonuç")
+    release.set()
+
+    assert old.wait(TIMEOUT) and old.cancelled
+    _settle(runner)
+    # Sonuç önbelleğe yazılmaz; panel onu önceki sonuç olarak da göstermez
+    assert runner.result("eski") is None
+    assert runner.result("yeni") == "yeni sonuç"
+
+
+def test_superseded_queued_job_never_runs():
+    runner = JobRunner(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+    busy = runner.submit("diğer", "meşgul", _blocking, started, release, None)
+    assert started.wait(TIMEOUT)
+    queued = runner.submit("panel", "sırada", calls.append, "sırada")
+    latest = runner.submit("panel", "son", calls.append, "son")
+    release.set()
+
+    assert busy.wait(TIMEOUT) and latest.wait(TIMEOUT) and queued.wait(TIMEOUT)
+    assert calls == ["son"]
+    runner._executor.shutdown(wait=True)
+
+
+def test_shared_job_survives_while_another_slot_waits(runner):
+    started, release = threading.Event(), threading.Event()
+    first = runner.submit("oturum 1", "ortak", _blocking, started, release, 42)
+    second = runner.submit("oturum 2", "ortak", _blocking, started, release, 42)
+    assert first is second
+    runner.submit("oturum 1", "başka", lambda: 0)
+    release.set()
+
+    assert second.wait(TIMEOUT) and second.result() == 42
+    _settle(runner)
+    assert runner.stats()["submitted"] == 2 and runner.stats()["shared"] == 1
+    # Biten iş önbellekten hazır döner, kuyruğa yeniden girmez
+    again = runner.submit("oturum 3", "ortak", _blocking, started, release, 42)
+    assert again.done() and again.result() == 42
+    assert runner.stats()["submitted"] == 2
+
+
+def test_cancel_stops_running_job(runner):
+    started, release = threading.Event(), threading.Event()
+    job = runner.submit("panel", "uzun", _blocking, started, release, "bitmemeli")
+    assert started.wait(TIMEOUT)
+    job.cancel()
+
+    assert job.wait(TIMEOUT)
+    with pytest.raises(CancelledError):
+        job.result()
+    _settle(runner)
+    assert runner.result("uzun") is None
+    assert runner.stats()["pending"] == 0
+    release.set()
+
+
+def test_exception_is_raised_from_job(runner):
+    def fail():
+        raise ValueError("bozuk veri")
+
+    job = runner.submit("panel", "hatalı", fail)
+    assert job.wait(TIMEOUT)
+    with pytest.raises(ValueError, match="bozuk veri"):
+        job.result()
+    _settle(runner)
+    assert runner.stats()["failed"] == 1
+    # Hatalar önbelleğe yazılmaz; aynı anahtar yeniden denenir
+    assert runner.result("hatalı") is None
+    retry = runner.submit("panel", "hatalı", lambda: "tamam")
+    assert retry.wait(TIMEOUT) and retry.result() == "tamam"
+
+
+def test_checkpoint_outside_job_is_noop():
+    checkpoint()
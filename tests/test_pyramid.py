@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from dashboard.pyramid import RAW_STEP, RollupPyramid
+from dashboard.store import SENSORS, SensorStore
+
+
+def _shuffled(store):
+    order = np.random.default_rng(5).permutation(len(store))
+    return SensorStore(store.minute[order], {name: store.readings[name][order] for name in SENSORS}, store.room,
+                       timestamp=store.timestamp[order])
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_minute_queries_read_store_rows(store, shuffle):
+    source = _shuffled(store) if shuffle else store
+    pyramid = RollupPyramid.from_store(source)
+    first, last = pyramid.span()
+    assert (first, last) == (store.timestamp.min(), store.timestamp.max() + 1)
+    for start, end in [(first, first + 90), (first + 1000, first + 1437), (last - 10, last + 50)]:
+        rollup = pyramid.query(start, end, width=800)
+        assert rollup.step == RAW_STEP
+        inside = (store.timestamp >= start) & (store.timestamp < end)
+        np.testing.assert_array_equal(rollup.keys, store.timestamp[inside])
+        for name in SENSORS:
+            np.testing.assert_allclose(rollup.mean(name), store.readings[name][inside], rtol=1e-6)
+
+
+def test_without_store_finest_level_is_five_minutes(store):
+    pyramid = RollupPyramid()
+    pyramid.add(store.timestamp, store.readings)
+    first, _ = pyramid.span()
+    assert pyramid.query(first, first + 60, width=800).step == 5
+
+
+def _assert_same_levels(pyramid, expected):
+    assert pyramid.span() == expected.span()
+    for step in expected.steps:
+        actual, wanted = pyramid.query(step=step), expected.query(step=step)
+        np.testing.assert_array_equal(actual.keys, wanted.keys)
+        for name in SENSORS:
+            np.testing.assert_array_equal(actual.count(name), wanted.count(name))
+            np.testing.assert_allclose(actual.mean(name), wanted.mean(name))
+            np.testing.assert_array_equal(actual.min(name), wanted.min(name))
+            np.testing.assert_array_equal(actual.max(name), wanted.max(name))
+
+
+def test_incremental_add_matches_from_store(store):
+    expected = RollupPyramid.from_store(store)
+    pyramid = RollupPyramid()
+    # Sıralı parçalar; sınırlar kovaların ortasına düşer, devam eden kova yerinde güncellenir
+    for rows in np.array_split(np.arange(len(store)), 7):
+        pyramid.add(store.timestamp[rows], {name: store.readings[name][rows] for name in SENSORS})
+    _assert_same_levels(pyramid, expected)
+    assert all(len(pyramid.levels[step]) > 1 for step in pyramid.steps[:2])
+
+
+def test_out_of_order_add_matches_from_store(store):
+    expected = RollupPyramid.from_store(store)
+    pyramid = RollupPyramid()
+    # Geç gelen parçalar ve parça içi karışık sıra
+    chunks = np.array_split(np.random.default_rng(11).permutation(len(store)), 5)
+    for rows in [chunks[3], chunks[0], chunks[4], chunks[1], chunks[2]]:
+        pyramid.add(store.timestamp[rows], {name: store.readings[name][rows] for name in SENSORS})
+    _assert_same_levels(pyramid, expected)
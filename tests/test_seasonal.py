@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from dashboard.seasonal import MAD_SCALE, SeasonalAnomalyDetector
+from dashboard.store import MINUTES_PER_DAY
+
+
+def test_baseline_matches_groupby_median_and_mad(store):
+    detector = SeasonalAnomalyDetector(sensors=["Sicaklik", "CO2 Sensörü"]).fit(store.timestamp, store.readings)
+    slot = store.timestamp % MINUTES_PER_DAY // detector.bucket
+    for index, name in enumerate(detector.sensors):
+        values = pd.Series(store.readings[name].astype(np.float64))
+        median = values.groupby(slot).median()
+        mad = (values - median.reindex(slot).to_numpy()).abs().groupby(slot).median()
+        np.testing.assert_allclose(detector.median[index], median.to_numpy(), rtol=1e-5)
+        np.testing.assert_allclose(detector.scale[index], MAD_SCALE * mad.to_numpy(), rtol=1e-4)
+        expected = (values - median.reindex(slot).to_numpy()) / (MAD_SCALE * mad.reindex(slot).to_numpy())
+        np.testing.assert_allclose(detector.zscores(name), expected, rtol=1e-3, atol=1e-4, equal_nan=True)
+
+
+def test_binary_sensor_uses_on_rate(store):
+    detector = SeasonalAnomalyDetector(sensors=["Hareket Sensörü"]).fit(store.timestamp, store.readings)
+    slot = store.timestamp % MINUTES_PER_DAY // detector.bucket
+    rate = pd.Series(store.readings["Hareket Sensörü"].astype(np.float64)).groupby(slot).mean().to_numpy()
+    np.testing.assert_allclose(detector.median[0], rate, rtol=1e-6)
+    np.testing.assert_allclose(detector.scale[0], np.sqrt(rate * (1 - rate)), rtol=1e-5)
@@ -0,0 +1,118 @@
+import numpy as np
+
+from dashboard.aggregates import DayAggregates
+from dashboard.analysis import build_anomaly_detector
+from dashboard.correlation import CorrelationEngine
+from dashboard.fleet import Fleet, load_fleet, save_fleet
+from dashboard.histogram import ValueHistograms
+from dashboard.pyramid import RollupPyramid
+from dashboard.snapshot import load_snapshot, load_state, save_snapshot
+from dashboard.store import DAYS, SENSORS
+
+
+def test_round_trip(store, tmp_path):
+    aggregates = DayAggregates.from_store(store)
+    path = save_snapshot(tmp_path / "oda", store, aggregates)
+    loaded, loaded_aggregates = load_snapshot(path)
+
+    assert len(loaded) == len(store)
+    assert (loaded.room, loaded.version, loaded.source) == (store.room, store.version, store.source)
+    for column in ("minute", "timestamp", "day_code", "time_code"):
+        np.testing.assert_array_equal(getattr(loaded, column), getattr(store, column))
+    for name in SENSORS:
+        assert loaded.readings[name].dtype == store.readings[name].dtype
+        np.testing.assert_array_equal(loaded.readings[name], store.readings[name])
+        for stat, array in aggregates.parts[name].items():
+            np.testing.assert_array_equal(loaded_aggregates.parts[name][stat], array)
+    assert loaded_aggregates.fingerprint == aggregates.fingerprint
+    # Kolonlar kopyalanmadan, salt okunur olarak açılır
+    assert isinstance(loaded.readings["Sicaklik"].base, np.memmap)
+    assert not loaded.timestamp.flags.writeable
+
+
+def test_overwrite_replaces_previous_snapshot(store, tmp_path):
+    path = tmp_path / "oda"
+    save_snapshot(path, store, DayAggregates.from_store(store))
+    save_snapshot(path, store)
+    loaded, aggregates = load_snapshot(path)
+    assert aggregates is None
+    assert len(loaded) == len(store)
+    assert [entry.name for entry in tmp_path.iterdir()] == ["oda"]
+
+
+def _state(store):
+    return {
+        "pyramid": RollupPyramid.from_store(store),
+        "histograms": ValueHistograms.from_store(store),
+        "correlation": CorrelationEngine.from_store(store),
+        "seasonal": build_anomaly_detector(store),
+    }
+
+
+def test_derived_state_round_trip(store, tmp_path):
+    state = _state(store)
+    path = save_snapshot(tmp_path / "oda", store, state=state)
+    loaded_store, _ = load_snapshot(path)
+    loaded = load_state(path, loaded_store)
+    assert set(loaded) == set(state)
+
+    pyramid = loaded["pyramid"]
+    assert pyramid.store is loaded_store and pyramid.fingerprint == state["pyramid"].fingerprint
+    start, end = state["pyramid"].span()
+    for step in (1, 5, 60, 1440):
+        expected, actual = state["pyramid"].query(start, end, step=step), pyramid.query(start, end, step=step)
+        np.testing.assert_array_equal(actual.keys, expected.keys)
+        np.testing.assert_array_equal(actual.mean("Sicaklik"), expected.mean("Sicaklik"))
+
+    days = DAYS[:3]
+    expected, actual = state["histograms"].select(days), loaded["histograms"].select(days)
+    for name in SENSORS:
+        np.testing.assert_equal(actual.percentiles(name), expected.percentiles(name))
+
+    np.testing.assert_allclose(loaded["correlation"].correlation(5, last=4),
+                               state["correlation"].correlation(5, last=4))
+
+    detector = loaded["seasonal"]
+    np.testing.assert_array_equal(detector.zscores("Sicaklik"), state["seasonal"].zscores("Sicaklik"))
+    for expected_bound, bound in zip(state["seasonal"].bounds(2.5, "Nem Sensörü"), detector.bounds(2.5, "Nem Sensörü")):
+        np.testing.assert_array_equal(bound, expected_bound)
+    # Puanlar kopyalanmadan açılır
+    assert isinstance(detector.zscores().base, np.memmap)
+
+
+def test_loaded_state_keeps_updating(store, tmp_path):
+    # Bölme noktası kovaların ortasına düşer; açılan salt okunur son kova yerinde güncellenemez
+    half = len(store) // 2 + 3
+    first = {name: store.readings[name][:half] for name in SENSORS}
+    rest = {name: store.readings[name][half:] for name in SENSORS}
+    pyramid = RollupPyramid().add(store.timestamp[:half], first)
+    correlation = CorrelationEngine().update(store.timestamp[:half], first)
+    path = save_snapshot(tmp_path / "oda", store, state={"pyramid": pyramid, "correlation": correlation})
+
+    loaded = load_state(path, None)
+    loaded["pyramid"].add(store.timestamp[half:], rest)
+    loaded["correlation"].update(store.timestamp[half:], rest)
+    whole_pyramid = RollupPyramid().add(store.timestamp, store.readings)
+    whole_correlation = CorrelationEngine().update(store.timestamp, store.readings)
+    for step in whole_pyramid.steps:
+        np.testing.assert_array_equal(loaded["pyramid"].query(step=step).count("Nem Sensörü"),
+                                      whole_pyramid.query(step=step).count("Nem Sensörü"))
+    np.testing.assert_allclose(loaded["correlation"].correlation(1), whole_correlation.correlation(1))
+
+
+def test_fleet_state_round_trip(store, tmp_path):
+    state = _state(store)
+    fleet = Fleet({"A": store}, pyramids={"A": state["pyramid"]}, histograms={"A": state["histograms"]},
+                  correlations={"A": state["correlation"]}, detectors={"A": state["seasonal"]})
+    save_fleet(tmp_path / "filo", fleet)
+    loaded = load_fleet(tmp_path / "filo")
+    assert loaded.pyramids["A"].store is loaded["A"]
+    assert loaded.histograms["A"].fingerprint == state["histograms"].fingerprint
+    assert sorted(loaded.correlations["A"].blocks) == sorted(state["correlation"].blocks)
+    np.testing.assert_array_equal(loaded.detectors["A"].zscores(), state["seasonal"].zscores())
+
+
+def test_snapshot_without_state(store, tmp_path):
+    path = save_snapshot(tmp_path / "oda", store)
+    assert load_state(path, store) == {}
+    assert not load_fleet(path).pyramids
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.store import SENSORS
+from dashboard.synthetic import create_store, generate, write
+
+
+def _frame(chunks):
+    df = pd.concat(list(chunks), ignore_index=True)
+    for column in ("Oda", "Bina"):
+        df[column] = df[column].astype(str)
+    return df.sort_values(["Oda", "Zaman"], kind="stable").reset_index(drop=True)
+
+
+def test_rows_do_not_depend_on_chunk_size():
+    small = list(generate(rooms=5, days=2, interval=5, seed=3, chunk_rows=600))
+    assert max(len(chunk) for chunk in small) <= 600 and len(small) > 2
+    pd.testing.assert_frame_equal(_frame(small), _frame(generate(rooms=5, days=2, interval=5, seed=3)))
+
+
+def test_seed_determines_rows():
+    first = _frame(generate(rooms=3, days=1, interval=10, seed=1))
+    pd.testing.assert_frame_equal(first, _frame(generate(rooms=3, days=1, interval=10, seed=1)))
+    other = _frame(generate(rooms=3, days=1, interval=10, seed=2))
+    assert not np.array_equal(first["Sicaklik"], other["Sicaklik"])
+
+
+def test_create_store_matches_generate():
+    df = _frame(generate(rooms=3, days=3, interval=5, seed=9, chunk_rows=1000))
+    room = df[df["Oda"] == "Oda 3"]
+    store = create_store(days=3, seed=9, index=2, interval=5)
+    assert len(store) == len(room)
+    np.testing.assert_array_equal(store.timestamp, room["Zaman"].to_numpy().astype("datetime64[m]").astype(np.int64))
+    for name in SENSORS:
+        np.testing.assert_array_equal(store.readings[name], room[name].to_numpy())
+    assert store.room["Metrekare"] == room["Metrekare"].iloc[0]
+
+
+def test_anomaly_rate_adds_spikes():
+    calm = create_store(days=2, seed=4, anomaly_rate=0.0)
+    spiky = create_store(days=2, seed=4, anomaly_rate=0.05)
+    jumps = np.abs(spiky.readings["CO2 Sensörü"] - calm.readings["CO2 Sensörü"])
+    assert 0.02 < np.mean(jumps >= 800) < 0.08
+
+
+def test_interval_must_divide_day():
+    with pytest.raises(ValueError):
+        next(generate(interval=7))
+    with pytest.raises(ValueError):
+        create_store(interval=7)
+
+
+def test_write_counts_rows(tmp_path):
+    chunks = list(generate(rooms=2, days=1, interval=30, seed=0, chunk_rows=48))
+    for suffix in ("csv", "jsonl"):
+        path = tmp_path / f"yuk.{suffix}"
+        assert write(iter(chunks), path) == 96
+        assert len(pd.read_csv(path) if suffix == "csv" else pd.read_json(path, lines=True)) == 96
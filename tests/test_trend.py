@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from dashboard.analysis import analyze_trends, build_trend_engine
+from dashboard.store import SENSORS, StoreView
+from dashboard.trend import TREND_WINDOWS, RollingTrendEngine
+
+WINDOWS = (3, 5, 15)
+
+
+def _chunks(store, size):
+    for start in range(0, len(store), size):
+        yield {name: store.readings[name][start:start + size] for name in SENSORS}
+
+
+def _expected_trend(values, average):
+    previous = pd.Series(values).shift(1).to_numpy()
+    return np.select([average > previous, average < previous], [1, 2], 0)
+
+
+@pytest.mark.parametrize("size", [7, 1000, 10 ** 9])
+def test_chunked_updates_match_series_rolling(store, size):
+    engine = RollingTrendEngine(windows=WINDOWS)
+    for chunk in _chunks(store, size):
+        engine.update(chunk)
+    for name in SENSORS:
+        values = store.readings[name].astype(np.float64)
+        for window in WINDOWS:
+            expected = pd.Series(values).rolling(window).mean().to_numpy()
+            np.testing.assert_allclose(engine.moving_average(window, name), expected, rtol=1e-5, equal_nan=True)
+            np.testing.assert_array_equal(engine.trend_codes(window, name), _expected_trend(values, expected))
+
+
+def test_rooms_keep_separate_history(store):
+    shared = RollingTrendEngine(windows=(5,))
+    alone = RollingTrendEngine(windows=(5,))
+    for chunk in _chunks(store, 500):
+        shared.update(chunk, room="A")
+        shared.update({name: values[::-1] for name, values in chunk.items()}, room="B")
+        alone.update(chunk)
+    np.testing.assert_array_equal(shared.moving_average(5, "Sicaklik", room="A"),
+                                  alone.moving_average(5, "Sicaklik"))
+    assert len(shared.moving_average(5, "Sicaklik", room="B")) == len(store)
+
+
+def test_only_requested_windows_are_kept(store):
+    engine = RollingTrendEngine(windows=(5,))
+    engine.update(store.readings)
+    with pytest.raises(KeyError):
+        engine.moving_average(3, "Sicaklik")
+
+
+
+def test_one_engine_serves_every_window(store):
+    engine = build_trend_engine(store)
+    view = StoreView(store, ["Sali", "Cuma"])
+    for window in TREND_WINDOWS:
+        single = RollingTrendEngine(["Sicaklik"], [window])
+        single.update(store.readings)
+        pd.testing.assert_frame_equal(analyze_trends(view, "Sicaklik", window, engine),
+                                      analyze_trends(view, "Sicaklik", window, single))